@@ -4,18 +4,69 @@ from app.core.security import (
     require_customer_or_admin,
     require_internal_service,
 )
-from uuid import uuid4
+from typing import AsyncGenerator, Optional
+from uuid import UUID
 
-from fastapi import Request
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import DB_READ_SESSIONS
+from app.core.tracing import get_trace_id
+from app.db import database
+from app.db.database import get_db
 from app.schemas.user import User
 
 
 def trace_id_dependency(request: Request) -> str:
-    """Return X-Trace-Id header value or generate a new UUID."""
-    return request.headers.get("X-Trace-Id", str(uuid4()))
+    """Return the trace id bound to the current request."""
+    return get_trace_id(request)
+
+
+async def get_write_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncSession:
+    """Return the primary session, noting the request's user when it writes.
+
+    The user is looked up at commit time, since authentication may resolve
+    after this dependency. Their reads then skip the replicas for
+    ``DB_READ_YOUR_WRITES_WINDOW`` seconds (see :func:`get_read_db`).
+    """
+
+    def writer() -> Optional[UUID]:
+        user = getattr(request.state, "user", None)
+        return user.id if user is not None else None
+
+    db.info["writer"] = writer
+    return db
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_write_db),
+    user: User = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session for read-only handlers.
+
+    The session uses a read replica when ``DATABASE_READ_URLS`` is set. It
+    falls back to the primary session when no replica is reachable or when
+    the user committed a write within ``DB_READ_YOUR_WRITES_WINDOW`` seconds.
+    """
+    session = None
+    if database.read_replicas is not None and not database.recent_writes.active(user.id):
+        session = await database.read_replicas.open_session()
+    if session is None:
+        DB_READ_SESSIONS.labels(target="primary").inc()
+        yield db
+        return
+    DB_READ_SESSIONS.labels(target="replica").inc()
+    try:
+        yield session
+    finally:
+        await session.close()
 
 __all__ = [
     "get_current_user",
+    "get_read_db",
+    "get_write_db",
     "require_admin",
     "require_customer_or_admin",
     "require_internal_service",
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+
+from app.core.log_sampling import get_sampling_rules, sampler
+from app.schemas.admin import LogSamplingConfig
+from app.api.dependencies import User, require_admin
+
+router = APIRouter()
+
+
+@router.get("/logging/sampling", response_model=LogSamplingConfig)
+async def get_log_sampling(_: User = Depends(require_admin)):
+    """
+    Return the log sampling rules active in this process.
+    """
+    return {"rules": get_sampling_rules()}
+
+
+@router.put("/logging/sampling", response_model=LogSamplingConfig)
+async def set_log_sampling(
+    config: LogSamplingConfig,
+    _: User = Depends(require_admin),
+):
+    """
+    Replace the log sampling rules of this process without a restart.
+    """
+    sampler.set_rules({(rule.logger, rule.message): rule.rate for rule in config.rules})
+    return {"rules": get_sampling_rules()}
@@ -1,30 +1,46 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status, Request
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status, Request, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from app.db.database import get_db
-from app.schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate
+from app.schemas.customer import (
+    CustomerBulkCreate,
+    CustomerBulkResult,
+    CustomerCreate,
+    CustomerImportJob,
+    CustomerResponse,
+    CustomerUpdate,
+)
+from app.services.customer_import import (
+    FORMATS,
+    detect_format,
+    get_import_job,
+    spool_upload,
+    start_import,
+)
 from app.services.customer_service import CustomerService
 from app.core.config import settings
 from app.core.limiter import limiter
 from app.api.dependencies import (
     User,
+    get_read_db,
+    get_write_db,
     require_customer_or_admin,
     require_admin,
     require_internal_service,
-    trace_id_dependency,
 )
 from pathlib import Path
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.post("/", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
     customer: CustomerCreate,
-    trace_id: str = Depends(trace_id_dependency),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_internal_service),
 ):
     """
@@ -32,7 +48,7 @@ async def create_customer(
     """
     customer_service = CustomerService(db)
     try:
-        return await customer_service.create_customer(customer, trace_id)
+        return await customer_service.create_customer(customer)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -40,17 +56,112 @@ async def create_customer(
         ) from exc
 
 
+@router.post("/bulk", response_model=CustomerBulkResult)
+async def create_customers_bulk(
+    payload: CustomerBulkCreate,
+    db: AsyncSession = Depends(get_write_db),
+    _: User = Depends(require_internal_service),
+):
+    """
+    Create many customer profiles at once.
+
+    Customers that already exist are reported per row in ``conflicts``
+    instead of failing the whole batch.
+    """
+    if len(payload.customers) > settings.BULK_CREATE_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_CREATE_MAX_ROWS} customers per request",
+        )
+    customer_service = CustomerService(db)
+    return await customer_service.create_customers(payload.customers)
+
+
+@router.post(
+    "/import", response_model=CustomerImportJob, status_code=status.HTTP_202_ACCEPTED
+)
+async def import_customers(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    business_id: Optional[UUID] = None,
+    _: User = Depends(require_internal_service),
+):
+    """
+    Import customers from a CSV or NDJSON file in the background.
+
+    ``business_id`` is used for rows without one. Poll the returned job for
+    progress; rejected rows are listed in its error report.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format, pass format=csv or format=ndjson",
+        )
+    path = await spool_upload(file, suffix=f".{fmt}")
+    return start_import(path, fmt, str(business_id) if business_id else None)
+
+
+@router.get("/import/{job_id}", response_model=CustomerImportJob)
+async def get_import_status(
+    job_id: str,
+    _: User = Depends(require_internal_service),
+):
+    """Get the progress of a customer import."""
+    found = get_import_job(job_id)
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return found[0]
+
+
+@router.get("/import/{job_id}/errors")
+async def get_import_errors(
+    job_id: str,
+    _: User = Depends(require_internal_service),
+):
+    """Download the rows rejected by a customer import as CSV."""
+    found = get_import_job(job_id)
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return FileResponse(found[1], media_type="text/csv", filename=f"{job_id}-errors.csv")
+
+
+# Registered before "/{customer_id}" so "lookup" is not parsed as an id
+@router.get("/lookup", response_model=CustomerResponse)
+async def lookup_customer(
+    business_id: UUID,
+    phone: Optional[str] = Query(None, max_length=20),
+    email: Optional[str] = Query(None, max_length=100),
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(require_admin),
+):
+    """Find a customer of a business by exact phone number or email."""
+    if not phone and not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="phone or email is required",
+        )
+    customer_service = CustomerService(db)
+    customer = await customer_service.lookup_customer(business_id, phone or None, email or None)
+    if not customer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    return customer
+
+
 @router.get("/{customer_id}", response_model=CustomerResponse)
 async def get_customer(
     customer_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
     Get a customer by ID.
     """
     customer_service = CustomerService(db)
-    customer = await customer_service.get_customer(customer_id)
+    customer = await customer_service.get_customer_profile(customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,18 +172,35 @@ async def get_customer(
 
 @router.get("/", response_model=List[CustomerResponse])
 async def get_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     business_id: Optional[UUID] = None,
     query: Optional[str] = Query(None, min_length=3),
     search: Optional[str] = Query(None, alias="search", include_in_schema=False),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
-    """Return customers filtered by optional business ID and search query."""
+    """Return customers filtered by optional business ID and search query.
+
+    Pages are ordered by creation time. When more customers follow, the
+    ``X-Next-Cursor`` header holds the ``cursor`` of the next page; ``skip``
+    is still accepted for existing clients but gets slower on deep pages.
+    """
     customer_service = CustomerService(db)
     search_term = query or search
-    return await customer_service.get_customers(skip, limit, business_id, search_term)
+    if skip and not cursor:
+        return await customer_service.get_customers(skip, limit, business_id, search_term)
+    try:
+        customers, next_cursor = await customer_service.get_customers_page(
+            limit, business_id, search_term, cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return customers
 
 
 @router.patch("/{customer_id}", response_model=CustomerResponse)
@@ -81,17 +209,14 @@ async def update_customer(
     customer_id: UUID,
     customer: CustomerUpdate,
     request: Request,
-    trace_id: str = Depends(trace_id_dependency),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
     Update a customer's information.
     """
     customer_service = CustomerService(db)
-    updated_customer = await customer_service.update_customer(
-        customer_id, customer, trace_id
-    )
+    updated_customer = await customer_service.update_customer(customer_id, customer)
     if not updated_customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,7 +229,7 @@ async def update_customer(
 async def upload_avatar(
     customer_id: UUID,
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(require_customer_or_admin)
 ):
     """Upload and set a customer's avatar image."""
@@ -134,7 +259,7 @@ async def upload_avatar(
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_customer(
     customer_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
@@ -154,14 +279,14 @@ async def delete_customer(
 @router.get("/{customer_id}/statistics", response_model=dict, deprecated=True)
 async def get_customer_statistics(
     customer_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
     Get statistics for a specific customer.
     """
     customer_service = CustomerService(db)
-    customer = await customer_service.get_customer(customer_id)
+    customer = await customer_service.get_customer_profile(customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -173,5 +298,5 @@ async def get_customer_statistics(
         "total_appointments": customer.total_appointments,
         "last_order_date": customer.last_order_date,
         "last_appointment_date": customer.last_appointment_date,
-        "lifetime_value": float(customer.lifetime_value) if customer.lifetime_value else 0.0
+        "lifetime_value": customer.lifetime_value
     }
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
 from app.services.gdpr_service import GDPRService
 from app.schemas.gdpr import GDPRRequest
-from app.api.dependencies import User, require_customer_or_admin
+from app.api.dependencies import (
+    User,
+    get_read_db,
+    get_write_db,
+    require_customer_or_admin,
+)
 
 router = APIRouter()
 
@@ -12,7 +16,7 @@ router = APIRouter()
 @router.post("/export", status_code=status.HTTP_200_OK)
 async def export_customer_data(
     request: GDPRRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
@@ -31,7 +35,7 @@ async def export_customer_data(
 @router.post("/delete", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_customer_data(
     request: GDPRRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_customer_or_admin),
 ):
     """
@@ -3,10 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.db.database import get_db
 from app.schemas.note import NoteCreatePayload, NoteResponse
 from app.services.note_service import NoteService
-from app.api.dependencies import User, require_admin, trace_id_dependency
+from app.api.dependencies import User, get_read_db, get_write_db, require_admin
 
 customer_router = APIRouter()
 
@@ -19,13 +18,12 @@ customer_router = APIRouter()
 async def create_customer_note(
     customer_id: UUID,
     note: NoteCreatePayload,
-    trace_id: str = Depends(trace_id_dependency),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """Create a note for a specific customer."""
     service = NoteService(db)
-    return await service.create_customer_note(customer_id, note, trace_id)
+    return await service.create_customer_note(customer_id, note)
 
 
 @customer_router.get(
@@ -34,7 +32,7 @@ async def create_customer_note(
 )
 async def get_customer_notes(
     customer_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     """Retrieve all notes for a customer."""
@@ -49,7 +47,7 @@ async def get_customer_notes(
 async def delete_customer_note(
     customer_id: UUID,
     note_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """Delete a specific note for a customer."""
@@ -3,10 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.db.database import get_db
 from app.schemas.tag import TagCreate, TagResponse, TagsCreate
 from app.services.tag_service import TagService
-from app.api.dependencies import User, require_admin, trace_id_dependency
+from app.api.dependencies import User, get_read_db, get_write_db, require_admin
 
 router = APIRouter()
 customer_router = APIRouter()
@@ -15,8 +14,7 @@ customer_router = APIRouter()
 @router.post("/", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
 async def create_tag(
     tag: TagCreate,
-    trace_id: str = Depends(trace_id_dependency),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """
@@ -24,7 +22,7 @@ async def create_tag(
     """
     tag_service = TagService(db)
     try:
-        return await tag_service.create_tag(tag, trace_id)
+        return await tag_service.create_tag(tag)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -32,7 +30,7 @@ async def create_tag(
 @router.get("/customer/{customer_id}", response_model=List[TagResponse])
 async def get_customer_tags(
     customer_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_admin),
 ):
     """
@@ -45,7 +43,7 @@ async def get_customer_tags(
 @router.delete("/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_tag(
     tag_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """
@@ -69,15 +67,14 @@ async def delete_tag(
 async def create_customer_tags(
     customer_id: UUID,
     payload: TagsCreate,
-    trace_id: str = Depends(trace_id_dependency),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """Create one or multiple tags for a customer."""
     tag_service = TagService(db)
     labels = [payload.label] if payload.label else (payload.labels or [])
     try:
-        created_tags = await tag_service.create_tags(customer_id, labels, trace_id=trace_id)
+        created_tags = await tag_service.create_tags(customer_id, labels)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     return created_tags
@@ -90,7 +87,7 @@ async def create_customer_tags(
 async def delete_customer_tag(
     customer_id: UUID,
     tag_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     _: User = Depends(require_admin),
 ):
     """Delete a tag from a specific customer."""
@@ -0,0 +1,125 @@
+"""Circuit breakers guarding calls to downstream dependencies.
+
+A breaker opens after ``failure_threshold`` consecutive failures and then
+rejects calls immediately with :class:`CircuitOpenError` instead of letting
+every request wait for a timeout. After ``recovery_timeout`` seconds it turns
+half-open and lets a limited number of trial calls through: a success closes
+it again, a failure re-opens it.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import CIRCUIT_BREAKER_REJECTED, CIRCUIT_BREAKER_STATE
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Circuit breaker '{name}' is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for a single dependency."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._trial_calls = 0
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def before_call(self) -> None:
+        """Reserve a call slot or raise :class:`CircuitOpenError`."""
+        state = self.state
+        if state == OPEN or (
+            state == HALF_OPEN and self._trial_calls >= self.half_open_max_calls
+        ):
+            CIRCUIT_BREAKER_REJECTED.labels(name=self.name).inc()
+            raise CircuitOpenError(self.name)
+        if state == HALF_OPEN:
+            self._trial_calls += 1
+
+    def release(self) -> None:
+        """Free a trial slot taken by a call that ended without an outcome."""
+        if self._state == HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Run the enclosed call under the breaker.
+
+        Any exception raised inside the block counts as a failure. A call
+        cancelled inside the block records nothing but frees its trial slot.
+        """
+        self.before_call()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(
+    name: str,
+    failure_threshold: Optional[int] = None,
+    recovery_timeout: Optional[float] = None,
+) -> CircuitBreaker:
+    """Return the process-wide breaker for ``name``, creating it on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout or settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+        )
+    return breaker
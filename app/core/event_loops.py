@@ -0,0 +1,28 @@
+"""Helpers for resources bound to the event loop that created them.
+
+Connections opened by asyncio clients can only be used, and closed, on their
+own loop. Services that are also driven from a background loop (see
+``publish_event_sync``) keep one instance per loop and close each of them on
+the loop it belongs to.
+"""
+
+import asyncio
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+async def run_on_loop(
+    loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, T]
+) -> Optional[T]:
+    """Run ``coro`` on ``loop`` and wait for it from the current loop.
+
+    A loop that has stopped can no longer run anything; the coroutine is
+    discarded and ``None`` is returned.
+    """
+    if loop is asyncio.get_running_loop():
+        return await coro
+    if loop.is_closed() or not loop.is_running():
+        coro.close()
+        return None
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
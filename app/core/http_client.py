@@ -0,0 +1,104 @@
+"""Application-scoped HTTP clients for calls to other BeeConect services.
+
+One keep-alive client is kept per downstream origin, so connection limits
+apply per host and TLS handshakes are paid once per connection rather than
+once per call. Clients are opened during startup and closed on shutdown by
+the application lifespan.
+"""
+
+import asyncio
+import importlib.util
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+try:  # httpx is optional in production
+    import httpx
+except Exception:  # pragma: no cover - optional dependency
+    httpx = None
+
+from app.core.config import settings
+from app.core.metrics import HTTP_POOL_IN_FLIGHT, HTTP_POOL_MAX_CONNECTIONS
+from app.core.tracing import TRACE_HEADER, current_trace_id
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: Dict[str, "httpx.AsyncClient"] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+if httpx is not None:
+
+    class _InstrumentedTransport(httpx.AsyncBaseTransport):
+        """Track in-flight requests per origin around the pooled transport.
+
+        Requests made while handling an API request also carry its trace id.
+        """
+
+        def __init__(self, origin: str, transport: "httpx.AsyncBaseTransport") -> None:
+            self.origin = origin
+            self.transport = transport
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            trace_id = current_trace_id()
+            if trace_id is not None and TRACE_HEADER not in request.headers:
+                request.headers[TRACE_HEADER] = trace_id
+            gauge = HTTP_POOL_IN_FLIGHT.labels(origin=self.origin)
+            gauge.inc()
+            try:
+                return await self.transport.handle_async_request(request)
+            finally:
+                gauge.dec()
+
+        async def aclose(self) -> None:
+            await self.transport.aclose()
+
+
+def _create_client(origin: str) -> "httpx.AsyncClient":
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=HTTP2_AVAILABLE)
+    HTTP_POOL_MAX_CONNECTIONS.labels(origin=origin).set(settings.HTTP_MAX_CONNECTIONS)
+    return httpx.AsyncClient(
+        transport=_InstrumentedTransport(origin, transport),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def get_http_client(url: str) -> Optional["httpx.AsyncClient"]:
+    """Return the shared client for ``url``'s origin, or ``None`` without httpx."""
+    global _loop
+    if httpx is None:
+        return None
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        # Pooled connections belong to the loop that opened them
+        _clients.clear()
+        _loop = loop
+    origin = _origin(url)
+    client = _clients.get(origin)
+    if client is None or client.is_closed:
+        client = _clients[origin] = _create_client(origin)
+    return client
+
+
+async def open_http_clients() -> None:
+    """Create clients for the configured downstream services at startup."""
+    for url in (settings.AUTH_SERVICE_URL, settings.LOG_SERVICE_URL):
+        if url:
+            get_http_client(url)
+
+
+async def close_http_clients() -> None:
+    """Close every shared client and its pooled connections."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
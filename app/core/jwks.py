@@ -0,0 +1,159 @@
+"""Public keys for verifying asymmetrically signed (RS256/ES256) tokens.
+
+Keys come from a JSON Web Key Set read from a file or fetched from a URL.
+They are parsed once into key objects and looked up by ``kid``. The set is
+reloaded in the background every ``refresh_interval`` seconds, and a token
+signed with an unknown ``kid`` triggers an early reload at most once every
+``min_refresh_interval`` seconds, so keys can be rotated without a restart.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import urllib.request
+from typing import Dict, Iterable, Optional, Tuple
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_ALGORITHMS = {
+    "RSA": "RS256",
+    "P-256": "ES256",
+    "P-384": "ES384",
+    "P-521": "ES512",
+}
+
+
+class JWKSCache:
+    """In-memory key set with ``kid`` lookup and rate-limited reloads."""
+
+    def __init__(
+        self,
+        source: str,
+        algorithms: Iterable[str] = ("RS256", "ES256"),
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+    ) -> None:
+        self.source = source
+        self.algorithms = frozenset(algorithms)
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[Optional[str], Tuple[str, Key]] = {}
+        self._last_refresh: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _fetch(self) -> dict:
+        if self.source.startswith(("http://", "https://")):
+            with urllib.request.urlopen(self.source, timeout=settings.HTTP_TIMEOUT) as response:
+                return json.load(response)
+        path = self.source[len("file://"):] if self.source.startswith("file://") else self.source
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _parse(self, document: dict) -> Dict[Optional[str], Tuple[str, Key]]:
+        keys: Dict[Optional[str], Tuple[str, Key]] = {}
+        for data in document.get("keys", []):
+            if data.get("use", "sig") != "sig":
+                continue
+            alg = data.get("alg") or _DEFAULT_ALGORITHMS.get(data.get("crv") or data.get("kty"))
+            if alg not in self.algorithms:
+                continue
+            try:
+                keys[data.get("kid")] = (alg, jwk.construct(data, alg))
+            except Exception as exc:
+                logger.warning(
+                    "Skipping invalid JWKS key", extra={"kid": data.get("kid"), "error": str(exc)}
+                )
+        return keys
+
+    def refresh(self, force: bool = True) -> bool:
+        """Reload the key set; without ``force`` reloads are rate limited."""
+        with self._refresh_lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._last_refresh is not None
+                and now - self._last_refresh < self.min_refresh_interval
+            ):
+                return False
+            self._last_refresh = now
+            try:
+                keys = self._parse(self._fetch())
+            except Exception as exc:
+                logger.warning("Could not load JWKS", extra={"source": self.source, "error": str(exc)})
+                return False
+            self._keys = keys
+            return True
+
+    def get_key(self, kid: Optional[str]) -> Optional[Tuple[str, Key]]:
+        """Return ``(algorithm, key)`` for ``kid``, reloading once if unknown."""
+        entry = self._lookup(kid)
+        if entry is None and self.refresh(force=False):
+            entry = self._lookup(kid)
+        return entry
+
+    def _lookup(self, kid: Optional[str]) -> Optional[Tuple[str, Key]]:
+        keys = self._keys
+        entry = keys.get(kid)
+        if entry is None and kid is None and len(keys) == 1:
+            # Tokens without a kid are accepted when the set has a single key
+            entry = next(iter(keys.values()))
+        return entry
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await asyncio.to_thread(self.refresh)
+
+    async def start(self) -> None:
+        """Load the key set and start the background refresh task."""
+        await asyncio.to_thread(self.refresh)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_jwks: Optional[JWKSCache] = None
+
+
+def get_jwks() -> Optional[JWKSCache]:
+    """Return the process-wide key set, or ``None`` when ``JWKS_URL`` is unset."""
+    global _jwks
+    if not settings.JWKS_URL:
+        return None
+    if _jwks is None or _jwks.source != settings.JWKS_URL:
+        _jwks = JWKSCache(
+            settings.JWKS_URL,
+            algorithms=[alg.strip() for alg in settings.JWKS_ALGORITHMS.split(",") if alg.strip()],
+            refresh_interval=settings.JWKS_REFRESH_INTERVAL,
+            min_refresh_interval=settings.JWKS_MIN_REFRESH_INTERVAL,
+        )
+    return _jwks
+
+
+async def start_jwks() -> None:
+    """Load the configured key set at startup and keep it refreshed."""
+    jwks = get_jwks()
+    if jwks is not None:
+        await jwks.start()
+
+
+async def stop_jwks() -> None:
+    """Stop the background refresh during shutdown."""
+    if _jwks is not None:
+        await _jwks.stop()
@@ -0,0 +1,108 @@
+"""Sampling of high-volume log records.
+
+Rules keep one record in ``rate`` for a logger (and its children) or for a
+single message of a logger, identified by its unformatted ``msg``. Warnings
+and errors are always kept. Records carrying a ``trace_id`` are sampled by
+hashing the trace id, so a trace is either logged completely or not at all.
+
+Rules are read from ``LOG_SAMPLING_RULES`` at startup and can be replaced at
+runtime through the admin API; changes apply to the current process only.
+"""
+
+import itertools
+import logging
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import LOG_RECORDS_SAMPLED_OUT
+
+RuleKey = Tuple[str, Optional[str]]
+
+
+def parse_rules(value: str) -> Dict[RuleKey, int]:
+    """Parse ``logger[:message]=rate`` entries separated by commas."""
+    rules: Dict[RuleKey, int] = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        target, _, rate = entry.rpartition("=")
+        logger_name, _, message = target.partition(":")
+        if not logger_name.strip() or not rate.strip().isdigit():
+            raise ValueError(f"Invalid log sampling rule: {entry!r}")
+        rules[(logger_name.strip(), message.strip() or None)] = max(1, int(rate))
+    return rules
+
+
+def trace_sampled(trace_id: str, rate: int) -> bool:
+    """Return whether records of ``trace_id`` are kept at ``1/rate``."""
+    return zlib.crc32(trace_id.encode()) % rate == 0
+
+
+class SamplingFilter(logging.Filter):
+    """Logging filter applying the configured sampling rules."""
+
+    def __init__(self, rules: Optional[Dict[RuleKey, int]] = None) -> None:
+        super().__init__()
+        self.set_rules(rules or {})
+
+    @property
+    def rules(self) -> Dict[RuleKey, int]:
+        return dict(self._rules)
+
+    def set_rules(self, rules: Dict[RuleKey, int]) -> None:
+        """Replace every rule and restart the sampling counters."""
+        self._rules = dict(rules)
+        self._message_loggers = {name for name, message in rules if message is not None}
+        # Keyed by logger name only: messages are often formatted before
+        # logging, so a per-message cache would grow for the life of the process
+        self._resolved: Dict[str, Optional[Tuple[RuleKey, int]]] = {}
+        self._counters: Dict[RuleKey, Iterator[int]] = {}
+
+    def _resolve(self, record: logging.LogRecord) -> Optional[Tuple[RuleKey, int]]:
+        name = record.name
+        if name in self._message_loggers:
+            key = (name, str(record.msg))
+            if key in self._rules:
+                return key, self._rules[key]
+        if name in self._resolved:
+            return self._resolved[name]
+        match = None
+        # The most specific logger rule wins: "a.b.c", then "a.b", then "a"
+        parts = name.split(".")
+        for end in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:end])
+            if (prefix, None) in self._rules:
+                match = ((prefix, None), self._rules[(prefix, None)])
+                break
+        self._resolved[name] = match
+        return match
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._rules:
+            return True
+        match = self._resolve(record)
+        if match is None or match[1] <= 1:
+            return True
+        rule, rate = match
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            keep = trace_sampled(str(trace_id), rate)
+        else:
+            counter = self._counters.get(rule)
+            if counter is None:
+                counter = self._counters.setdefault(rule, itertools.count())
+            keep = next(counter) % rate == 0
+        if not keep:
+            LOG_RECORDS_SAMPLED_OUT.labels(logger=record.name).inc()
+        return keep
+
+
+sampler = SamplingFilter()
+
+
+def get_sampling_rules() -> List[dict]:
+    """Return the active rules in the shape used by the admin API."""
+    return [
+        {"logger": logger_name, "message": message, "rate": rate}
+        for (logger_name, message), rate in sampler.rules.items()
+    ]
@@ -1,21 +1,95 @@
+import atexit
+import copy
 import json
 import logging
-from typing import Any, Dict
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:  # orjson is optional; it is used when installed
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
 from app.core.config import settings
+from app.core.log_sampling import parse_rules, sampler
+from app.core.tracing import TraceIdLogFilter
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+# LogRecord attributes that are never copied into the JSON document
+_EXCLUDED_ATTRS = frozenset(
+    {
+        "args",
+        "msg",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+    }
+)
+
+
+def _default(value: Any) -> str:
+    """Serialize values the JSON encoder does not know (UUIDs, Decimals...)."""
+    return str(value)
+
+
+def _stdlib_dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=_default)
+
+
+def _orjson_dumps(data: Dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # e.g. integers wider than 64 bits, which the stdlib encoder accepts
+        return _stdlib_dumps(data)
+
+
+default_dumps: Callable[[Dict[str, Any]], str] = (
+    _orjson_dumps if orjson is not None else _stdlib_dumps
+)
 
 
 class JsonFormatter(logging.Formatter):
-    """Format logs as structured JSON."""
+    """Format logs as structured JSON.
 
-    def __init__(self) -> None:
+    The timestamp string is cached per second and the JSON encoder defaults
+    to orjson when it is installed; pass ``dumps`` to use another encoder.
+    """
+
+    def __init__(self, dumps: Optional[Callable[[Dict[str, Any]], str]] = None) -> None:
         super().__init__(datefmt="%Y-%m-%dT%H:%M:%S%z")
+        self.dumps = dumps or default_dumps
+        self.service_name = settings.PROJECT_NAME
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        second = int(record.created)
+        cached_second, timestamp = self._timestamp_cache
+        if cached_second != second:
+            timestamp = self.formatTime(record, self.datefmt)
+            self._timestamp_cache = (second, timestamp)
+        return timestamp
 
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         log_record: Dict[str, Any] = {
-            "timestamp": self.formatTime(record, self.datefmt),
+            "timestamp": self._timestamp(record),
             "level": record.levelname.lower(),
-            "service_name": settings.PROJECT_NAME,
+            "service_name": self.service_name,
             "message": record.getMessage(),
         }
 
@@ -24,38 +98,100 @@ class JsonFormatter(logging.Formatter):
 
         # Include any custom extra attributes
         for key, value in record.__dict__.items():
-            if key not in log_record and key not in {
-                "args",
-                "msg",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-            }:
+            if key not in _EXCLUDED_ATTRS and key not in log_record:
                 log_record[key] = value
 
-        return json.dumps(log_record)
+        return self.dumps(log_record)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hand records to a :class:`QueueListener` through a bounded queue.
+
+    Formatting and writing happen on the listener thread. When the queue is
+    full, ``overflow`` decides what happens: ``drop_newest`` discards the new
+    record, ``drop_oldest`` discards the oldest queued one and ``block`` waits
+    for room. Dropped records are counted in ``LOG_RECORDS_DROPPED``.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", overflow: str = "drop_newest") -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now since they may change once the call returns;
+        # the record is formatted by the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.overflow != "drop_oldest":
+                LOG_RECORDS_DROPPED.inc()
+                return
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        LOG_RECORDS_DROPPED.inc()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _LogQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room instead of failing when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Stop the listener thread, writing out the records still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logging() -> None:
-    """Configure root logger with :class:`JsonFormatter`."""
+    """Configure root logger with :class:`JsonFormatter`.
 
-    handler = logging.StreamHandler()
+    With ``LOG_ASYNC`` enabled records are written by a background
+    :class:`QueueListener`, so a slow stdout never blocks the caller. The
+    sampling rules from ``LOG_SAMPLING_RULES`` are applied, and the current
+    request's trace id added, before a record is formatted or queued.
+    """
+    global _listener
+    stop_logging()
+
+    handler: logging.Handler = logging.StreamHandler()
     handler.setFormatter(JsonFormatter())
 
+    if settings.LOG_ASYNC:
+        log_queue: "queue.Queue" = queue.Queue(maxsize=max(1, settings.LOG_QUEUE_SIZE))
+        _listener = _LogQueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        handler = BoundedQueueHandler(log_queue, settings.LOG_QUEUE_OVERFLOW)
+
+    sampler.set_rules(parse_rules(settings.LOG_SAMPLING_RULES))
+    # The trace id is added first so that sampling can be trace-consistent
+    handler.addFilter(TraceIdLogFilter())
+    handler.addFilter(sampler)
+
     root_logger = logging.getLogger()
     root_logger.handlers = [handler]
     root_logger.setLevel(logging.INFO)
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,183 @@
+"""Prometheus metrics shared across the service.
+
+Metrics are registered on the default registry, so they are exported by the
+``/metrics`` endpoint exposed in :mod:`main`. They live in their own module
+because :mod:`main` and :mod:`app.db.database` may be re-imported, which must
+not register the same collectors twice.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Database connection pool
+DB_POOL_SIZE = Gauge(
+    "bee_customers_db_pool_size",
+    "Configured number of persistent connections in the database pool",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "bee_customers_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "bee_customers_db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is filling)",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "bee_customers_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_READ_SESSIONS = Counter(
+    "bee_customers_db_read_sessions_total",
+    "Sessions opened for read-only endpoints, by target (replica or primary)",
+    ["target"],
+)
+DB_QUERY_DURATION = Histogram(
+    "bee_customers_db_query_duration_seconds",
+    "SQL statement execution time by statement fingerprint and calling service method",
+    ["fingerprint", "source"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_SLOW_QUERIES = Counter(
+    "bee_customers_db_slow_queries_total",
+    "SQL statements slower than DB_SLOW_QUERY_MS, by calling service method",
+    ["source"],
+)
+
+# RabbitMQ publisher
+RABBITMQ_CHANNELS_OPEN = Gauge(
+    "bee_customers_rabbitmq_channels_open",
+    "Number of RabbitMQ channels currently open in the publisher pool",
+)
+RABBITMQ_CHANNELS_IN_USE = Gauge(
+    "bee_customers_rabbitmq_channels_in_use",
+    "Number of pooled RabbitMQ channels currently checked out",
+)
+RABBITMQ_RECONNECTS = Counter(
+    "bee_customers_rabbitmq_reconnects_total",
+    "Number of times the publisher connection was re-established",
+)
+RABBITMQ_BATCH_SIZE = Histogram(
+    "bee_customers_rabbitmq_batch_size",
+    "Number of messages published per pipelined batch",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+# Dead-letter store
+DEAD_LETTER_STORED = Counter(
+    "bee_customers_dead_letter_stored_total",
+    "Number of failed events written to the Redis dead-letter list",
+)
+DEAD_LETTER_DROPPED = Counter(
+    "bee_customers_dead_letter_dropped_total",
+    "Number of failed events dropped because the spill buffer was full",
+)
+DEAD_LETTER_REDIS_ERRORS = Counter(
+    "bee_customers_dead_letter_redis_errors_total",
+    "Number of failed attempts to write dead-lettered events to Redis",
+)
+DEAD_LETTER_SPILLED = Gauge(
+    "bee_customers_dead_letter_spilled",
+    "Number of failed events held in memory while Redis is unavailable",
+)
+
+# Shared HTTP clients
+HTTP_POOL_IN_FLIGHT = Gauge(
+    "bee_customers_http_pool_in_flight",
+    "Requests currently using a pooled connection, per downstream origin",
+    ["origin"],
+)
+HTTP_POOL_MAX_CONNECTIONS = Gauge(
+    "bee_customers_http_pool_max_connections",
+    "Configured connection limit of the pool, per downstream origin",
+    ["origin"],
+)
+
+# Log shipping
+LOG_SHIPPER_QUEUED = Gauge(
+    "bee_customers_log_shipper_queued",
+    "Log entries waiting in the in-process buffer",
+)
+LOG_SHIPPER_SHIPPED = Counter(
+    "bee_customers_log_shipper_shipped_total",
+    "Log entries delivered to the log service",
+)
+LOG_SHIPPER_DROPPED = Counter(
+    "bee_customers_log_shipper_dropped_total",
+    "Log entries dropped because the buffer overflowed or delivery kept failing",
+)
+
+# Asynchronous log output
+LOG_RECORDS_DROPPED = Counter(
+    "bee_customers_log_records_dropped_total",
+    "Log records dropped because the asynchronous logging queue was full",
+)
+LOG_RECORDS_SAMPLED_OUT = Counter(
+    "bee_customers_log_records_sampled_out_total",
+    "Log records discarded by the sampling rules",
+    ["logger"],
+)
+
+# Auth service profile sync
+AUTH_SYNC_QUEUE_DEPTH = Gauge(
+    "bee_customers_auth_sync_queue_depth",
+    "Users with profile changes waiting to be synced to the auth service",
+)
+AUTH_SYNC_LAG = Histogram(
+    "bee_customers_auth_sync_lag_seconds",
+    "Time from queueing a profile change to its delivery to the auth service",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300),
+)
+AUTH_SYNC_FAILED = Counter(
+    "bee_customers_auth_sync_failed_total",
+    "Profile syncs persisted for later after exhausting their retries",
+)
+
+# Verified JWT cache
+TOKEN_CACHE_HITS = Counter(
+    "bee_customers_token_cache_hits_total",
+    "Bearer tokens whose verified claims were served from the cache",
+)
+TOKEN_CACHE_MISSES = Counter(
+    "bee_customers_token_cache_misses_total",
+    "Bearer tokens that had to be fully verified",
+)
+
+# Customer read cache
+CUSTOMER_CACHE_REQUESTS = Counter(
+    "bee_customers_customer_cache_requests_total",
+    "Customer profile cache lookups by result (local_hit, redis_hit, miss)",
+    ["result"],
+)
+CUSTOMER_CACHE_INVALIDATIONS = Counter(
+    "bee_customers_customer_cache_invalidations_total",
+    "Customer profiles dropped from the cache, by writes in this worker or others",
+    ["source"],
+)
+CUSTOMER_CACHE_REDIS_ERRORS = Counter(
+    "bee_customers_customer_cache_redis_errors_total",
+    "Failed Redis calls of the shared customer cache",
+)
+
+# Request coalescing
+SINGLEFLIGHT_CALLS = Counter(
+    "bee_customers_singleflight_calls_total",
+    "Calls executed by a single-flight group",
+    ["name"],
+)
+SINGLEFLIGHT_COALESCED = Counter(
+    "bee_customers_singleflight_coalesced_total",
+    "Callers that waited for an identical call already in flight instead of running their own",
+    ["name"],
+)
+
+# Circuit breakers
+CIRCUIT_BREAKER_STATE = Gauge(
+    "bee_customers_circuit_breaker_state",
+    "Circuit breaker state per dependency (0 = closed, 1 = open, 2 = half-open)",
+    ["name"],
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "bee_customers_circuit_breaker_rejected_total",
+    "Calls rejected without being attempted because the breaker was open",
+    ["name"],
+)
@@ -0,0 +1,43 @@
+"""Canonical forms of customer contact details used for exact lookups.
+
+Phones are accepted as entered (``+407...``, ``07...``, ``7...``) and emails
+keep their original case, so both are also stored normalized to let a lookup
+resolve them with a single index probe.
+"""
+
+import re
+from typing import Optional
+
+DEFAULT_COUNTRY_CODE = "40"
+
+_PHONE_SEPARATORS = re.compile(r"[\s().-]")
+# The schema accepts "+47xxxxxxxx" as a shortened form of "+407xxxxxxxx"
+_SHORT_ROMANIAN_MOBILE = re.compile(r"^\+47\d{8}$")
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Return ``phone`` in E.164 form, or ``None`` if it is not a phone number.
+
+    National numbers are assumed to be Romanian.
+    """
+    if not phone:
+        return None
+    digits = _PHONE_SEPARATORS.sub("", phone)
+    if digits.startswith("00"):
+        digits = "+" + digits[2:]
+    if _SHORT_ROMANIAN_MOBILE.match(digits):
+        digits = "+40" + digits[2:]
+    elif digits.startswith("0"):
+        digits = "+" + DEFAULT_COUNTRY_CODE + digits[1:]
+    elif not digits.startswith("+"):
+        digits = "+" + DEFAULT_COUNTRY_CODE + digits
+    if not digits[1:].isdigit() or not 8 <= len(digits) <= 16:
+        return None
+    return digits
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Return ``email`` trimmed and lowercased."""
+    if not email:
+        return None
+    return email.strip().lower()
@@ -0,0 +1,30 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page, so the next page
+starts right after it with an indexed range scan instead of an ``OFFSET``.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Return an opaque cursor pointing after ``(created_at, row_id)``."""
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Return the ``(created_at, id)`` key of ``cursor``.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,3 +1,8 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, status
@@ -6,23 +11,102 @@ from jose import JWTError, jwt
 from jose.exceptions import ExpiredSignatureError
 
 from app.core.config import settings
+from app.core.jwks import get_jwks
+from app.core.metrics import TOKEN_CACHE_HITS, TOKEN_CACHE_MISSES
 from app.schemas.user import User
 
 
 bearer_scheme = HTTPBearer()
 
 
+class TokenCache:
+    """Bounded LRU cache of verified JWT claims keyed by the token digest.
+
+    Entries expire after ``ttl`` seconds or at the token's ``exp``, whichever
+    comes first, so an expired token is always verified (and rejected) again.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token: str, claims: dict) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
+
+
+def _verify_jwt(token: str) -> dict:
+    """Verify ``token`` with the JWKS key for its ``kid`` or the secret key."""
+    jwks = get_jwks()
+    if jwks is not None:
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") in jwks.algorithms:
+            entry = jwks.get_key(header.get("kid"))
+            if entry is None:
+                raise JWTError("Unknown signing key")
+            algorithm, key = entry
+            return jwt.decode(token, key, algorithms=[algorithm])
+    return jwt.decode(
+        token,
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )
+
+
 def decode_jwt(token: str) -> dict:
-    """Decode a JWT token using the project secret key.
+    """Decode a JWT token using the project secret key or the JWKS keys.
+
+    Tokens signed with an algorithm from ``JWKS_ALGORITHMS`` are verified
+    against the key set configured by ``JWKS_URL``.
+
+    Verified claims are cached by :data:`token_cache`, so a token reused for
+    many requests is only verified once until it expires.
 
     Raises an HTTP 401 error if the token is invalid or expired.
     """
+    claims = token_cache.get(token)
+    if claims is not None:
+        TOKEN_CACHE_HITS.inc()
+        return dict(claims)
+    TOKEN_CACHE_MISSES.inc()
     try:
-        return jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
+        claims = _verify_jwt(token)
     except ExpiredSignatureError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,6 +117,8 @@ def decode_jwt(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
         ) from exc
+    token_cache.set(token, claims)
+    return dict(claims)
 
 
 def get_current_user(
@@ -0,0 +1,60 @@
+"""In-process coalescing of identical concurrent calls.
+
+While a call for a key is in flight, other callers asking for the same key
+wait for its result instead of running their own. Results are not kept once
+the call finishes; caching is left to the caller.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from app.core.metrics import SINGLEFLIGHT_CALLS, SINGLEFLIGHT_COALESCED
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call per key among concurrent callers.
+
+    Callers that join a call receive its result or its exception. If the
+    call is cancelled, for example because its client went away, the callers
+    waiting on it start over instead of being cancelled too.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``fn()``, sharing it with concurrent callers of ``key``."""
+        coalesced = False
+        while key in self._calls:
+            future = self._calls[key]
+            if not coalesced:
+                coalesced = True
+                SINGLEFLIGHT_COALESCED.labels(name=self.name).inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        SINGLEFLIGHT_CALLS.labels(name=self.name).inc()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark it retrieved so a call nobody joined is not reported by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
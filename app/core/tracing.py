@@ -1,7 +1,83 @@
+"""Request trace id propagation.
+
+:class:`TraceIdMiddleware` resolves the trace id once per request, from the
+``X-Trace-Id`` header or a new UUID, and stores it in :data:`trace_id_var`.
+Code running inside the request reads it with :func:`current_trace_id`:
+log records, outbound HTTP calls and published events pick it up without it
+being passed around, and the response echoes it back.
+"""
+
+import logging
+import re
+from contextvars import ContextVar
+from typing import Optional
 from uuid import uuid4
+
 from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TRACE_HEADER = "X-Trace-Id"
+
+trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+
+# Incoming ids are stored with events (64 characters) and echoed in headers
+_VALID_TRACE_ID = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+_TRACE_HEADER_KEY = TRACE_HEADER.lower().encode()
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the trace id of the request being handled, if any."""
+    return trace_id_var.get()
+
+
+def _resolve(value: Optional[str]) -> str:
+    if value and _VALID_TRACE_ID.match(value):
+        return value
+    return str(uuid4())
+
 
 def get_trace_id(request: Request) -> str:
-    """Return trace_id from headers or generate a new one."""
-    return request.headers.get("X-Trace-Id", str(uuid4()))
+    """Return the trace id of ``request``, resolving it if no middleware did."""
+    return current_trace_id() or _resolve(request.headers.get(TRACE_HEADER))
+
+
+class TraceIdMiddleware:
+    """ASGI middleware binding the request trace id to :data:`trace_id_var`."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = None
+        for key, value in scope["headers"]:
+            if key == _TRACE_HEADER_KEY:
+                header = value.decode("latin-1")
+                break
+        trace_id = _resolve(header)
+        encoded = trace_id.encode("latin-1")
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (_TRACE_HEADER_KEY, encoded)]
+            await send(message)
+
+        token = trace_id_var.set(trace_id)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            trace_id_var.reset(token)
+
+
+class TraceIdLogFilter(logging.Filter):
+    """Add the current trace id to records that do not carry one."""
 
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "trace_id", None) is None:
+            trace_id = trace_id_var.get()
+            if trace_id is not None:
+                record.trace_id = trace_id
+        return True
@@ -1,19 +1,181 @@
-from typing import AsyncGenerator
+import itertools
+import logging
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from uuid import UUID
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+from app.db.instrumentation import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Return ``create_async_engine`` options for ``url``.
+
+    The pool settings are not applied to SQLite, which is only used for
+    local runs and tests.
+    """
+    options: Dict[str, Any] = {"future": True, "poolclass": InstrumentedAsyncPool}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+class RecentWrites:
+    """Users who committed a write within the last ``window`` seconds.
+
+    Their reads go to the primary so they see their own changes even while
+    the replicas lag behind. The window is tracked per process.
+    """
+
+    def __init__(self, window: float = 5.0, max_users: int = 10000) -> None:
+        self.window = window
+        self.max_users = max_users
+        self._writes: Dict[UUID, float] = {}
+
+    def record(self, user_id: UUID) -> None:
+        now = time.monotonic()
+        if len(self._writes) >= self.max_users:
+            self._writes = {
+                user: at for user, at in self._writes.items() if now - at < self.window
+            }
+        self._writes[user_id] = now
+
+    def active(self, user_id: UUID) -> bool:
+        written_at = self._writes.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+
+class ReadReplicas:
+    """Round-robin over read replicas, skipping the ones that fail to connect.
+
+    A replica that cannot be reached is skipped for ``retry_interval``
+    seconds. When no replica is available the caller falls back to the
+    primary.
+    """
+
+    def __init__(self, urls: List[str], retry_interval: float = 30.0) -> None:
+        self.urls = urls
+        self.retry_interval = retry_interval
+        self.engines = [create_async_engine(url, **engine_options(url)) for url in urls]
+        for engine in self.engines:
+            instrument_engine(engine.sync_engine)
+        self.sessionmakers = [
+            async_sessionmaker(bind=engine, expire_on_commit=False) for engine in self.engines
+        ]
+        self._down_until = [0.0] * len(urls)
+        self._next = itertools.count()
+
+    def _candidates(self) -> List[int]:
+        start = next(self._next) % len(self.engines)
+        now = time.monotonic()
+        order = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+        return [index for index in order if self._down_until[index] <= now]
+
+    async def open_session(self) -> Optional[AsyncSession]:
+        """Return a connected session on a healthy replica, or ``None``."""
+        for index in self._candidates():
+            session = self.sessionmakers[index]()
+            session.info["replica"] = True
+            try:
+                await session.connection()
+            except Exception as exc:
+                await session.close()
+                self._down_until[index] = time.monotonic() + self.retry_interval
+                logger.warning(
+                    "Read replica unavailable",
+                    extra={"replica": index, "error": str(exc)},
+                )
+                continue
+            return session
+        return None
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class _TrackedSession(Session):
+    """Session recording committed writes in :data:`recent_writes`.
+
+    The writer is looked up at commit time through ``info["writer"]``, a
+    callable returning the user id or ``None``.
+    """
+
+
+@event.listens_for(_TrackedSession, "after_flush")
+def _mark_write(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(_TrackedSession, "after_rollback")
+def _clear_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(_TrackedSession, "after_commit")
+def _record_write(session: Session) -> None:
+    if not session.info.pop("wrote", False):
+        return
+    writer: Optional[Callable[[], Optional[UUID]]] = session.info.get("writer")
+    user_id = writer() if writer is not None else None
+    if user_id is not None:
+        recent_writes.record(user_id)
+
 
 # Create asynchronous SQLAlchemy engine using asyncpg driver
-engine = create_async_engine(settings.DATABASE_URL, future=True)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine.sync_engine)
+
+# Export pool usage on /metrics; read lazily from the current engine
+DB_POOL_SIZE.set_function(lambda: engine.pool.size())
+DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+DB_POOL_OVERFLOW.set_function(lambda: engine.pool.overflow())
 
 # Create async session factory
-SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+SessionLocal = async_sessionmaker(
+    bind=engine, expire_on_commit=False, sync_session_class=_TrackedSession
+)
+
+recent_writes = RecentWrites(settings.DB_READ_YOUR_WRITES_WINDOW)
+read_replicas: Optional[ReadReplicas] = (
+    ReadReplicas(settings.DATABASE_READ_URLS.split(","), settings.DB_REPLICA_RETRY_INTERVAL)
+    if settings.DATABASE_READ_URLS
+    else None
+)
 
 # Create Base class for models
 Base = declarative_base()
@@ -23,3 +185,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield an ``AsyncSession`` for request handlers."""
     async with SessionLocal() as session:
         yield session
+
+
+async def close_read_replicas() -> None:
+    """Dispose the replica connection pools during shutdown."""
+    if read_replicas is not None:
+        await read_replicas.dispose()
@@ -0,0 +1,112 @@
+"""Per-statement timing for SQLAlchemy engines.
+
+:func:`instrument_engine` times every statement executed by an engine and
+records it in ``DB_QUERY_DURATION``, labelled by a normalized fingerprint of
+the SQL and by the service method that issued it. Statements slower than
+``DB_SLOW_QUERY_MS`` are also logged. Service classes decorated with
+:func:`instrument_service` set the calling method in :data:`query_source`.
+"""
+
+import functools
+import inspect
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERY_DURATION, DB_SLOW_QUERIES
+
+logger = logging.getLogger(__name__)
+
+query_source: ContextVar[str] = ContextVar("query_source", default="other")
+
+_MAX_FINGERPRINT_LENGTH = 160
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"(?:\$\d+|%\(\w+\)s|(?<![:\w]):\w+|__\[POSTCOMPILE_\w+\])")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+C = TypeVar("C", bound=type)
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Return ``statement`` with literals and parameters replaced by ``?``."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return normalized[:_MAX_FINGERPRINT_LENGTH]
+
+
+def _parameter_count(parameters: Any, executemany: bool) -> int:
+    if not parameters:
+        return 0
+    if executemany:
+        return sum(len(row) for row in parameters)
+    return len(parameters)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    source = query_source.get()
+    statement_fingerprint = fingerprint(statement)
+    DB_QUERY_DURATION.labels(fingerprint=statement_fingerprint, source=source).observe(elapsed)
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        DB_SLOW_QUERIES.labels(source=source).inc()
+        logger.warning(
+            "Slow query",
+            extra={
+                "fingerprint": statement_fingerprint,
+                "source": source,
+                "duration_ms": round(elapsed * 1000, 2),
+                "parameter_count": _parameter_count(parameters, executemany),
+            },
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # The statement failed, so after_cursor_execute will not pop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the timing hooks to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def instrument_service(cls: C) -> C:
+    """Label queries issued by the public coroutine methods of ``cls``."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _with_source(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _with_source(source: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = query_source.set(source)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            query_source.reset(token)
+
+    return wrapper
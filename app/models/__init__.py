@@ -2,10 +2,12 @@ from app.models.customer import Customer
 from app.models.customer_tag import CustomerTag
 from app.models.customer_note import CustomerNote
 from app.models.customer_history import CustomerHistory
+from app.models.event_outbox import EventOutbox
 
 __all__ = [
     "Customer",
     "CustomerTag",
     "CustomerNote",
     "CustomerHistory",
+    "EventOutbox",
 ]
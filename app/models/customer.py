@@ -22,6 +22,10 @@ class Customer(Base):
     gender = Column(Enum("male", "female", "other", name="gender_enum"))
     avatar_url = Column(String(255), nullable=True)  # link imagine avatar
 
+    # Forme normalizate pentru căutări exacte (E.164, email cu litere mici)
+    phone_e164 = Column(String(20), nullable=True)
+    email_normalized = Column(String(100), nullable=True)
+
     # Statistici agregate
     total_orders = Column(Integer, default=0)
     total_appointments = Column(Integer, default=0)
@@ -37,8 +41,25 @@ class Customer(Base):
         UniqueConstraint("user_id", "business_id", name="uq_user_per_business"),
     )
 
-# Explicit indexes for faster queries on common filters
-Index("ix_customer_business_id", Customer.business_id)
-Index("ix_customer_user_id", Customer.user_id)
-Index("ix_customer_full_name", Customer.full_name)
-Index("ix_customer_phone", Customer.phone)
+# business_id and user_id lookups are served by the composite indexes below
+# and by uq_user_per_business; name / phone search by the trigram indexes
+# Keyset pagination of a business's customers ordered by (created_at, id)
+Index(
+    "ix_customer_business_created_id",
+    Customer.business_id,
+    Customer.created_at,
+    Customer.id,
+)
+# The same order over all businesses, for the admin list without a filter
+Index("ix_customer_created_id", Customer.created_at, Customer.id)
+# Exact phone / email lookups within a business
+Index("ix_customer_business_phone_e164", Customer.business_id, Customer.phone_e164)
+Index("ix_customer_business_email_normalized", Customer.business_id, Customer.email_normalized)
+# Trigram indexes serving the ILIKE '%term%' customer search on PostgreSQL
+for _column in (Customer.full_name, Customer.email, Customer.phone):
+    Index(
+        f"ix_customer_{_column.key}_trgm",
+        _column,
+        postgresql_using="gin",
+        postgresql_ops={_column.key: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from uuid import uuid4
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class EventOutbox(Base):
+    __tablename__ = "event_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    event_name = Column(String(100), nullable=False)   # routing key, ex: "v1.customer.created"
+    payload = Column(JSON, nullable=False)
+    trace_id = Column(String(64), nullable=True)
+
+    # Livrare
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(255), nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+# The relay always drains the oldest pending events first
+Index("ix_event_outbox_created_at", EventOutbox.created_at)
+# Failed events wait for their backoff to expire
+Index("ix_event_outbox_next_attempt_at", EventOutbox.next_attempt_at)
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class LogSamplingRule(BaseModel):
+    logger: str = Field(..., min_length=1)
+    message: Optional[str] = None
+    rate: int = Field(..., ge=1)
+
+
+class LogSamplingConfig(BaseModel):
+    rules: List[LogSamplingRule] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, constr
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
 from enum import Enum
@@ -26,6 +26,49 @@ class CustomerCreate(CustomerBase):
     business_id: UUID
 
 
+class CustomerBulkCreate(BaseModel):
+    customers: List[CustomerCreate] = Field(..., min_length=1)
+
+
+class CustomerBulkCreated(BaseModel):
+    index: int
+    id: UUID
+
+
+class CustomerBulkConflict(BaseModel):
+    index: int
+    user_id: UUID
+    business_id: UUID
+    reason: str
+
+
+class CustomerBulkResult(BaseModel):
+    created: List[CustomerBulkCreated] = []
+    conflicts: List[CustomerBulkConflict] = []
+
+
+class ImportStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class CustomerImportJob(BaseModel):
+    id: str
+    status: ImportStatus = ImportStatus.PENDING
+    format: str
+    bytes_total: int = 0
+    bytes_processed: int = 0
+    rows_processed: int = 0
+    created: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class CustomerUpdate(CustomerBase):
     full_name: Optional[str] = Field(None, min_length=2, max_length=100)
     email: Optional[EmailStr] = None
@@ -0,0 +1,297 @@
+import asyncio
+import contextvars
+import json
+import logging
+import urllib.request
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as aioredis
+
+try:  # httpx is optional in production
+    import httpx
+except Exception:  # pragma: no cover - optional dependency
+    httpx = None
+
+from app.core.circuit_breaker import get_breaker
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.metrics import AUTH_SYNC_FAILED, AUTH_SYNC_LAG, AUTH_SYNC_QUEUE_DEPTH
+from app.core.tracing import current_trace_id, trace_id_var
+
+logger = logging.getLogger(__name__)
+
+# Merge each ARGV (field, json) pair into the stored change for that user
+_PERSIST_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local change = cjson.decode(ARGV[i + 1])
+    local stored = redis.call('HGET', KEYS[1], ARGV[i])
+    if stored then
+        local merged = cjson.decode(stored)
+        for name, value in pairs(change) do
+            merged[name] = value
+        end
+        change = merged
+    end
+    redis.call('HSET', KEYS[1], ARGV[i], cjson.encode(change))
+end
+return #ARGV / 2
+"""
+
+
+class AuthSyncRejected(Exception):
+    """The auth service refused the update; retrying will not help."""
+
+
+async def send_profile_update(user_id: UUID, data: dict) -> None:
+    """PATCH the user's profile in the auth service, raising on failure."""
+    url = f"{settings.AUTH_SERVICE_URL}/api/users/{user_id}"
+    breaker = get_breaker("auth_service")
+
+    if httpx is not None:
+        async with breaker.guard():
+            client = get_http_client(url)
+            response = await client.patch(url, json=data, timeout=settings.HTTP_TIMEOUT)
+            if response.status_code >= 500:
+                raise ConnectionError(f"auth service returned {response.status_code}")
+        if response.status_code >= 400:
+            raise AuthSyncRejected(f"auth service returned {response.status_code}")
+        return
+
+    def send_patch() -> None:  # Fallback using urllib if httpx is unavailable
+        request = urllib.request.Request(
+            url,
+            method="PATCH",
+            data=json.dumps(data).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        urllib.request.urlopen(request, timeout=settings.HTTP_TIMEOUT)
+
+    async with breaker.guard():
+        await asyncio.to_thread(send_patch)
+
+
+class AuthSyncQueue:
+    """Background queue propagating profile changes to the auth service.
+
+    Pending changes are coalesced per ``user_id``: several updates queued
+    before delivery become a single PATCH carrying the latest value of every
+    field. Failed deliveries are retried with exponential backoff; changes
+    that still cannot be delivered (or are pending at shutdown) are saved in
+    a Redis hash and re-queued by :meth:`restore` on the next startup.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+        persist_key: str = "auth_sync:pending",
+    ) -> None:
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.persist_key = persist_key
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[UUID, dict] = {}
+        self._queued_at: Dict[UUID, float] = {}
+        self._attempts: Dict[UUID, int] = {}
+        self._trace_ids: Dict[UUID, Optional[str]] = {}
+        self._retrying: Dict[UUID, Tuple[asyncio.TimerHandle, dict]] = {}
+        # Changes taken from _pending whose delivery has not finished yet
+        self._in_flight: Dict[UUID, dict] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[aioredis.Redis] = None
+
+    def _update_depth(self) -> None:
+        AUTH_SYNC_QUEUE_DEPTH.set(
+            len(self._pending) + len(self._retrying) + len(self._in_flight)
+        )
+
+    def _get_client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._client = aioredis.from_url(settings.REDIS_URL)
+        return self._client
+
+    def enqueue(self, user_id: UUID, data: dict) -> None:
+        """Queue fields to sync, merging them with any pending change."""
+        if not settings.AUTH_SERVICE_URL:
+            return
+        self.loop = asyncio.get_running_loop()
+        retry = self._retrying.pop(user_id, None)
+        if retry is not None:
+            # A newer change supersedes the scheduled retry
+            handle, retry_data = retry
+            handle.cancel()
+            data = {**retry_data, **data}
+        self._pending[user_id] = {**self._pending.get(user_id, {}), **data}
+        self._queued_at.setdefault(user_id, self.loop.time())
+        # The PATCH carries the trace id of the latest change it includes
+        self._trace_ids[user_id] = current_trace_id()
+        self._update_depth()
+        self._ready.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            await self._deliver_pending()
+
+    async def _deliver_pending(self) -> None:
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        self._update_depth()
+        await asyncio.gather(*(self._deliver(user_id, data) for user_id, data in batch.items()))
+
+    async def _deliver(self, user_id: UUID, data: dict) -> None:
+        # Runs in its own task (see gather), so the trace id stays local to it
+        trace_id_var.set(self._trace_ids.get(user_id))
+        try:
+            await send_profile_update(user_id, data)
+        except AuthSyncRejected as exc:
+            self._in_flight.pop(user_id, None)
+            self._finish(user_id)
+            logger.warning(
+                "Auth service rejected profile sync",
+                extra={"user_id": str(user_id), "error": str(exc)},
+            )
+        except Exception as exc:
+            attempts = self._attempts.get(user_id, 0) + 1
+            if attempts > self.max_retries:
+                AUTH_SYNC_FAILED.inc()
+                await self._persist({user_id: data})
+                self._in_flight.pop(user_id, None)
+                self._finish(user_id)
+                logger.warning(
+                    "Failed to notify auth service",
+                    extra={"user_id": str(user_id), "error": str(exc)},
+                )
+                return
+            self._attempts[user_id] = attempts
+            self._in_flight.pop(user_id, None)
+            if user_id in self._pending:
+                # A newer change is already queued; resend both together
+                self._pending[user_id] = {**data, **self._pending[user_id]}
+                self._ready.set()
+                return
+            delay = self.retry_backoff * 2 ** (attempts - 1)
+            handle = self.loop.call_later(delay, self._retry, user_id)
+            self._retrying[user_id] = (handle, data)
+            self._update_depth()
+        else:
+            self._in_flight.pop(user_id, None)
+            now = self.loop.time()
+            AUTH_SYNC_LAG.observe(now - self._queued_at.get(user_id, now))
+            self._finish(user_id)
+
+    def _retry(self, user_id: UUID) -> None:
+        _, data = self._retrying.pop(user_id)
+        self._pending[user_id] = {**data, **self._pending.get(user_id, {})}
+        self._ready.set()
+
+    def _finish(self, user_id: UUID) -> None:
+        if (
+            user_id not in self._pending
+            and user_id not in self._retrying
+            and user_id not in self._in_flight
+        ):
+            self._queued_at.pop(user_id, None)
+            self._attempts.pop(user_id, None)
+            self._trace_ids.pop(user_id, None)
+
+    async def flush(self) -> None:
+        """Deliver every pending change now, including scheduled retries."""
+        for user_id in list(self._retrying):
+            handle, _ = self._retrying[user_id]
+            handle.cancel()
+            self._retry(user_id)
+        while self._pending:
+            await self._deliver_pending()
+
+    async def _persist(self, changes: Dict[UUID, dict]) -> None:
+        """Merge ``changes`` into the Redis hash in one atomic script call."""
+        if not changes or not settings.REDIS_URL:
+            return
+        args = []
+        for user_id, data in changes.items():
+            args.extend((str(user_id), json.dumps(data)))
+        try:
+            await self._get_client().eval(_PERSIST_SCRIPT, 1, self.persist_key, *args)
+        except Exception as exc:
+            logger.warning(
+                "Could not persist pending auth syncs",
+                extra={"count": len(changes), "error": str(exc)},
+            )
+
+    async def restore(self) -> None:
+        """Re-queue changes persisted by a previous process."""
+        if not settings.REDIS_URL or not settings.AUTH_SERVICE_URL:
+            return
+        client = self._get_client()
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                stored, _ = await pipe.hgetall(self.persist_key).delete(self.persist_key).execute()
+        except Exception as exc:
+            logger.warning("Could not restore pending auth syncs", extra={"error": str(exc)})
+            return
+        for field, value in stored.items():
+            user_id = UUID(field.decode() if isinstance(field, bytes) else field)
+            self.enqueue(user_id, json.loads(value))
+
+    async def stop(self) -> None:
+        """Stop the worker and persist everything not yet delivered.
+
+        Changes whose delivery was interrupted are persisted too, merged
+        under any newer change queued for the same user.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        undelivered = dict(self._in_flight)
+        for user_id, (handle, data) in self._retrying.items():
+            handle.cancel()
+            undelivered[user_id] = {**undelivered.get(user_id, {}), **data}
+        for user_id, data in self._pending.items():
+            undelivered[user_id] = {**undelivered.get(user_id, {}), **data}
+        self._in_flight.clear()
+        self._pending.clear()
+        self._retrying.clear()
+        self._update_depth()
+        await self._persist(undelivered)
+        if self._client is not None:
+            await self._client.close(close_connection_pool=True)
+            self._client = None
+
+
+_queue: Optional[AuthSyncQueue] = None
+
+
+def get_auth_sync_queue() -> AuthSyncQueue:
+    """Return the process-wide sync queue bound to the running loop."""
+    global _queue
+    loop = asyncio.get_running_loop()
+    if _queue is None or (_queue.loop is not None and _queue.loop is not loop):
+        _queue = AuthSyncQueue(
+            settings.AUTH_SYNC_MAX_RETRIES,
+            settings.AUTH_SYNC_RETRY_BACKOFF,
+            settings.AUTH_SYNC_PERSIST_KEY,
+        )
+    return _queue
+
+
+async def start_auth_sync() -> None:
+    """Re-queue syncs left undelivered by a previous process."""
+    await get_auth_sync_queue().restore()
+
+
+async def stop_auth_sync() -> None:
+    """Stop the queue during shutdown, persisting undelivered syncs."""
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.metrics import (
+    CUSTOMER_CACHE_INVALIDATIONS,
+    CUSTOMER_CACHE_REDIS_ERRORS,
+    CUSTOMER_CACHE_REQUESTS,
+)
+from app.schemas.customer import CustomerResponse
+
+logger = logging.getLogger(__name__)
+
+
+class CustomerCache:
+    """Read-through cache of customer profiles keyed by customer id.
+
+    Profiles live in a per-process LRU for ``ttl`` seconds. With a Redis
+    ``url`` they are also shared between workers, and every invalidation is
+    published on ``channel`` so the other workers drop their local copy.
+    Without Redis, other workers may serve a changed profile for up to
+    ``ttl`` seconds. Redis errors are logged and treated as cache misses,
+    and Redis is skipped for ``retry_interval`` seconds after a failure.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_size: int = 10000,
+        ttl: float = 30.0,
+        channel: str = "customer_cache_invalidations",
+        key_prefix: str = "customer:",
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.url = url
+        self.max_size = max_size
+        self.ttl = ttl
+        self.channel = channel
+        self.key_prefix = key_prefix
+        self.retry_interval = retry_interval
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._entries: "OrderedDict[UUID, Tuple[float, CustomerResponse]]" = OrderedDict()
+        # Bumped on every invalidation so a fill that raced a write is discarded
+        self._versions: Dict[UUID, int] = {}
+        self._client: Optional[aioredis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+    def _get_client(self) -> Optional[aioredis.Redis]:
+        if not self.url or time.monotonic() < self._retry_at:
+            return None
+        if self._client is None:
+            self._client = aioredis.from_url(self.url)
+        return self._client
+
+    def _redis_failed(self, action: str, exc: Exception) -> None:
+        CUSTOMER_CACHE_REDIS_ERRORS.inc()
+        self._retry_at = time.monotonic() + self.retry_interval
+        logger.warning(
+            "Customer cache Redis unavailable",
+            extra={"action": action, "error": str(exc)},
+        )
+
+    def version(self, customer_id: UUID) -> int:
+        """Return the invalidation counter to pass to :meth:`set` after a read."""
+        return self._versions.get(customer_id, 0)
+
+    async def get(self, customer_id: UUID) -> Optional[CustomerResponse]:
+        """Return the cached profile of ``customer_id``, if any."""
+        entry = self._entries.get(customer_id)
+        if entry is not None:
+            expires_at, profile = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(customer_id)
+                CUSTOMER_CACHE_REQUESTS.labels(result="local_hit").inc()
+                return profile
+            del self._entries[customer_id]
+
+        client = self._get_client()
+        if client is not None:
+            version = self.version(customer_id)
+            try:
+                stored = await client.get(self.key_prefix + str(customer_id))
+            except Exception as exc:
+                self._redis_failed("get", exc)
+                stored = None
+            if stored is not None:
+                profile = CustomerResponse.model_validate_json(stored)
+                self._store_local(profile, version)
+                CUSTOMER_CACHE_REQUESTS.labels(result="redis_hit").inc()
+                return profile
+
+        CUSTOMER_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    async def set(self, profile: CustomerResponse, version: int) -> None:
+        """Cache ``profile`` unless it was invalidated since ``version`` was taken."""
+        if not self._store_local(profile, version):
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            await client.set(
+                self.key_prefix + str(profile.id),
+                profile.model_dump_json(),
+                ex=max(1, int(self.ttl)),
+            )
+        except Exception as exc:
+            self._redis_failed("set", exc)
+
+    def _store_local(self, profile: CustomerResponse, version: int) -> bool:
+        if self.max_size <= 0 or self.version(profile.id) != version:
+            return False
+        self._entries[profile.id] = (time.monotonic() + self.ttl, profile)
+        self._entries.move_to_end(profile.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def discard(self, customer_id: UUID) -> None:
+        """Drop the local copy of ``customer_id``."""
+        self._entries.pop(customer_id, None)
+        self._versions[customer_id] = self.version(customer_id) + 1
+        if len(self._versions) > self.max_size * 2:
+            # Only fills in flight need the counter; keep the map bounded
+            self._versions = {customer_id: self._versions[customer_id]}
+
+    async def invalidate(self, customer_id: UUID) -> None:
+        """Drop ``customer_id`` from every tier and from the other workers."""
+        self.discard(customer_id)
+        CUSTOMER_CACHE_INVALIDATIONS.labels(source="local").inc()
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            await client.delete(self.key_prefix + str(customer_id))
+            await client.publish(self.channel, str(customer_id))
+        except Exception as exc:
+            self._redis_failed("invalidate", exc)
+
+    async def start(self) -> None:
+        """Listen for invalidations published by other workers."""
+        if self.url and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            client = aioredis.from_url(self.url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Entries cached while unsubscribed may have missed invalidations
+                self._entries.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    try:
+                        customer_id = UUID(data.decode() if isinstance(data, bytes) else data)
+                    except ValueError:
+                        continue
+                    self.discard(customer_id)
+                    CUSTOMER_CACHE_INVALIDATIONS.labels(source="remote").inc()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                CUSTOMER_CACHE_REDIS_ERRORS.inc()
+                logger.warning(
+                    "Customer cache invalidation listener disconnected",
+                    extra={"error": str(exc)},
+                )
+            finally:
+                await pubsub.reset()
+                await client.close(close_connection_pool=True)
+            await asyncio.sleep(self.retry_interval)
+
+    async def close(self) -> None:
+        """Stop the listener and release the Redis pool."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.close(close_connection_pool=True)
+            self._client = None
+
+
+_cache: Optional[CustomerCache] = None
+
+
+def get_customer_cache() -> CustomerCache:
+    """Return the process-wide customer cache bound to the running loop."""
+    global _cache
+    loop = asyncio.get_running_loop()
+    if _cache is None or (_cache.loop is not None and _cache.loop is not loop):
+        _cache = CustomerCache(
+            settings.REDIS_URL if settings.CUSTOMER_CACHE_SHARED else None,
+            settings.CUSTOMER_CACHE_SIZE,
+            settings.CUSTOMER_CACHE_TTL,
+            settings.CUSTOMER_CACHE_CHANNEL,
+        )
+        _cache.loop = loop
+    return _cache
+
+
+async def start_customer_cache() -> None:
+    """Start listening for invalidations from other workers."""
+    await get_customer_cache().start()
+
+
+async def stop_customer_cache() -> None:
+    """Stop the invalidation listener and close the Redis pool during shutdown."""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
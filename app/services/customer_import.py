@@ -0,0 +1,352 @@
+"""Streaming customer import from CSV or NDJSON files.
+
+An import reads its file line by line in a thread and never holds more than
+a few chunks of rows in memory. CSV rows are split into fields as they are
+read; chunks of rows (or raw NDJSON lines) are parsed and validated with
+``CustomerCreate`` in a process pool while the previous chunk is written
+with :meth:`CustomerService.create_customers`. Invalid rows and conflicts are
+written to a CSV error report. Jobs and their progress are kept in memory by
+the process that runs them.
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import IO, Any, Deque, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.customer import CustomerCreate, CustomerImportJob, ImportStatus
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+# A record and the line it ends on: the fields of a CSV row (or the error that
+# stopped the reader on it) or the unparsed text of an NDJSON line
+RawRecord = Tuple[int, Union[str, List[str]]]
+ValidatedChunk = Tuple[List[Tuple[int, CustomerCreate]], List[Tuple[int, str]]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Return the import format implied by an upload's name or content type."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    return None
+
+
+def _error_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def validate_chunk(
+    records: List[RawRecord], business_id: Optional[str], header: Optional[List[str]] = None
+) -> ValidatedChunk:
+    """Parse and validate raw records; run in the validation process pool.
+
+    Records are CSV rows matched to ``header`` when it is given, NDJSON lines
+    otherwise.
+    """
+    valid: List[Tuple[int, CustomerCreate]] = []
+    errors: List[Tuple[int, str]] = []
+    for line, text in records:
+        record: Any
+        if header is not None:
+            if isinstance(text, str):
+                errors.append((line, text))
+                continue
+            record = dict(zip(header, text))
+        else:
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                errors.append((line, f"Invalid JSON: {exc}"))
+                continue
+            if not isinstance(record, dict):
+                errors.append((line, "Expected a JSON object"))
+                continue
+        # Empty CSV cells mean "not set"; unknown columns are ignored
+        data = {
+            key.strip(): value
+            for key, value in record.items()
+            if key is not None and value not in ("", None)
+        }
+        if business_id and "business_id" not in data:
+            data["business_id"] = business_id
+        try:
+            valid.append((line, CustomerCreate.model_validate(data)))
+        except ValidationError as exc:
+            errors.append((line, _error_message(exc)))
+    return valid, errors
+
+
+def _read_lines(handle: IO[bytes], job: CustomerImportJob) -> Iterator[str]:
+    first = True
+    for raw in handle:
+        job.bytes_processed += len(raw)
+        line = raw.decode("utf-8")
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+        yield line
+
+
+def _csv_rows(lines: Iterable[str]) -> Iterator[RawRecord]:
+    # One reader over the whole stream, so quoting follows the csv module's
+    # rules and a quoted field may span lines (up to csv.field_size_limit())
+    reader = csv.reader(lines)
+    while True:
+        try:
+            fields = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield reader.line_num, f"Invalid CSV: {exc}"
+            continue
+        if any(field.strip() for field in fields):
+            yield reader.line_num, fields
+
+
+def read_records(
+    handle: IO[bytes], fmt: str, job: CustomerImportJob
+) -> Tuple[Optional[List[str]], Iterator[RawRecord]]:
+    """Return the CSV header (``None`` for NDJSON) and the records of ``handle``.
+
+    CSV rows are split into fields here; matching them to the header and
+    validating them is left to :func:`validate_chunk`.
+    """
+    lines = _read_lines(handle, job)
+    if fmt != "csv":
+        return None, ((number, line) for number, line in enumerate(lines, start=1) if line.strip())
+    rows = _csv_rows(lines)
+    for _, first in rows:
+        if isinstance(first, str):
+            raise ValueError(first)
+        return first, rows
+    return [], rows
+
+
+def _chunks(records: Iterable[RawRecord], size: int) -> Iterator[List[RawRecord]]:
+    chunk: List[RawRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class CustomerImporter:
+    """Run one import job over a file on disk.
+
+    ``executor`` validates chunks; with ``None`` they are validated in the
+    default thread pool. At most ``max_pending`` chunks are parsed ahead of
+    the one being written.
+    """
+
+    def __init__(
+        self,
+        job: CustomerImportJob,
+        path: str,
+        report_path: str,
+        business_id: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+        max_pending: int = 4,
+    ) -> None:
+        self.job = job
+        self.path = path
+        self.report_path = report_path
+        self.business_id = business_id
+        self.executor = executor
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.max_pending = max_pending
+
+    async def run(self) -> CustomerImportJob:
+        """Import the file, updating the job as chunks are written."""
+        job = self.job
+        job.status = ImportStatus.RUNNING
+        job.bytes_total = os.path.getsize(self.path)
+        loop = asyncio.get_running_loop()
+        pending: Deque["asyncio.Future[ValidatedChunk]"] = deque()
+        try:
+            with open(self.path, "rb") as handle, open(
+                self.report_path, "w", newline="", encoding="utf-8"
+            ) as report_file:
+                report = csv.writer(report_file)
+                report.writerow(["line", "error"])
+                header, records = await asyncio.to_thread(
+                    read_records, handle, job.format, job
+                )
+                chunks = _chunks(records, self.chunk_size)
+                while True:
+                    # Reading stays off the event loop; parsing happens in the pool
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(
+                        loop.run_in_executor(
+                            self.executor, validate_chunk, chunk, self.business_id, header
+                        )
+                    )
+                    if len(pending) > self.max_pending:
+                        await self._write(await pending.popleft(), report)
+                while pending:
+                    await self._write(await pending.popleft(), report)
+        except asyncio.CancelledError:
+            self._fail(pending, "Import cancelled")
+            raise
+        except Exception as exc:
+            self._fail(pending, str(exc))
+        else:
+            job.status = ImportStatus.COMPLETED
+            job.finished_at = datetime.utcnow()
+            logger.info(
+                "Customer import completed",
+                extra={
+                    "job_id": job.id,
+                    "rows": job.rows_processed,
+                    "created_count": job.created,
+                    "conflict_count": job.conflicts,
+                    "invalid_count": job.invalid,
+                },
+            )
+        return job
+
+    def _fail(self, pending: Deque["asyncio.Future[ValidatedChunk]"], error: str) -> None:
+        # Queued chunks are dropped from the pool before they start
+        for future in pending:
+            future.cancel()
+        self.job.status = ImportStatus.FAILED
+        self.job.error = error
+        self.job.finished_at = datetime.utcnow()
+        logger.warning("Customer import failed", extra={"job_id": self.job.id, "error": error})
+
+    async def _write(self, validated: ValidatedChunk, report: Any) -> None:
+        from app.db import database
+        from app.services.customer_service import CustomerService
+
+        valid, errors = validated
+        rows = len(valid) + len(errors)
+        self.job.invalid += len(errors)
+        if valid:
+            async with database.SessionLocal() as session:
+                result = await CustomerService(session).create_customers(
+                    [customer for _, customer in valid]
+                )
+            for conflict in result.conflicts:
+                errors.append((valid[conflict.index][0], conflict.reason))
+            self.job.created += len(result.created)
+            self.job.conflicts += len(result.conflicts)
+        self.job.rows_processed += rows
+        for line, error in sorted(errors):
+            report.writerow([line, error])
+
+
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_jobs: "OrderedDict[str, Tuple[CustomerImportJob, str]]" = OrderedDict()
+_tasks: Set[asyncio.Task] = set()
+
+
+def get_import_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared validation pool, or ``None`` to validate in threads."""
+    global _pool
+    if settings.IMPORT_VALIDATION_WORKERS <= 0:
+        return None
+    if _pool is None:
+        # Spawned workers do not inherit the API's threads, sockets or loop
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMPORT_VALIDATION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def spool_upload(upload: Any, suffix: str = "") -> str:
+    """Copy an upload to a temporary file in fixed-size chunks and return its path."""
+    fd, path = tempfile.mkstemp(prefix="customer-import-", suffix=suffix)
+    with os.fdopen(fd, "wb") as handle:
+        while True:
+            data = await upload.read(_UPLOAD_CHUNK_BYTES)
+            if not data:
+                break
+            handle.write(data)
+    return path
+
+
+def _remember(job: CustomerImportJob, report_path: str) -> None:
+    _jobs[job.id] = (job, report_path)
+    for job_id, (old_job, old_report) in list(_jobs.items()):
+        if len(_jobs) <= settings.IMPORT_MAX_JOBS:
+            break
+        if old_job.status in (ImportStatus.COMPLETED, ImportStatus.FAILED):
+            del _jobs[job_id]
+            _remove(old_report)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def _run(importer: CustomerImporter) -> None:
+    try:
+        await importer.run()
+    finally:
+        _remove(importer.path)
+
+
+def start_import(path: str, fmt: str, business_id: Optional[str] = None) -> CustomerImportJob:
+    """Import the file at ``path`` in the background and return its job.
+
+    The file is deleted once the import finishes.
+    """
+    job = CustomerImportJob(id=str(uuid4()), format=fmt, started_at=datetime.utcnow())
+    fd, report_path = tempfile.mkstemp(prefix="customer-import-errors-", suffix=".csv")
+    os.close(fd)
+    _remember(job, report_path)
+    importer = CustomerImporter(job, path, report_path, business_id, get_import_pool())
+    task = asyncio.create_task(_run(importer))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get_import_job(job_id: str) -> Optional[Tuple[CustomerImportJob, str]]:
+    """Return an import job and the path of its error report."""
+    return _jobs.get(job_id)
+
+
+async def stop_imports() -> None:
+    """Cancel running imports and stop the validation pool during shutdown."""
+    global _pool
+    for task in list(_tasks):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,79 +1,82 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import or_, select
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
-from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
 import logging
-import asyncio
-import json
-import urllib.request
-
-try:  # httpx is optional in production
-    import httpx
-except Exception:  # pragma: no cover - optional dependency
-    httpx = None
 
 from app.core.config import settings
-
+from app.core.normalization import normalize_email, normalize_phone
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.singleflight import SingleFlight
+from app.core.tracing import current_trace_id
+from app.db.instrumentation import instrument_service
 from app.models.customer import Customer
-from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.schemas.customer import (
+    CustomerBulkConflict,
+    CustomerBulkCreated,
+    CustomerBulkResult,
+    CustomerCreate,
+    CustomerResponse,
+    CustomerUpdate,
+)
+from app.services.auth_sync import get_auth_sync_queue
+from app.services.customer_cache import get_customer_cache
+from app.services.outbox import add_event, add_events, notify_relay
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so ``value`` is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Dialect inserts supporting ON CONFLICT DO NOTHING ... RETURNING
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
+# Concurrent profile reads of one customer share a single query
+_profile_loads: SingleFlight[Optional[CustomerResponse]] = SingleFlight("customer_profile")
+
+
+@instrument_service
 class CustomerService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.logger = logging.getLogger(__name__)
 
-    async def _sync_auth_profile(self, user_id: UUID, data: dict) -> None:
-        """Propagate updates to the auth service."""
-        if not settings.AUTH_SERVICE_URL:
-            return
-
-        url = f"{settings.AUTH_SERVICE_URL}/api/users/{user_id}"
-
-        if httpx is not None:
-            try:
-                async with httpx.AsyncClient() as client:
-                    await client.patch(url, json=data, timeout=2)
-                return
-            except Exception as exc:  # pragma: no cover - network issues
-                self.logger.warning(
-                    "Failed to notify auth service",
-                    extra={"user_id": str(user_id), "error": str(exc)},
-                )
-        else:  # Fallback using urllib if httpx is unavailable
-            def send_patch() -> None:
-                request = urllib.request.Request(
-                    url,
-                    method="PATCH",
-                    data=json.dumps(data).encode(),
-                    headers={"Content-Type": "application/json"},
-                )
-                urllib.request.urlopen(request, timeout=2)
-
-            try:
-                await asyncio.to_thread(send_patch)
-            except Exception as exc:  # pragma: no cover - network issues
-                self.logger.warning(
-                    "Failed to notify auth service",
-                    extra={"user_id": str(user_id), "error": str(exc)},
-                )
-
     async def create_customer(
-        self, customer: CustomerCreate, trace_id: str
+        self, customer: CustomerCreate, trace_id: Optional[str] = None
     ) -> Customer:
         """
         Create a new customer in the database.
         """
+        trace_id = trace_id or current_trace_id()
         db_customer = Customer(
+            id=uuid4(),
             user_id=customer.user_id,
             business_id=customer.business_id,
             full_name=customer.full_name,
             email=customer.email,
             phone=customer.phone,
+            email_normalized=normalize_email(customer.email),
+            phone_e164=normalize_phone(customer.phone),
             gender=customer.gender.value if customer.gender else None,
             avatar_url=customer.avatar_url,
         )
         self.db.add(db_customer)
+        add_event(
+            self.db,
+            "v1.customer.created",
+            {
+                "id": str(db_customer.id),
+                "user_id": str(db_customer.user_id),
+                "business_id": str(db_customer.business_id),
+                "trace_id": trace_id,
+            },
+            trace_id,
+        )
         try:
             await self.db.commit()
         except IntegrityError as exc:
@@ -87,6 +90,7 @@ class CustomerService:
                 },
             )
             raise ValueError("Customer already exists") from exc
+        notify_relay()
         await self.db.refresh(db_customer)
 
         self.logger.info(
@@ -108,17 +112,161 @@ class CustomerService:
             trace_id,
         )
 
-        from app.services.event_publisher import publish_event
+        return db_customer
+
+    async def create_customers(
+        self, customers: List[CustomerCreate], trace_id: Optional[str] = None
+    ) -> CustomerBulkResult:
+        """Create many customers in a single transaction.
+
+        Rows are written with multi-row ``INSERT ... ON CONFLICT DO NOTHING
+        RETURNING`` statements, or staged with ``COPY`` for large batches on
+        PostgreSQL. Customers that already exist, or appear twice in the batch,
+        are reported as conflicts instead of failing the batch. One
+        ``v1.customer.created`` event per new customer is staged in the outbox
+        with a single insert.
+        """
+        trace_id = trace_id or current_trace_id()
+        result = CustomerBulkResult()
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        seen: Set[Tuple[UUID, UUID]] = set()
+        for index, customer in enumerate(customers):
+            key = (customer.user_id, customer.business_id)
+            if key in seen:
+                result.conflicts.append(
+                    CustomerBulkConflict(
+                        index=index,
+                        user_id=customer.user_id,
+                        business_id=customer.business_id,
+                        reason="Duplicate in batch",
+                    )
+                )
+                continue
+            seen.add(key)
+            rows.append(self._bulk_row(customer, now))
+            positions.append(index)
+
+        try:
+            inserted = await self._bulk_insert(rows)
+            for index, row in zip(positions, rows):
+                if row["id"] in inserted:
+                    result.created.append(CustomerBulkCreated(index=index, id=row["id"]))
+                else:
+                    result.conflicts.append(
+                        CustomerBulkConflict(
+                            index=index,
+                            user_id=row["user_id"],
+                            business_id=row["business_id"],
+                            reason="Customer already exists",
+                        )
+                    )
+            created_rows = [row for row in rows if row["id"] in inserted]
+            await add_events(
+                self.db,
+                (
+                    (
+                        "v1.customer.created",
+                        {
+                            "id": str(row["id"]),
+                            "user_id": str(row["user_id"]),
+                            "business_id": str(row["business_id"]),
+                            "trace_id": trace_id,
+                        },
+                    )
+                    for row in created_rows
+                ),
+                trace_id,
+            )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        result.conflicts.sort(key=lambda conflict: conflict.index)
+        if result.created:
+            notify_relay()
+
+        self.logger.info(
+            "Customers created in bulk",
+            extra={
+                "created_count": len(result.created),
+                "conflict_count": len(result.conflicts),
+                "trace_id": trace_id,
+            },
+        )
+        from app.services.log_service import send_log
 
-        payload = {
-            "id": str(db_customer.id),
-            "user_id": str(db_customer.user_id),
-            "business_id": str(db_customer.business_id),
-            "trace_id": trace_id,
+        await send_log(
+            "v1.customer.bulk_created",
+            {"created": len(result.created), "conflicts": len(result.conflicts)},
+            trace_id,
+        )
+        return result
+
+    @staticmethod
+    def _bulk_row(customer: CustomerCreate, now: datetime) -> Dict[str, Any]:
+        return {
+            "id": uuid4(),
+            "user_id": customer.user_id,
+            "business_id": customer.business_id,
+            "full_name": customer.full_name,
+            "email": customer.email,
+            "phone": customer.phone,
+            "email_normalized": normalize_email(customer.email),
+            "phone_e164": normalize_phone(customer.phone),
+            "gender": customer.gender.value if customer.gender else None,
+            "avatar_url": customer.avatar_url,
+            "total_orders": 0,
+            "total_appointments": 0,
+            "last_order_date": None,
+            "last_appointment_date": None,
+            "lifetime_value": Decimal("0.00"),
+            "created_at": now,
+            "updated_at": now,
         }
-        await publish_event("v1.customer.created", payload, trace_id)
 
-        return db_customer
+    async def _bulk_insert(self, rows: List[Dict[str, Any]]) -> Set[UUID]:
+        """Insert ``rows`` skipping existing customers; return the inserted ids."""
+        if not rows:
+            return set()
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql" and len(rows) >= settings.BULK_COPY_THRESHOLD:
+            return await self._bulk_copy(rows)
+        # Executed as "insertmanyvalues": one cached statement rendered as
+        # multi-row VALUES pages of BULK_INSERT_CHUNK_SIZE rows
+        stmt = (
+            _UPSERT_INSERTS[dialect](Customer)
+            .on_conflict_do_nothing(index_elements=["user_id", "business_id"])
+            .returning(Customer.id)
+            .execution_options(insertmanyvalues_page_size=settings.BULK_INSERT_CHUNK_SIZE)
+        )
+        result = await self.db.execute(stmt, rows)
+        return set(result.scalars().all())
+
+    async def _bulk_copy(self, rows: List[Dict[str, Any]]) -> Set[UUID]:
+        # COPY into a transaction-scoped staging table, then move the rows over
+        # with the same conflict handling as the multi-row insert
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        columns = list(rows[0])
+        column_list = ", ".join(columns)
+        await connection.exec_driver_sql(
+            "CREATE TEMP TABLE customers_bulk_staging "
+            "(LIKE customers INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        await raw.driver_connection.copy_records_to_table(
+            "customers_bulk_staging",
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        result = await connection.exec_driver_sql(
+            f"INSERT INTO customers ({column_list}) "
+            f"SELECT {column_list} FROM customers_bulk_staging "
+            "ON CONFLICT (user_id, business_id) DO NOTHING RETURNING id"
+        )
+        # asyncpg's UUID subclasses uuid.UUID and hashes the same way
+        return {row[0] for row in result}
 
     async def get_customer(self, customer_id: UUID) -> Optional[Customer]:
         """Get a customer by ID."""
@@ -127,6 +275,66 @@ class CustomerService:
         )
         return result.scalars().first()
 
+    async def get_customer_profile(self, customer_id: UUID) -> Optional[CustomerResponse]:
+        """Get a read-only customer profile, served from the cache when possible.
+
+        On a cache miss, concurrent reads of the same customer wait for one
+        query; a write in between starts a new one, so nobody gets a row read
+        before their own update. Rows read from a read replica are returned but
+        not cached, since the replica may not have caught up with a write that
+        just invalidated them.
+        """
+        cache = get_customer_cache()
+        profile = await cache.get(customer_id)
+        if profile is not None:
+            return profile
+        replica = bool(self.db.info.get("replica"))
+        version = cache.version(customer_id)
+        return await _profile_loads.do(
+            (customer_id, replica, version),
+            lambda: self._load_profile(customer_id, replica, version),
+        )
+
+    async def _load_profile(
+        self, customer_id: UUID, replica: bool, version: int
+    ) -> Optional[CustomerResponse]:
+        cache = get_customer_cache()
+        customer = await self.get_customer(customer_id)
+        if customer is None:
+            return None
+        profile = CustomerResponse.model_validate(customer)
+        if not replica:
+            await cache.set(profile, version)
+        return profile
+
+    async def lookup_customer(
+        self,
+        business_id: UUID,
+        phone: Optional[str] = None,
+        email: Optional[str] = None,
+    ) -> Optional[Customer]:
+        """Find a business's customer by exact phone or email.
+
+        Both are compared in normalized form, so ``0712 345 678`` finds a
+        customer saved as ``+40712345678``. The most recently created match
+        wins when several customers share the contact.
+        """
+        if phone is not None:
+            column, value = Customer.phone_e164, normalize_phone(phone)
+        elif email is not None:
+            column, value = Customer.email_normalized, normalize_email(email)
+        else:
+            return None
+        if value is None:
+            return None
+        result = await self.db.execute(
+            select(Customer)
+            .where(Customer.business_id == business_id, column == value)
+            .order_by(Customer.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
     async def get_customers(
         self,
         skip: int = 0,
@@ -135,30 +343,66 @@ class CustomerService:
         query: Optional[str] = None,
     ) -> List[Customer]:
         """Return customers filtered by business ID and optional query string."""
+        stmt = self._customers_query(business_id, query).offset(skip).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_customers_page(
+        self,
+        limit: int = 100,
+        business_id: Optional[UUID] = None,
+        query: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Return a page of customers and the cursor of the next page.
+
+        Pages are ordered by ``(created_at, id)`` and start after ``cursor``,
+        which keeps deep pages as cheap as the first one. The next cursor is
+        ``None`` on the last page. Raises ``ValueError`` for an invalid cursor.
+        """
+        stmt = self._customers_query(business_id, query)
+        if cursor:
+            created_at, customer_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Customer.created_at, Customer.id) > (created_at, customer_id))
+        result = await self.db.execute(stmt.limit(limit + 1))
+        customers = result.scalars().all()
+        if len(customers) <= limit:
+            return customers, None
+        customers = customers[:limit]
+        last = customers[-1]
+        return customers, encode_cursor(last.created_at, last.id)
+
+    def _customers_query(self, business_id: Optional[UUID], query: Optional[str]):
         stmt = select(Customer)
 
         if business_id:
             stmt = stmt.where(Customer.business_id == business_id)
 
         if query:
+            # On PostgreSQL each ILIKE is served by a pg_trgm GIN index and the
+            # OR becomes a bitmap union; SQLite evaluates the same filter by scan
+            pattern = f"%{_escape_like(query)}%"
             stmt = stmt.where(
                 or_(
-                    Customer.full_name.ilike(f"%{query}%"),
-                    Customer.email.ilike(f"%{query}%"),
-                    Customer.phone.ilike(f"%{query}%"),
+                    Customer.full_name.ilike(pattern, escape="\\"),
+                    Customer.email.ilike(pattern, escape="\\"),
+                    Customer.phone.ilike(pattern, escape="\\"),
                 )
             )
 
-        stmt = stmt.offset(skip).limit(limit)
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+        # A stable order keeps pages consistent and matches the keyset index
+        return stmt.order_by(Customer.created_at, Customer.id)
 
     async def update_customer(
-        self, customer_id: UUID, customer_data: CustomerUpdate, trace_id: str
+        self,
+        customer_id: UUID,
+        customer_data: CustomerUpdate,
+        trace_id: Optional[str] = None,
     ) -> Optional[Customer]:
         """
         Update a customer's information.
         """
+        trace_id = trace_id or current_trace_id()
         db_customer = await self.get_customer(customer_id)
         if not db_customer:
             return None
@@ -175,19 +419,28 @@ class CustomerService:
             if getattr(db_customer, key) != value:
                 setattr(db_customer, key, value)
                 fields_changed.append(key)
-
-        await self.db.commit()
-        await self.db.refresh(db_customer)
+        if "email" in fields_changed:
+            db_customer.email_normalized = normalize_email(db_customer.email)
+        if "phone" in fields_changed:
+            db_customer.phone_e164 = normalize_phone(db_customer.phone)
 
         if fields_changed:
-            from app.services.event_publisher import publish_event
+            add_event(
+                self.db,
+                "v1.customer.updated",
+                {
+                    "id": str(db_customer.id),
+                    "fields_changed": fields_changed,
+                    "trace_id": trace_id,
+                },
+                trace_id,
+            )
 
-            payload = {
-                "id": str(db_customer.id),
-                "fields_changed": fields_changed,
-                "trace_id": trace_id,
-            }
-            await publish_event("v1.customer.updated", payload, trace_id)
+        await self.db.commit()
+        if fields_changed:
+            await get_customer_cache().invalidate(db_customer.id)
+            notify_relay()
+        await self.db.refresh(db_customer)
 
         if fields_changed:
             self.logger.info(
@@ -212,7 +465,7 @@ class CustomerService:
                 if field in fields_changed
             }
             if auth_fields:
-                await self._sync_auth_profile(db_customer.user_id, auth_fields)
+                get_auth_sync_queue().enqueue(db_customer.user_id, auth_fields)
 
         return db_customer
 
@@ -226,6 +479,7 @@ class CustomerService:
 
         await self.db.delete(db_customer)
         await self.db.commit()
+        await get_customer_cache().invalidate(customer_id)
         return True
 
     async def update_avatar(self, customer_id: UUID, avatar_url: str) -> Optional[Customer]:
@@ -236,5 +490,6 @@ class CustomerService:
 
         db_customer.avatar_url = avatar_url
         await self.db.commit()
+        await get_customer_cache().invalidate(customer_id)
         await self.db.refresh(db_customer)
         return db_customer
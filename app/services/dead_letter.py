@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.event_loops import run_on_loop
+from app.core.metrics import (
+    DEAD_LETTER_DROPPED,
+    DEAD_LETTER_REDIS_ERRORS,
+    DEAD_LETTER_SPILLED,
+    DEAD_LETTER_STORED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DeadLetterStore:
+    """Non-blocking Redis store for events that could not be published.
+
+    Entries are written with a single batched ``RPUSH`` over a pooled
+    ``redis.asyncio`` client. While Redis is unreachable they are kept in a
+    bounded in-memory spill buffer (oldest entries are dropped first) and
+    written on the next successful flush, at most every ``retry_interval``
+    seconds so an outage does not turn into a reconnect per event.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        key: str = "failed_events",
+        spill_size: int = 1000,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.url = url
+        self.key = key
+        self.retry_interval = retry_interval
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[aioredis.Redis] = None
+        self._buffer: Deque[str] = deque(maxlen=max(1, spill_size))
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    def _get_client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._client = aioredis.from_url(self.url)
+            self.loop = asyncio.get_running_loop()
+        return self._client
+
+    async def store(self, event_name: str, payload: dict, trace_id: Optional[str]) -> None:
+        """Queue a failed event and try to write the buffer to Redis."""
+        if not self.url:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            DEAD_LETTER_DROPPED.inc()
+        self._buffer.append(
+            json.dumps({"event": event_name, "payload": payload, "trace_id": trace_id})
+        )
+        DEAD_LETTER_SPILLED.set(len(self._buffer))
+        await self.flush()
+
+    async def store_now(self, event_name: str, payload: dict, trace_id: Optional[str]) -> bool:
+        """Write a failed event straight to Redis, bypassing the spill buffer.
+
+        Returns ``True`` only once Redis has accepted the entry, so callers
+        holding a durable copy (the outbox) can keep it until then.
+        """
+        if not self.url:
+            return False
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._retry_at:
+            return False
+        entry = json.dumps({"event": event_name, "payload": payload, "trace_id": trace_id})
+        try:
+            await self._get_client().rpush(self.key, entry)
+        except Exception as exc:
+            DEAD_LETTER_REDIS_ERRORS.inc()
+            self._retry_at = loop.time() + self.retry_interval
+            logger.warning("Dead-letter store unavailable", extra={"error": str(exc)})
+            return False
+        DEAD_LETTER_STORED.inc()
+        return True
+
+    async def flush(self, force: bool = False) -> int:
+        """Write buffered entries to Redis and return how many were written."""
+        if not self._buffer:
+            return 0
+        loop = asyncio.get_running_loop()
+        if not force and loop.time() < self._retry_at:
+            return 0
+        async with self._lock:
+            entries: List[str] = list(self._buffer)
+            self._buffer.clear()
+            if not entries:
+                return 0
+            try:
+                await self._get_client().rpush(self.key, *entries)
+            except Exception as exc:
+                DEAD_LETTER_REDIS_ERRORS.inc()
+                self._retry_at = loop.time() + self.retry_interval
+                self._requeue(entries)
+                logger.warning(
+                    "Dead-letter store unavailable, keeping events in memory",
+                    extra={"buffered": len(self._buffer), "error": str(exc)},
+                )
+                return 0
+            DEAD_LETTER_STORED.inc(len(entries))
+            DEAD_LETTER_SPILLED.set(len(self._buffer))
+            return len(entries)
+
+    def _requeue(self, entries: List[str]) -> None:
+        # Entries added during the failed write are newer and take precedence
+        space = self._buffer.maxlen - len(self._buffer)
+        if len(entries) > space:
+            DEAD_LETTER_DROPPED.inc(len(entries) - space)
+            entries = entries[len(entries) - space:]
+        self._buffer.extendleft(reversed(entries))
+        DEAD_LETTER_SPILLED.set(len(self._buffer))
+
+    async def close(self) -> None:
+        """Make a last attempt to flush the buffer and release the pool."""
+        await self.flush(force=True)
+        if self._client is not None:
+            await self._client.close(close_connection_pool=True)
+            self._client = None
+
+
+# One store per event loop, like the publishers in app.services.event_publisher
+_stores: Dict[asyncio.AbstractEventLoop, DeadLetterStore] = {}
+
+
+def get_dead_letter_store() -> DeadLetterStore:
+    """Return the dead-letter store bound to the running loop."""
+    loop = asyncio.get_running_loop()
+    store = _stores.get(loop)
+    if store is None:
+        for stale in [other for other in list(_stores) if other.is_closed()]:
+            _stores.pop(stale, None)
+        store = _stores[loop] = DeadLetterStore(
+            settings.REDIS_URL,
+            settings.DEAD_LETTER_KEY,
+            settings.DEAD_LETTER_SPILL_SIZE,
+            settings.DEAD_LETTER_RETRY_INTERVAL,
+        )
+    return store
+
+
+async def close_dead_letter_store() -> None:
+    """Flush and close every dead-letter store on its own loop during shutdown."""
+    stores = list(_stores.items())
+    _stores.clear()
+    for loop, store in stores:
+        await run_on_loop(loop, store.close())
@@ -1,64 +1,394 @@
 import asyncio
 import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import aio_pika
-import redis
 
+from app.core.circuit_breaker import CircuitOpenError, get_breaker
 from app.core.config import settings
+from app.core.event_loops import run_on_loop
+from app.core.metrics import (
+    RABBITMQ_BATCH_SIZE,
+    RABBITMQ_CHANNELS_IN_USE,
+    RABBITMQ_CHANNELS_OPEN,
+    RABBITMQ_RECONNECTS,
+)
+from app.core.tracing import current_trace_id
+from app.services.dead_letter import get_dead_letter_store
 
+logger = logging.getLogger(__name__)
 
-async def publish_event(event_name: str, payload: dict, trace_id: str) -> None:
-    """Publish an event to RabbitMQ using aio_pika."""
+T = TypeVar("T")
+
+PendingMessage = Tuple[str, bytes, str, asyncio.Future]
+
+
+class RabbitMQPublisher:
+    """Long-lived RabbitMQ connection with a bounded pool of channels.
+
+    Every pooled channel keeps the handle of the declared exchange, so the
+    exchange is declared once per channel instead of once per event.
+
+    Messages submitted through :meth:`publish` are grouped for up to
+    ``batch_window`` seconds or ``batch_size`` messages and published
+    pipelined on a single confirm-mode channel; each caller is resolved when
+    the broker confirms its own message.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        exchange_name: str,
+        pool_size: int,
+        batch_size: int = 100,
+        batch_window: float = 0.005,
+    ) -> None:
+        self.url = url
+        self.exchange_name = exchange_name
+        self.pool_size = max(1, pool_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_window = max(0.0, batch_window)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection = None
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._open = 0
+        self._lock = asyncio.Lock()
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._collecting: List[PendingMessage] = []
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def connect(self) -> None:
+        """Open the connection if it is not already established."""
+        if self._connection is not None and not self._connection.is_closed:
+            return
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed:
+                return
+            self._discard_idle_channels()
+            self._connection = await aio_pika.connect_robust(self.url)
+            self.loop = asyncio.get_running_loop()
+            callbacks = getattr(self._connection, "reconnect_callbacks", None)
+            if callbacks is not None:
+                callbacks.add(self._on_reconnect)
+
+    def _on_reconnect(self, *_: object) -> None:
+        RABBITMQ_RECONNECTS.inc()
+        logger.warning("RabbitMQ connection re-established")
+
+    def _discard_idle_channels(self) -> None:
+        while not self._idle.empty():
+            self._idle.get_nowait()
+            self._channel_closed()
+
+    def _channel_closed(self) -> None:
+        self._open -= 1
+        RABBITMQ_CHANNELS_OPEN.dec()
+
+    async def _open_channel(self) -> Tuple[object, object]:
+        channel = await self._connection.channel(publisher_confirms=True)
+        exchange = await channel.declare_exchange(
+            self.exchange_name,
+            aio_pika.ExchangeType.TOPIC,
+            durable=True,
+        )
+        return channel, exchange
+
+    async def _checkout(self) -> Tuple[object, object]:
+        while True:
+            if self._idle.empty() and self._open < self.pool_size:
+                self._open += 1
+                RABBITMQ_CHANNELS_OPEN.inc()
+                try:
+                    return await self._open_channel()
+                except Exception:
+                    self._channel_closed()
+                    raise
+            channel, exchange = await self._idle.get()
+            if getattr(channel, "is_closed", False):
+                self._channel_closed()
+                continue
+            return channel, exchange
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aio_pika.abc.AbstractExchange]:
+        """Check out a pooled channel and yield its exchange.
+
+        Channels that raise while in use are closed instead of being returned
+        to the pool, so the next caller opens a fresh one.
+        """
+        await self.connect()
+        channel, exchange = await self._checkout()
+        RABBITMQ_CHANNELS_IN_USE.inc()
+        try:
+            yield exchange
+        except Exception:
+            self._channel_closed()
+            try:
+                await channel.close()
+            except Exception:  # pragma: no cover - channel already broken
+                pass
+            raise
+        else:
+            self._idle.put_nowait((channel, exchange))
+        finally:
+            RABBITMQ_CHANNELS_IN_USE.dec()
+
+    def publish(
+        self, event_name: str, body: bytes, trace_id: Optional[str]
+    ) -> asyncio.Future:
+        """Queue a message for the next batch.
+
+        The returned future resolves once the broker confirms the message, or
+        fails with the error raised while publishing it.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait((event_name, body, trace_id, future))
+        if self._collector is None or self._collector.done():
+            self._collector = asyncio.create_task(self._collect())
+        return future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._collecting = [await self._pending.get()]
+            deadline = loop.time() + self.batch_window
+            while len(self._collecting) < self.batch_size:
+                if not self._pending.empty():
+                    self._collecting.append(self._pending.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._collecting.append(
+                        await asyncio.wait_for(self._pending.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            batch, self._collecting = self._collecting, []
+            task = asyncio.create_task(self._publish_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _publish_batch(self, batch: List[PendingMessage]) -> None:
+        RABBITMQ_BATCH_SIZE.observe(len(batch))
+        breaker = get_breaker("rabbitmq")
+        try:
+            breaker.before_call()
+            async with self.acquire() as exchange:
+                results = await asyncio.gather(
+                    *(
+                        exchange.publish(
+                            aio_pika.Message(
+                                body=body,
+                                content_type="application/json",
+                                correlation_id=trace_id,
+                                headers={"trace_id": trace_id},
+                            ),
+                            routing_key=event_name,
+                        )
+                        for event_name, body, trace_id, _ in batch
+                    ),
+                    return_exceptions=True,
+                )
+        except CircuitOpenError as exc:
+            results = [exc] * len(batch)
+        except Exception as exc:
+            breaker.record_failure()
+            results = [exc] * len(batch)
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            if any(isinstance(result, BaseException) for result in results):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
+
+    async def flush(self) -> None:
+        """Publish everything queued so far and wait for the confirms."""
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        remaining, self._collecting = self._collecting, []
+        while not self._pending.empty():
+            remaining.append(self._pending.get_nowait())
+        if remaining:
+            await self._publish_batch(remaining)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush queued messages, then close channels and the connection."""
+        await self.flush()
+        self._discard_idle_channels()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+# One publisher per event loop: the API's and the background loop used by
+# publish_event_sync each keep their own connection
+_publishers: Dict[asyncio.AbstractEventLoop, RabbitMQPublisher] = {}
+
+
+def get_publisher() -> RabbitMQPublisher:
+    """Return the publisher bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    publisher = _publishers.get(loop)
+    if publisher is None:
+        # Sync callers add entries from the background thread; iterate over a copy
+        for stale in [other for other in list(_publishers) if other.is_closed()]:
+            _publishers.pop(stale, None)
+        publisher = _publishers[loop] = RabbitMQPublisher(
+            settings.RABBITMQ_URL,
+            settings.RABBITMQ_EXCHANGE,
+            settings.RABBITMQ_CHANNEL_POOL_SIZE,
+            settings.RABBITMQ_BATCH_MAX_SIZE,
+            settings.RABBITMQ_BATCH_WINDOW_MS / 1000,
+        )
+    return publisher
+
+
+async def start_publisher() -> None:
+    """Open the shared RabbitMQ connection during application startup."""
+    try:
+        await get_publisher().connect()
+    except Exception as exc:
+        # The broker may come up later; publishing connects lazily.
+        logger.warning("RabbitMQ unavailable at startup", extra={"error": str(exc)})
+
+
+async def close_publisher() -> None:
+    """Close every publisher's RabbitMQ connection during application shutdown.
+
+    Each publisher is flushed and closed on the loop it belongs to.
+    """
+    publishers = list(_publishers.items())
+    _publishers.clear()
+    for loop, publisher in publishers:
+        await run_on_loop(loop, publisher.close())
+
+
+async def publish_event(
+    event_name: str, payload: dict, trace_id: Optional[str] = None
+) -> None:
+    """Publish an event to RabbitMQ and wait for the broker confirm.
+
+    Concurrent calls are batched by the shared :class:`RabbitMQPublisher`.
+    ``trace_id`` defaults to the current request's and is sent in the
+    message headers.
+    """
+    trace_id = trace_id or current_trace_id()
     message_body = json.dumps(payload).encode()
     attempts = 0
     while attempts < 2:
-        connection = None
         try:
-            connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
-            channel = await connection.channel()
-            exchange = await channel.declare_exchange(
-                settings.RABBITMQ_EXCHANGE,
-                aio_pika.ExchangeType.TOPIC,
-                durable=True,
-            )
-            message = aio_pika.Message(
-                body=message_body,
-                content_type="application/json",
-                headers={"trace_id": trace_id},
-            )
-            await exchange.publish(message, routing_key=event_name)
+            await get_publisher().publish(event_name, message_body, trace_id)
             break
+        except CircuitOpenError:
+            raise
         except Exception:
             attempts += 1
             if attempts >= 2:
                 raise
             await asyncio.sleep(1)
-        finally:
-            if connection:
-                await connection.close()
 
 
-def _store_failed_event(event_name: str, payload: dict, trace_id: str) -> None:
-    """Store failed event payload in Redis for later processing."""
-    if not settings.REDIS_URL:
-        return
-    try:
-        client = redis.from_url(settings.REDIS_URL)
-        data = json.dumps({
-            "event": event_name,
-            "payload": payload,
-            "trace_id": trace_id,
-        })
-        client.rpush("failed_events", data)
-    except Exception:
-        # Storing failures should not crash the app
-        pass
-
-
-def publish_event_sync(event_name: str, payload: dict, trace_id: str) -> None:
-    """Synchronous wrapper for :func:`publish_event` with Redis backup."""
+async def publish_events(
+    events: Iterable[Tuple[str, dict, str]]
+) -> List[Optional[BaseException]]:
+    """Publish several ``(event_name, payload, trace_id)`` events concurrently.
+
+    Returns one entry per event: ``None`` when it was confirmed, otherwise the
+    exception that prevented publishing it.
+    """
+    results = await asyncio.gather(
+        *(publish_event(name, payload, trace_id) for name, payload, trace_id in events),
+        return_exceptions=True,
+    )
+    return [result if isinstance(result, BaseException) else None for result in results]
+
+
+async def publish_event_or_dead_letter(
+    event_name: str, payload: dict, trace_id: Optional[str] = None
+) -> bool:
+    """Publish an event, storing it in the dead-letter store on failure.
+
+    Returns ``True`` when the event was published.
+    """
+    trace_id = trace_id or current_trace_id()
     try:
-        asyncio.run(publish_event(event_name, payload, trace_id))
-    except Exception:
-        _store_failed_event(event_name, payload, trace_id)
+        await publish_event(event_name, payload, trace_id)
+        return True
+    except Exception as exc:
+        logger.warning(
+            "Event publish failed, dead-lettering",
+            extra={"event": event_name, "trace_id": trace_id, "error": str(exc)},
+        )
+        await get_dead_letter_store().store(event_name, payload, trace_id)
+        return False
+
+
+class _BackgroundLoop:
+    """Event loop running in a daemon thread for synchronous callers.
+
+    Keeping one loop alive lets sync callers reuse the pooled connection and
+    the dead-letter client instead of starting a new loop per event.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
 
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="event-publisher", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+
+_background = _BackgroundLoop()
+
+
+def publish_event_sync(
+    event_name: str, payload: dict, trace_id: Optional[str] = None
+) -> None:
+    """Synchronous wrapper for :func:`publish_event` with Redis backup."""
+    # The background loop does not see this thread's context; resolve it here
+    trace_id = trace_id or current_trace_id()
+    _background.run(publish_event_or_dead_letter(event_name, payload, trace_id))
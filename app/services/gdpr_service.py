@@ -3,12 +3,15 @@ from sqlalchemy import select, delete
 from typing import Dict, Optional
 from uuid import UUID
 
+from app.db.instrumentation import instrument_service
 from app.models.customer import Customer
 from app.models.customer_tag import CustomerTag
 from app.models.customer_note import CustomerNote
 from app.models.customer_history import CustomerHistory
+from app.services.customer_cache import get_customer_cache
 
 
+@instrument_service
 class GDPRService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -134,5 +137,6 @@ class GDPRService:
         # Delete customer
         await self.db.delete(customer)
         await self.db.commit()
+        await get_customer_cache().invalidate(customer.id)
         
         return True
@@ -1,47 +1,259 @@
 import asyncio
+import contextvars
 import json
+import logging
 import urllib.request
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 try:  # httpx may not be available in production
     import httpx
 except Exception:  # pragma: no cover - optional dependency
     httpx = None
 
+from app.core.circuit_breaker import OPEN, get_breaker
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.metrics import LOG_SHIPPER_DROPPED, LOG_SHIPPER_QUEUED, LOG_SHIPPER_SHIPPED
+from app.core.tracing import current_trace_id
 
+logger = logging.getLogger(__name__)
 
-async def send_log(event: str, data: Dict[str, Any], trace_id: str) -> None:
-    """Send a log entry to the external log service."""
-    if not settings.LOG_SERVICE_URL:
-        return
 
-    payload = {"event": event, "data": data, "trace_id": trace_id}
-    if httpx is not None:
-        try:
-            async with httpx.AsyncClient() as client:
-                await client.post(settings.LOG_SERVICE_URL, json=payload, timeout=2)
+def _post_sync(url: str, body: Any) -> None:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    urllib.request.urlopen(req, timeout=settings.HTTP_TIMEOUT)
+
+
+async def _post(url: str, body: Any) -> None:
+    """POST a JSON body, raising if the log service cannot be reached."""
+    async with get_breaker("log_service").guard():
+        if httpx is not None:
+            client = get_http_client(url)
+            response = await client.post(url, json=body)
+            response.raise_for_status()
             return
-        except Exception:  # pragma: no cover - network issues
-            pass
-    else:
-        def post_log() -> None:
-            req = urllib.request.Request(
-                settings.LOG_SERVICE_URL,
-                data=json.dumps(payload).encode(),
-                headers={"Content-Type": "application/json"},
-            )
-            urllib.request.urlopen(req, timeout=2)
+        await asyncio.to_thread(_post_sync, url, body)
+
+
+class LogShipper:
+    """Bounded in-process buffer that ships log entries in batches.
+
+    Entries are sent by a background task once ``batch_size`` entries are
+    queued or every ``flush_interval`` seconds. With ``batch_url`` set a batch
+    is a single POST of a JSON array; otherwise the entries of a batch are
+    posted concurrently to ``url`` over the shared keep-alive client. When the
+    buffer is full, ``overflow`` decides whether the oldest or the newest
+    entry is dropped. :meth:`stop` gives up after ``shutdown_timeout`` seconds
+    and counts what is still buffered as dropped.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_url: Optional[str] = None,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        overflow: str = "drop_oldest",
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        shutdown_timeout: float = 5.0,
+    ) -> None:
+        self.url = url
+        self.batch_url = batch_url
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def enqueue(self, entry: Dict[str, Any]) -> None:
+        """Add an entry to the buffer without waiting for the log service."""
+        if len(self._queue) >= self.max_queue:
+            LOG_SHIPPER_DROPPED.inc()
+            if self.overflow == "drop_newest":
+                return
+            self._queue.popleft()
+        self._queue.append(entry)
+        LOG_SHIPPER_QUEUED.set(len(self._queue))
+        if len(self._queue) >= self.batch_size:
+            self._ready.set()
+        self.start()
+
+    def start(self) -> None:
+        """Start the background shipping task if it is not running."""
+        if self._stopping:
+            return
+        if self._task is None or self._task.done():
+            self.loop = asyncio.get_running_loop()
+            # Batches mix entries of many requests; don't inherit the caller's trace id
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+            while self._queue:
+                batch = self._take_batch()
+                try:
+                    await self._ship(batch)
+                except asyncio.CancelledError:
+                    # Keep the batch for the final flush instead of losing it
+                    self._queue.extendleft(reversed(batch))
+                    LOG_SHIPPER_QUEUED.set(len(self._queue))
+                    raise
+            if self._stopping:
+                return
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        LOG_SHIPPER_QUEUED.set(len(self._queue))
+        return batch
+
+    async def _send(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send a batch and return the entries that could not be delivered."""
+        if self.batch_url:
+            try:
+                await _post(self.batch_url, batch)
+                return []
+            except Exception:
+                return batch
+        results = await asyncio.gather(
+            *(_post(self.url, entry) for entry in batch), return_exceptions=True
+        )
+        return [entry for entry, result in zip(batch, results) if isinstance(result, Exception)]
+
+    async def _ship(self, batch: List[Dict[str, Any]]) -> None:
+        for attempt in range(self.max_retries + 1):
+            sent = len(batch)
+            batch = await self._send(batch)
+            LOG_SHIPPER_SHIPPED.inc(sent - len(batch))
+            # Retries would only be rejected until the breaker lets a trial through
+            if not batch or get_breaker("log_service").state == OPEN:
+                break
+            # While stopping, retries go out at once; the shutdown deadline bounds them
+            if attempt < self.max_retries and not self._stopping:
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        if batch:
+            self._drop(batch)
+
+    def _drop(self, entries: List[Dict[str, Any]]) -> None:
+        LOG_SHIPPER_DROPPED.inc(len(entries))
+        logger.warning("Dropping undeliverable log entries", extra={"count": len(entries)})
 
+    async def flush(self) -> None:
+        """Ship every buffered entry now."""
+        while self._queue:
+            batch = self._take_batch()
+            try:
+                await self._ship(batch)
+            except asyncio.CancelledError:
+                self._queue.extendleft(reversed(batch))
+                LOG_SHIPPER_QUEUED.set(len(self._queue))
+                raise
+
+    async def _drain(self) -> None:
+        if self._task is not None:
+            self._ready.set()
+            # asyncio.wait leaves the task running if the deadline cancels us
+            await asyncio.wait([self._task])
+        await self.flush()
+
+    async def stop(self) -> None:
+        """Let the background task finish its batch, then flush the buffer.
+
+        Waits at most ``shutdown_timeout`` seconds; entries that could not be
+        shipped by then are counted as dropped.
+        """
+        self._stopping = True
         try:
-            await asyncio.to_thread(post_log)
-        except Exception:  # pragma: no cover - network issues
-            pass
+            await asyncio.wait_for(self._drain(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Log shipper did not drain before the shutdown deadline")
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+                self._task = None
+            if self._queue:
+                self._drop(list(self._queue))
+                self._queue.clear()
+                LOG_SHIPPER_QUEUED.set(0)
+            self._stopping = False
+
+
+_shipper: Optional[LogShipper] = None
+
+
+def get_log_shipper() -> LogShipper:
+    """Return the process-wide log shipper bound to the running loop."""
+    global _shipper
+    loop = asyncio.get_running_loop()
+    if _shipper is None or (_shipper.loop is not None and _shipper.loop is not loop):
+        _shipper = LogShipper(
+            settings.LOG_SERVICE_URL,
+            batch_url=settings.LOG_SERVICE_BATCH_URL,
+            max_queue=settings.LOG_BUFFER_SIZE,
+            batch_size=settings.LOG_BATCH_SIZE,
+            flush_interval=settings.LOG_FLUSH_INTERVAL,
+            overflow=settings.LOG_BUFFER_OVERFLOW,
+            max_retries=settings.LOG_MAX_RETRIES,
+            retry_backoff=settings.LOG_RETRY_BACKOFF,
+            shutdown_timeout=settings.LOG_SHUTDOWN_TIMEOUT,
+        )
+    return _shipper
+
+
+async def stop_log_shipper() -> None:
+    """Flush buffered log entries during application shutdown."""
+    global _shipper
+    if _shipper is not None:
+        await _shipper.stop()
+        _shipper = None
 
 
-def send_log_sync(event: str, data: Dict[str, Any], trace_id: str) -> None:
-    """Synchronous wrapper for :func:`send_log`."""
+async def send_log(
+    event: str, data: Dict[str, Any], trace_id: Optional[str] = None
+) -> None:
+    """Queue a log entry for the external log service.
+
+    The entry is shipped by a background task, so the caller never waits for
+    the log service. ``trace_id`` defaults to the current request's.
+    """
+    if not settings.LOG_SERVICE_URL:
+        return
+
+    get_log_shipper().enqueue(
+        {"event": event, "data": data, "trace_id": trace_id or current_trace_id()}
+    )
+
+
+def send_log_sync(
+    event: str, data: Dict[str, Any], trace_id: Optional[str] = None
+) -> None:
+    """Synchronous variant of :func:`send_log` that delivers immediately."""
+    if not settings.LOG_SERVICE_URL:
+        return
+    payload = {"event": event, "data": data, "trace_id": trace_id or current_trace_id()}
     try:
-        asyncio.run(send_log(event, data, trace_id))
+        _post_sync(settings.LOG_SERVICE_URL, payload)
     except Exception:
         pass
@@ -1,30 +1,49 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 import logging
 
+from app.core.tracing import current_trace_id
+from app.db.instrumentation import instrument_service
 from app.models.customer_note import CustomerNote
 from app.schemas.note import NoteCreate, NoteCreatePayload
 from app.services.log_service import send_log
+from app.services.outbox import add_event, notify_relay
 
 
+@instrument_service
 class NoteService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.logger = logging.getLogger(__name__)
 
-    async def create_note(self, note: NoteCreate, trace_id: str) -> CustomerNote:
+    async def create_note(
+        self, note: NoteCreate, trace_id: Optional[str] = None
+    ) -> CustomerNote:
         """
         Create a new note for a customer.
         """
+        trace_id = trace_id or current_trace_id()
         db_note = CustomerNote(
+            id=uuid4(),
             customer_id=note.customer_id,
             content=note.content,
             created_by=note.created_by,
         )
         self.db.add(db_note)
+        add_event(
+            self.db,
+            "v1.customer.note_added",
+            {
+                "customer_id": str(db_note.customer_id),
+                "note_id": str(db_note.id),
+                "trace_id": trace_id,
+            },
+            trace_id,
+        )
         await self.db.commit()
+        notify_relay()
         await self.db.refresh(db_note)
 
         self.logger.info(
@@ -41,19 +60,13 @@ class NoteService:
             trace_id,
         )
 
-        from app.services.event_publisher import publish_event
-
-        payload = {
-            "customer_id": str(db_note.customer_id),
-            "note_id": str(db_note.id),
-            "trace_id": trace_id,
-        }
-        await publish_event("v1.customer.note_added", payload, trace_id)
-
         return db_note
 
     async def create_customer_note(
-        self, customer_id: UUID, payload: NoteCreatePayload, trace_id: str
+        self,
+        customer_id: UUID,
+        payload: NoteCreatePayload,
+        trace_id: Optional[str] = None,
     ) -> CustomerNote:
         """Create a note when the customer_id is provided separately."""
         data = NoteCreate(
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from uuid import uuid4
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logging import default_dumps
+from app.core.tracing import current_trace_id
+from app.models.event_outbox import EventOutbox
+from app.services.dead_letter import get_dead_letter_store
+
+logger = logging.getLogger(__name__)
+
+
+def add_event(
+    db: AsyncSession, event_name: str, payload: dict, trace_id: Optional[str] = None
+) -> EventOutbox:
+    """Stage a domain event in the outbox.
+
+    The row is only added to the session, so it is committed (or rolled back)
+    together with the domain change that produced it. ``trace_id`` defaults to
+    the trace id of the current request.
+    """
+    entry = EventOutbox(
+        event_name=event_name,
+        payload=payload,
+        trace_id=trace_id or current_trace_id(),
+    )
+    db.add(entry)
+    return entry
+
+
+async def add_events(
+    db: AsyncSession,
+    events: Iterable[Tuple[str, dict]],
+    trace_id: Optional[str] = None,
+) -> int:
+    """Stage many ``(event_name, payload)`` events with one batched insert.
+
+    Like :func:`add_event`, the rows are written in the session's transaction
+    and only become visible to the relay when it commits. On PostgreSQL,
+    batches of at least ``BULK_COPY_THRESHOLD`` events are written with
+    ``COPY``. Returns how many events were staged.
+    """
+    trace_id = trace_id or current_trace_id()
+    rows = [
+        {"event_name": event_name, "payload": payload, "trace_id": trace_id}
+        for event_name, payload in events
+    ]
+    if not rows:
+        return 0
+    if db.bind.dialect.name == "postgresql" and len(rows) >= settings.BULK_COPY_THRESHOLD:
+        await _copy_events(db, rows)
+    else:
+        await db.execute(insert(EventOutbox), rows)
+    return len(rows)
+
+
+async def _copy_events(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    # COPY skips the Python-side column defaults, so they are filled in here;
+    # the payloads are encoded with orjson when it is installed
+    now = datetime.utcnow()
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        EventOutbox.__tablename__,
+        records=[
+            (uuid4(), row["event_name"], default_dumps(row["payload"]), row["trace_id"], 0, now, now)
+            for row in rows
+        ],
+        columns=[
+            "id", "event_name", "payload", "trace_id", "attempts", "next_attempt_at", "created_at"
+        ],
+    )
+
+
+class OutboxRelay:
+    """Drain the ``event_outbox`` table and publish its events to RabbitMQ.
+
+    Batches are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so several
+    relays (API workers or ``scripts/run_outbox_relay.py``) can run side by
+    side without publishing the same row twice.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        if session_factory is None:
+            from app.db import database
+
+            session_factory = database.SessionLocal
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.base_delay = settings.OUTBOX_RETRY_BASE_DELAY
+        self.max_delay = settings.OUTBOX_RETRY_MAX_DELAY
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = self.base_delay * 2 ** max(0, attempts - 1)
+        return timedelta(seconds=min(delay, self.max_delay))
+
+    async def relay_once(self) -> int:
+        """Publish one batch of due events and return how many were sent.
+
+        A failed event is retried after an exponential backoff. Rejections by
+        an open circuit breaker never reached the broker and are not counted
+        as attempts. Events that exhaust ``max_attempts`` are moved to the
+        dead-letter list, and their row is only deleted once Redis has
+        accepted the entry.
+        """
+        from app.services import event_publisher
+
+        published = 0
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(EventOutbox)
+                    .where(EventOutbox.next_attempt_at <= now)
+                    .order_by(EventOutbox.created_at)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                entries = result.scalars().all()
+                if not entries:
+                    return 0
+                exhausted = [e for e in entries if e.attempts >= self.max_attempts]
+                pending = [e for e in entries if e.attempts < self.max_attempts]
+                outcomes = await event_publisher.publish_events(
+                    (entry.event_name, entry.payload, entry.trace_id)
+                    for entry in pending
+                )
+                for entry, error in zip(pending, outcomes):
+                    if error is None:
+                        await session.delete(entry)
+                        published += 1
+                        continue
+                    entry.last_error = str(error)[:255]
+                    if isinstance(error, CircuitOpenError):
+                        continue
+                    entry.attempts += 1
+                    entry.next_attempt_at = now + self._backoff(entry.attempts)
+                    if entry.attempts >= self.max_attempts:
+                        exhausted.append(entry)
+                    logger.warning(
+                        "Outbox event publish failed",
+                        extra={
+                            "event_id": str(entry.id),
+                            "event": entry.event_name,
+                            "attempts": entry.attempts,
+                            "trace_id": entry.trace_id,
+                        },
+                    )
+                for entry in exhausted:
+                    stored = await get_dead_letter_store().store_now(
+                        entry.event_name, entry.payload, entry.trace_id
+                    )
+                    if stored:
+                        await session.delete(entry)
+                    else:
+                        entry.next_attempt_at = now + self._backoff(entry.attempts)
+        return published
+
+    def notify(self) -> None:
+        """Wake the relay loop so freshly committed events go out immediately."""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Relay events until cancelled."""
+        while True:
+            try:
+                published = await self.relay_once()
+            except Exception as exc:
+                logger.warning("Outbox relay iteration failed", extra={"error": str(exc)})
+                published = 0
+            if published >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Run the relay loop as a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_relay: Optional[OutboxRelay] = None
+
+
+async def start_relay() -> None:
+    """Start the in-process outbox relay if it is enabled in settings."""
+    global _relay
+    if settings.OUTBOX_RELAY_ENABLED and _relay is None:
+        _relay = OutboxRelay()
+        _relay.start()
+
+
+async def stop_relay() -> None:
+    """Stop the in-process outbox relay."""
+    global _relay
+    if _relay is not None:
+        await _relay.stop()
+        _relay = None
+
+
+def notify_relay() -> None:
+    """Signal the in-process relay that new events were committed."""
+    if _relay is not None:
+        _relay.notify()
@@ -1,18 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 import logging
 
+from app.core.tracing import current_trace_id
+from app.db.instrumentation import instrument_service
 from app.models.customer_tag import CustomerTag
 from app.schemas.tag import TagCreate
+from app.services.outbox import add_event, notify_relay
 
+@instrument_service
 class TagService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.logger = logging.getLogger(__name__)
 
-    async def create_tag(self, tag: TagCreate, trace_id: str) -> CustomerTag:
+    async def create_tag(self, tag: TagCreate, trace_id: Optional[str] = None) -> CustomerTag:
         """Create a single tag for a customer."""
         result = await self.create_tags(
             tag.customer_id,
@@ -31,13 +35,14 @@ class TagService:
         color: Optional[str] = None,
         priority: int = 0,
         created_by: Optional[UUID] = None,
-        trace_id: str = "",
+        trace_id: Optional[str] = None,
     ) -> List[CustomerTag]:
         """Create multiple tags in one call.
 
         Raises ``ValueError`` if any requested label already exists for the
         customer or if duplicate labels are provided in the request.
         """
+        trace_id = trace_id or current_trace_id()
 
         # Check for duplicates in the payload
         unique_labels = list(dict.fromkeys(labels))
@@ -60,6 +65,7 @@ class TagService:
 
         db_tags = [
             CustomerTag(
+                id=uuid4(),
                 customer_id=customer_id,
                 label=lbl,
                 color=color,
@@ -69,7 +75,20 @@ class TagService:
             for lbl in unique_labels
         ]
         self.db.add_all(db_tags)
+        for tag in db_tags:
+            add_event(
+                self.db,
+                "v1.customer.tagged",
+                {
+                    "customer_id": str(tag.customer_id),
+                    "tag_id": str(tag.id),
+                    "label": tag.label,
+                    "trace_id": trace_id,
+                },
+                trace_id,
+            )
         await self.db.commit()
+        notify_relay()
         for tag in db_tags:
             await self.db.refresh(tag)
 
@@ -94,17 +113,6 @@ class TagService:
                 trace_id,
             )
 
-        from app.services.event_publisher import publish_event
-
-        for tag in db_tags:
-            payload = {
-                "customer_id": str(tag.customer_id),
-                "tag_id": str(tag.id),
-                "label": tag.label,
-                "trace_id": trace_id,
-            }
-            await publish_event("v1.customer.tagged", payload, trace_id)
-
         return db_tags
 
     async def get_tag(self, tag_id: UUID) -> Optional[CustomerTag]:
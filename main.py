@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,16 +10,54 @@ from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.api.routes import customers, tags, notes, gdpr
+from app.api.routes import customers, tags, notes, gdpr, admin
+from app.api.routes.customers import NEXT_CURSOR_HEADER
+from app.core.http_client import close_http_clients, open_http_clients
+from app.core.jwks import start_jwks, stop_jwks
 from app.core.limiter import limiter
+from app.core.tracing import TRACE_HEADER, TraceIdMiddleware
+from app.db.database import close_read_replicas
+from app.services.auth_sync import start_auth_sync, stop_auth_sync
+from app.services.customer_cache import start_customer_cache, stop_customer_cache
+from app.services.customer_import import stop_imports
+from app.services.dead_letter import close_dead_letter_store
+from app.services.event_publisher import close_publisher, start_publisher
+from app.services.log_service import stop_log_shipper
+from app.services.outbox import start_relay, stop_relay
 
 # Initialize structured logging before anything else
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared outbound connections on startup and close them on shutdown."""
+    await open_http_clients()
+    await start_jwks()
+    await start_publisher()
+    await start_relay()
+    await start_auth_sync()
+    await start_customer_cache()
+    try:
+        yield
+    finally:
+        await stop_jwks()
+        await stop_imports()
+        await stop_relay()
+        await stop_auth_sync()
+        await stop_customer_cache()
+        await stop_log_shipper()
+        await close_publisher()
+        await close_dead_letter_store()
+        await close_http_clients()
+        await close_read_replicas()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
     description=settings.PROJECT_DESCRIPTION,
+    lifespan=lifespan,
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -34,14 +74,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_HEADER, NEXT_CURSOR_HEADER],
 )
 
+# Bind the request trace id for logs, outbound calls and events
+app.add_middleware(TraceIdMiddleware)
+
 # Include routers
 app.include_router(customers.router, prefix="/api/customers", tags=["customers"])
 app.include_router(tags.router, prefix="/api/customers/tags", tags=["tags"])
 app.include_router(tags.customer_router, prefix="/api/customers", tags=["tags"])
 app.include_router(notes.customer_router, prefix="/api/customers", tags=["notes"])
 app.include_router(gdpr.router, prefix="/api/gdpr", tags=["gdpr"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 # Initialize Prometheus metrics instrumentation
 Instrumentator().instrument(app).expose(app, endpoint="/metrics")
@@ -0,0 +1,51 @@
+"""event outbox
+
+Revision ID: 3f1a9c2d7b44
+Revises: 8c70b4aaf501
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b44'
+down_revision: Union[str, Sequence[str], None] = '8c70b4aaf501'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_outbox",
+        sa.Column("id", sa.dialects.postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("event_name", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("trace_id", sa.String(length=64)),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.String(length=255)),
+        sa.Column(
+            "next_attempt_at", sa.DateTime(), nullable=False, server_default=sa.func.now()
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_event_outbox_created_at", "event_outbox", ["created_at"], unique=False
+    )
+    op.create_index(
+        "ix_event_outbox_next_attempt_at",
+        "event_outbox",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_outbox_next_attempt_at", table_name="event_outbox")
+    op.drop_index("ix_event_outbox_created_at", table_name="event_outbox")
+    op.drop_table("event_outbox")
@@ -0,0 +1,57 @@
+"""customer keyset pagination index
+
+Revision ID: 5b2e8d1c9a63
+Revises: 3f1a9c2d7b44
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8d1c9a63'
+down_revision: Union[str, Sequence[str], None] = '3f1a9c2d7b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination compares (created_at, id); rows without a timestamp
+    # would never be reached by a cursor
+    op.execute(
+        sa.text("UPDATE customers SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customer_business_created_id",
+            "customers",
+            ["business_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_customer_created_id",
+            "customers",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_customer_created_id",
+            table_name="customers",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_customer_business_created_id",
+            table_name="customers",
+            postgresql_concurrently=True,
+        )
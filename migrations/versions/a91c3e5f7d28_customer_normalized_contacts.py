@@ -0,0 +1,130 @@
+"""customer normalized phone and email
+
+Revision ID: a91c3e5f7d28
+Revises: 7d4f2a6b1e90
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c3e5f7d28'
+down_revision: Union[str, Sequence[str], None] = '7d4f2a6b1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+customers = sa.table(
+    "customers",
+    sa.column("id", sa.dialects.postgresql.UUID(as_uuid=True)),
+    sa.column("email", sa.String),
+    sa.column("phone", sa.String),
+    sa.column("email_normalized", sa.String),
+    sa.column("phone_e164", sa.String),
+)
+
+# Frozen copy of app.core.normalization as of this revision, so later changes
+# to the app code do not change what this migration writes
+_PHONE_SEPARATORS = re.compile(r"[\s().-]")
+_SHORT_ROMANIAN_MOBILE = re.compile(r"^\+47\d{8}$")
+
+
+def _normalize_phone(phone: Optional[str]) -> Optional[str]:
+    if not phone:
+        return None
+    digits = _PHONE_SEPARATORS.sub("", phone)
+    if digits.startswith("00"):
+        digits = "+" + digits[2:]
+    if _SHORT_ROMANIAN_MOBILE.match(digits):
+        digits = "+40" + digits[2:]
+    elif digits.startswith("0"):
+        digits = "+40" + digits[1:]
+    elif not digits.startswith("+"):
+        digits = "+40" + digits
+    if not digits[1:].isdigit() or not 8 <= len(digits) <= 16:
+        return None
+    return digits
+
+
+def _normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email:
+        return None
+    return email.strip().lower()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("customers", sa.Column("phone_e164", sa.String(length=20), nullable=True))
+    op.add_column(
+        "customers", sa.Column("email_normalized", sa.String(length=100), nullable=True)
+    )
+
+    # Values are computed in Python, then written with one executemany per batch
+    bind = op.get_bind()
+    backfill = (
+        customers.update()
+        .where(customers.c.id == sa.bindparam("row_id"))
+        .values(
+            email_normalized=sa.bindparam("email_value"),
+            phone_e164=sa.bindparam("phone_value"),
+        )
+    )
+    last_id = None
+    while True:
+        query = sa.select(customers.c.id, customers.c.email, customers.c.phone)
+        if last_id is not None:
+            query = query.where(customers.c.id > last_id)
+        rows = bind.execute(query.order_by(customers.c.id).limit(BACKFILL_BATCH_SIZE)).all()
+        if not rows:
+            break
+        bind.execute(
+            backfill,
+            [
+                {
+                    "row_id": row.id,
+                    "email_value": _normalize_email(row.email),
+                    "phone_value": _normalize_phone(row.phone),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customer_business_phone_e164",
+            "customers",
+            ["business_id", "phone_e164"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_customer_business_email_normalized",
+            "customers",
+            ["business_id", "email_normalized"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_customer_business_email_normalized",
+            table_name="customers",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_customer_business_phone_e164",
+            table_name="customers",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("customers", "email_normalized")
+    op.drop_column("customers", "phone_e164")
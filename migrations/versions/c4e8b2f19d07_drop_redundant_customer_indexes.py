@@ -0,0 +1,51 @@
+"""drop redundant customer indexes
+
+Revision ID: c4e8b2f19d07
+Revises: a91c3e5f7d28
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8b2f19d07'
+down_revision: Union[str, Sequence[str], None] = 'a91c3e5f7d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every insert maintains these, but no query needs them: business_id and
+# user_id lead the composite indexes and uq_user_per_business, and name /
+# phone search goes through the trigram and normalized-contact indexes
+REDUNDANT_INDEXES = (
+    ("ix_customer_business_id", ["business_id"]),
+    ("ix_customer_user_id", ["user_id"]),
+    ("ix_customer_full_name", ["full_name"]),
+    ("ix_customer_phone", ["phone"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in REDUNDANT_INDEXES:
+            op.drop_index(
+                name,
+                table_name="customers",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name,
+                "customers",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
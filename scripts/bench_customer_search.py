@@ -0,0 +1,127 @@
+"""Benchmark tenant-scoped customer search on PostgreSQL.
+
+Seeds ``--rows`` synthetic customers spread over ``--tenants`` businesses
+(skipped with ``--no-seed``), then times ``CustomerService.get_customers``
+for a few search terms per tenant (or across all tenants with
+``--unscoped``) and prints latency percentiles plus the query plan. Run
+against a scratch database migrated to head::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench_customer_search
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.db.database import SessionLocal, engine
+from app.services.customer_service import CustomerService
+
+SEED_SQL = text(
+    """
+    INSERT INTO customers (
+        id, user_id, business_id, full_name, email, phone,
+        total_orders, total_appointments, lifetime_value, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        gen_random_uuid(),
+        tenants.id,
+        'Customer ' || md5(s::text),
+        'user' || s || '@' || substr(md5((s * 7)::text), 1, 8) || '.example.com',
+        '07' || lpad((s % 100000000)::text, 8, '0'),
+        0, 0, 0,
+        now() - (s || ' seconds')::interval,
+        now()
+    FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS s
+    JOIN tenants ON tenants.n = s % CAST(:tenants AS integer)
+    """
+)
+
+
+async def seed(rows: int, tenants: int, batch: int) -> List[UUID]:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE tenants ON COMMIT DROP AS "
+                "SELECT n, gen_random_uuid() AS id FROM generate_series(0, :last) AS n"
+            ),
+            {"last": tenants - 1},
+        )
+        for start in range(1, rows + 1, batch):
+            stop = min(start + batch - 1, rows)
+            await conn.execute(SEED_SQL, {"tenants": tenants, "start": start, "stop": stop})
+            print(f"seeded {stop:,}/{rows:,}")
+        business_ids = (await conn.execute(text("SELECT id FROM tenants"))).scalars().all()
+        await conn.execute(text("ANALYZE customers"))
+    return list(business_ids)
+
+
+async def pick_tenants(count: int) -> List[UUID]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT DISTINCT business_id FROM customers LIMIT :count"), {"count": count}
+        )
+        return list(result.scalars().all())
+
+
+async def explain(business_id: Optional[UUID], term: str) -> None:
+    service = CustomerService(None)  # type: ignore[arg-type]
+    stmt = service._customers_query(business_id, term).limit(100)
+    compiled = stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        plan = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}")
+        print("\n".join(row[0] for row in plan))
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.no_seed:
+        business_ids = await pick_tenants(args.sample_tenants)
+    else:
+        business_ids = await seed(args.rows, args.tenants, args.batch)
+    business_ids = random.sample(business_ids, min(args.sample_tenants, len(business_ids)))
+    if args.unscoped:
+        business_ids = [None]
+    terms = args.terms.split(",")
+
+    timings = []
+    async with SessionLocal() as session:
+        service = CustomerService(session)
+        for business_id in business_ids:
+            for term in terms:
+                started = time.perf_counter()
+                await service.get_customers(0, 100, business_id, term)
+                timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{len(timings)} searches: p50 {statistics.median(timings):.1f} ms, "
+        f"p95 {p95:.1f} ms, max {timings[-1]:.1f} ms"
+    )
+    await explain(business_ids[0], terms[0])
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark customer search")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Customers to seed")
+    parser.add_argument("--tenants", type=int, default=200, help="Businesses to spread them over")
+    parser.add_argument("--batch", type=int, default=100_000, help="Rows per seed statement")
+    parser.add_argument("--sample-tenants", type=int, default=20, help="Businesses to search")
+    parser.add_argument("--terms", default="3f2a,user12,@ab,0712", help="Comma separated terms")
+    parser.add_argument("--no-seed", action="store_true", help="Search the existing data")
+    parser.add_argument(
+        "--unscoped", action="store_true", help="Search across all businesses instead"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import json
+import logging
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging import JsonFormatter, _stdlib_dumps
+
+
+class BaselineJsonFormatter(logging.Formatter):
+    """The formatter as it was before the fast path, kept for comparison.
+
+    It used ``json.dumps`` without a ``default``, so records must hold only
+    JSON-native values to be comparable.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(datefmt="%Y-%m-%dT%H:%M:%S%z")
+
+    def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
+        log_record: Dict[str, Any] = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname.lower(),
+            "service_name": settings.PROJECT_NAME,
+            "message": record.getMessage(),
+        }
+
+        if hasattr(record, "trace_id"):
+            log_record["trace_id"] = record.trace_id
+
+        for key, value in record.__dict__.items():
+            if key not in log_record and key not in {
+                "args",
+                "msg",
+                "levelname",
+                "levelno",
+                "pathname",
+                "filename",
+                "module",
+                "exc_info",
+                "exc_text",
+                "stack_info",
+                "lineno",
+                "funcName",
+                "created",
+                "msecs",
+                "relativeCreated",
+                "thread",
+                "threadName",
+                "processName",
+                "process",
+            }:
+                log_record[key] = value
+
+        return json.dumps(log_record)
+
+
+def make_record() -> logging.LogRecord:
+    record = logging.LogRecord(
+        "app.services.customer_service",
+        logging.INFO,
+        __file__,
+        42,
+        "Customer %s updated",
+        ("c-1",),
+        None,
+    )
+    record.trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    record.customer_id = str(uuid4())
+    record.business_id = str(uuid4())
+    record.fields = ["name", "email", "phone"]
+    return record
+
+
+def bench(formatter: logging.Formatter, record: logging.LogRecord, count: int) -> float:
+    """Return how many records per second ``formatter`` can format."""
+    for _ in range(min(count, 1000)):
+        formatter.format(record)
+    started = time.perf_counter()
+    for _ in range(count):
+        formatter.format(record)
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON log formatter")
+    parser.add_argument("--records", type=int, default=200_000, help="Records per run")
+    args = parser.parse_args()
+
+    record = make_record()
+    formatters = [
+        ("baseline", BaselineJsonFormatter()),
+        ("optimized (json)", JsonFormatter(dumps=_stdlib_dumps)),
+        ("optimized (default encoder)", JsonFormatter()),
+    ]
+    baseline = None
+    for name, formatter in formatters:
+        rate = bench(formatter, record, args.records)
+        baseline = baseline or rate
+        print(f"{name:<30} {rate:>12,.0f} records/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
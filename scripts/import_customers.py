@@ -0,0 +1,71 @@
+"""Import customers from a CSV or NDJSON file without going through the API.
+
+Uses the same streaming importer as ``POST /api/customers/import``::
+
+    python -m scripts.import_customers customers.csv --business-id <uuid>
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from app.core.config import settings
+from app.schemas.customer import CustomerImportJob
+from app.services.customer_import import FORMATS, CustomerImporter, detect_format
+
+
+async def report_progress(job: CustomerImportJob) -> None:
+    while True:
+        await asyncio.sleep(2)
+        percent = job.bytes_processed * 100 / job.bytes_total if job.bytes_total else 0
+        print(
+            f"{percent:5.1f}% read, {job.rows_processed:,} rows: {job.created:,} created, "
+            f"{job.conflicts:,} conflicts, {job.invalid:,} invalid"
+        )
+
+
+async def import_customers(args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path, None)
+    if fmt not in FORMATS:
+        print("Unknown file format, pass --format csv or --format ndjson")
+        return 2
+    job = CustomerImportJob(id="cli", format=fmt, started_at=datetime.utcnow())
+    errors_path = args.errors or f"{args.path}.errors.csv"
+    with ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        importer = CustomerImporter(
+            job, args.path, errors_path, args.business_id, executor, args.chunk_size
+        )
+        progress = asyncio.create_task(report_progress(job))
+        try:
+            await importer.run()
+        finally:
+            progress.cancel()
+    print(
+        f"{job.status.value}: {job.rows_processed:,} rows, {job.created:,} created, "
+        f"{job.conflicts:,} conflicts, {job.invalid:,} invalid; errors in {errors_path}"
+    )
+    if job.error:
+        print(job.error)
+    return 0 if job.status.value == "completed" else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import customers from a file")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--business-id", help="Business for rows without a business_id")
+    parser.add_argument("--errors", help="Error report path (default: <path>.errors.csv)")
+    parser.add_argument(
+        "--workers", type=int, default=max(1, settings.IMPORT_VALIDATION_WORKERS),
+        help="Validation processes",
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    raise SystemExit(asyncio.run(import_customers(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,164 @@
+import argparse
+import asyncio
 import json
-import redis
+import logging
+import time
+from typing import Optional
+
+import redis.asyncio as aioredis
 
 from app.core.config import settings
-from app.services.event_publisher import publish_event_sync
+from app.core.logging import setup_logging
+from app.services import event_publisher
+
+logger = logging.getLogger("resend_failed_events")
+
+
+class ReplayStats:
+    """Counters reported while replaying dead-lettered events."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.published = 0
+        self.poisoned = 0
+        self.requeued = 0
+
+    @property
+    def processed(self) -> int:
+        return self.published + self.poisoned + self.requeued
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class RateLimiter:
+    """Token bucket limiting how many events are published per second.
+
+    The bucket holds at least one token so rates below one event per second
+    still let an event through every ``1 / rate`` seconds.
+    """
 
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
 
-def resend_failed_events() -> None:
-    """Resend events stored in Redis failed_events list."""
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def resend_failed_events(
+    batch_size: int = 500,
+    concurrency: int = 100,
+    rate: float = 0,
+    key: Optional[str] = None,
+    poison_key: Optional[str] = None,
+) -> Optional[ReplayStats]:
+    """Republish events stored in the Redis dead-letter list.
+
+    Events are popped in batches and republished over the shared connection
+    with at most ``concurrency`` publishes in flight and at most ``rate``
+    events per second (``0`` disables the limit). Entries that cannot be
+    decoded are moved to ``poison_key``; entries that fail to publish are
+    pushed back to the list. The run stops after one pass over the events
+    present at start, or as soon as a whole batch fails to publish.
+    """
     if not settings.REDIS_URL:
-        return
-    client = redis.from_url(settings.REDIS_URL)
-    while True:
-        data = client.lpop("failed_events")
-        if data is None:
-            break
+        return None
+    key = key or settings.DEAD_LETTER_KEY
+    poison_key = poison_key or f"{key}:poison"
+    client = aioredis.from_url(settings.REDIS_URL)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    stats = ReplayStats()
+
+    async def replay(data: bytes) -> None:
         try:
             event = json.loads(data)
-            publish_event_sync(event["event"], event["payload"], event["trace_id"])
-        except Exception:
-            client.rpush("failed_events", data)
-            break
+            name, payload, trace_id = event["event"], event["payload"], event["trace_id"]
+        except (ValueError, KeyError, TypeError):
+            await client.rpush(poison_key, data)
+            stats.poisoned += 1
+            return
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                await event_publisher.publish_event(name, payload, trace_id)
+            except Exception:
+                await client.rpush(key, data)
+                stats.requeued += 1
+                return
+        stats.published += 1
+
+    try:
+        remaining = await client.llen(key)
+        logger.info("Replaying failed events", extra={"pending": remaining})
+        while remaining > 0:
+            items = await client.lpop(key, min(batch_size, remaining))
+            if not items:
+                break
+            remaining -= len(items)
+            requeued_before = stats.requeued
+            await asyncio.gather(*(replay(item) for item in items))
+            logger.info(
+                "Replay progress",
+                extra={
+                    "processed": stats.processed,
+                    "published": stats.published,
+                    "poisoned": stats.poisoned,
+                    "requeued": stats.requeued,
+                    "events_per_second": round(stats.rate, 1),
+                },
+            )
+            if stats.requeued - requeued_before == len(items):
+                logger.warning("Broker unavailable, stopping replay")
+                break
+    finally:
+        await event_publisher.close_publisher()
+        await client.close(close_connection_pool=True)
+
+    logger.info(
+        "Replay finished",
+        extra={
+            "published": stats.published,
+            "poisoned": stats.poisoned,
+            "requeued": stats.requeued,
+            "events_per_second": round(stats.rate, 1),
+        },
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=resend_failed_events.__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="events popped per LPOP")
+    parser.add_argument("--concurrency", type=int, default=100, help="publishes in flight")
+    parser.add_argument("--rate", type=float, default=0, help="max events per second (0 = unlimited)")
+    parser.add_argument("--key", default=None, help="dead-letter list (default: DEAD_LETTER_KEY)")
+    parser.add_argument("--poison-key", default=None, help="list for undecodable events")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(
+        resend_failed_events(
+            args.batch_size, args.concurrency, args.rate, args.key, args.poison_key
+        )
+    )
 
 
 if __name__ == "__main__":
-    resend_failed_events()
+    main()
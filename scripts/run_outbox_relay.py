@@ -0,0 +1,17 @@
+import asyncio
+
+from app.services.event_publisher import close_publisher
+from app.services.outbox import OutboxRelay
+
+
+async def run_outbox_relay() -> None:
+    """Run a standalone relay draining the event outbox."""
+    relay = OutboxRelay()
+    try:
+        await relay.run()
+    finally:
+        await close_publisher()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_outbox_relay())
@@ -0,0 +1,45 @@
+import logging
+import uuid
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.core.log_sampling import sampler
+
+
+@pytest.mark.asyncio
+async def test_update_log_sampling_rules(async_client, auth_headers):
+    rules = {"rules": [{"logger": "app.services.tag_service", "message": None, "rate": 10}]}
+    try:
+        resp = await async_client.put(
+            "/api/admin/logging/sampling", json=rules, headers=auth_headers
+        )
+        assert resp.status_code == 200
+        assert resp.json() == rules
+
+        resp = await async_client.get("/api/admin/logging/sampling", headers=auth_headers)
+        assert resp.json() == rules
+
+        record = logging.LogRecord(
+            "app.services.tag_service", logging.INFO, __file__, 1, "Customer tagged", None, None
+        )
+        kept = [sampler.filter(record) for _ in range(10)]
+        assert kept.count(True) == 1
+    finally:
+        sampler.set_rules({})
+
+
+@pytest.mark.asyncio
+async def test_log_sampling_requires_admin(async_client):
+    token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "role": "customer"},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    resp = await async_client.put(
+        "/api/admin/logging/sampling",
+        json={"rules": []},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 403
@@ -64,6 +64,167 @@ async def test_get_customers_query_param(db_session, auth_headers, internal_head
     assert resp.json() == alias_resp.json()
 
 
+@pytest.mark.asyncio
+async def test_get_customers_cursor_pagination(db_session, auth_headers, internal_headers, async_client):
+    importlib.reload(__import__('main'))
+    client = async_client
+    business_id = str(uuid.uuid4())
+
+    for index in range(3):
+        payload = {
+            'user_id': str(uuid.uuid4()),
+            'business_id': business_id,
+            'full_name': f'Cursor User {index}',
+            'email': f'cursor{index}@example.com',
+            'phone': '0712345678',
+            'gender': 'male',
+            'avatar_url': None,
+        }
+        resp = await client.post('/api/customers/', json=payload, headers=internal_headers)
+        assert resp.status_code == 201
+
+    resp = await client.get(
+        f'/api/customers/?business_id={business_id}&limit=2', headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+    cursor = resp.headers['X-Next-Cursor']
+
+    resp = await client.get(
+        f'/api/customers/?business_id={business_id}&limit=2&cursor={cursor}',
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+    assert 'X-Next-Cursor' not in resp.headers
+
+    resp = await client.get('/api/customers/?cursor=bogus', headers=auth_headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_lookup_customer(db_session, auth_headers, internal_headers, async_client):
+    importlib.reload(__import__('main'))
+    client = async_client
+    business_id = str(uuid.uuid4())
+
+    payload = {
+        'user_id': str(uuid.uuid4()),
+        'business_id': business_id,
+        'full_name': 'Caller Id',
+        'email': 'Caller@Example.com',
+        'phone': '0733111222',
+        'gender': 'female',
+        'avatar_url': None,
+    }
+    resp = await client.post('/api/customers/', json=payload, headers=internal_headers)
+    assert resp.status_code == 201
+    customer_id = resp.json()['id']
+
+    resp = await client.get(
+        '/api/customers/lookup',
+        params={'business_id': business_id, 'phone': '+40733111222'},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()['id'] == customer_id
+
+    resp = await client.get(
+        '/api/customers/lookup',
+        params={'business_id': business_id, 'email': 'caller@example.com'},
+        headers=auth_headers,
+    )
+    assert resp.json()['id'] == customer_id
+
+    resp = await client.get(
+        '/api/customers/lookup',
+        params={'business_id': business_id, 'phone': '0799999999'},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 404
+
+    resp = await client.get(
+        '/api/customers/lookup', params={'business_id': business_id}, headers=auth_headers
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_customers(db_session, internal_headers, async_client):
+    importlib.reload(__import__('main'))
+    client = async_client
+    business_id = str(uuid.uuid4())
+    rows = [
+        {
+            'user_id': str(uuid.uuid4()),
+            'business_id': business_id,
+            'full_name': f'Bulk Route {index}',
+            'email': f'bulk-route{index}@example.com',
+        }
+        for index in range(2)
+    ]
+
+    resp = await client.post(
+        '/api/customers/bulk', json={'customers': rows}, headers=internal_headers
+    )
+    assert resp.status_code == 200
+    assert [row['index'] for row in resp.json()['created']] == [0, 1]
+
+    resp = await client.post(
+        '/api/customers/bulk', json={'customers': rows[:1]}, headers=internal_headers
+    )
+    assert resp.json()['created'] == []
+    assert resp.json()['conflicts'][0]['reason'] == 'Customer already exists'
+
+    rows[0]['phone'] = 'not a phone'
+    resp = await client.post(
+        '/api/customers/bulk', json={'customers': rows}, headers=internal_headers
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_import_customers_csv(db_session, internal_headers, async_client):
+    import asyncio
+    from app.services.customer_import import stop_imports
+
+    client = async_client
+    business_id = str(uuid.uuid4())
+    content = 'user_id,full_name,email,phone\n'
+    content += ''.join(
+        f'{uuid.uuid4()},Import Route {index},import{index}@example.com,0712345678\n'
+        for index in range(3)
+    )
+    content += 'not-a-uuid,Broken Row,broken@example.com,\n'
+
+    resp = await client.post(
+        f'/api/customers/import?business_id={business_id}',
+        files={'file': ('customers.csv', content, 'text/csv')},
+        headers=internal_headers,
+    )
+    assert resp.status_code == 202
+    job_id = resp.json()['id']
+
+    try:
+        for _ in range(200):
+            resp = await client.get(f'/api/customers/import/{job_id}', headers=internal_headers)
+            if resp.json()['status'] in ('completed', 'failed'):
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await stop_imports()
+    job = resp.json()
+    assert job['status'] == 'completed'
+    assert (job['created'], job['invalid']) == (3, 1)
+
+    resp = await client.get(f'/api/customers/import/{job_id}/errors', headers=internal_headers)
+    assert resp.status_code == 200
+    assert resp.text.splitlines()[1].startswith('5,"user_id:')
+
+    resp = await client.get('/api/customers/import/unknown', headers=internal_headers)
+    assert resp.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_stats_endpoint(db_session, auth_headers, internal_headers, async_client):
     """Ensure the /stats endpoint returns customer statistics."""
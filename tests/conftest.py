@@ -22,11 +22,17 @@ def db_session(tmp_path):
     db_path = tmp_path / "test.db"
     os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
     importlib.reload(database)
-    for mod in ["app.models.customer", "app.models.customer_tag", "app.services.tag_service"]:
+    for mod in [
+        "app.models.customer",
+        "app.models.customer_tag",
+        "app.models.event_outbox",
+        "app.services.tag_service",
+    ]:
         if mod in sys.modules:
             del sys.modules[mod]
     import app.models.customer  # noqa: F401
     import app.models.customer_tag  # noqa: F401
+    import app.models.event_outbox  # noqa: F401
     import app.services.tag_service  # noqa: F401
 
     async def reset_db():
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+async def failing_call(breaker: CircuitBreaker) -> None:
+    with pytest.raises(ConnectionError):
+        async with breaker.guard():
+            raise ConnectionError("downstream unavailable")
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test_open", failure_threshold=2, recovery_timeout=60)
+
+    await failing_call(breaker)
+    assert breaker.state == CLOSED
+    await failing_call(breaker)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        async with breaker.guard():
+            pytest.fail("call should not be attempted while open")
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_closes_or_reopens():
+    breaker = CircuitBreaker("test_half_open", failure_threshold=1, recovery_timeout=0)
+
+    await failing_call(breaker)
+    assert breaker.state == HALF_OPEN
+    await failing_call(breaker)
+    assert breaker._state == OPEN
+
+    assert breaker.state == HALF_OPEN
+    async with breaker.guard():
+        pass
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_limits_trial_calls():
+    breaker = CircuitBreaker("test_trials", failure_threshold=1, recovery_timeout=0)
+    await failing_call(breaker)
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_frees_its_slot():
+    breaker = CircuitBreaker("test_cancelled", failure_threshold=1, recovery_timeout=0)
+    await failing_call(breaker)
+
+    async def hanging_call():
+        async with breaker.guard():
+            await asyncio.sleep(60)
+
+    task = asyncio.create_task(hanging_call())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == HALF_OPEN
+    async with breaker.guard():
+        pass
+    assert breaker.state == CLOSED
@@ -0,0 +1,18 @@
+import pytest
+
+from app.core.http_client import close_http_clients, get_http_client
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_per_origin():
+    auth = get_http_client("http://auth.local:8001/api/users/1")
+    assert get_http_client("http://auth.local:8001/api/users/2") is auth
+
+    logs = get_http_client("http://logs.local/logs")
+    assert logs is not auth
+
+    await close_http_clients()
+    assert auth.is_closed
+    assert logs.is_closed
+    assert get_http_client("http://auth.local:8001/") is not auth
+    await close_http_clients()
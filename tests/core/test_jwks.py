@@ -0,0 +1,89 @@
+import json
+import uuid
+
+import ecdsa
+import pytest
+import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.core import jwks as jwks_module
+from app.core import security
+from app.core.config import settings
+from app.core.jwks import JWKSCache
+from app.core.security import TokenCache, decode_jwt
+
+
+def rsa_key() -> str:
+    _, private = rsa.newkeys(1024)
+    return private.save_pkcs1().decode()
+
+
+def ec_key() -> str:
+    return ecdsa.SigningKey.generate(curve=ecdsa.NIST256p).to_pem().decode()
+
+
+def public_jwk(private_pem: str, alg: str, kid: str) -> dict:
+    return {**jwk.construct(private_pem, alg).public_key().to_dict(), "kid": kid}
+
+
+def sign(private_pem: str, alg: str, kid: str) -> str:
+    claims = {"sub": str(uuid.uuid4()), "role": "internal"}
+    return jwt.encode(claims, private_pem, algorithm=alg, headers={"kid": kid})
+
+
+@pytest.fixture()
+def jwks_file(tmp_path, monkeypatch):
+    path = tmp_path / "jwks.json"
+    monkeypatch.setattr(settings, "JWKS_URL", str(path))
+    monkeypatch.setattr(settings, "JWKS_MIN_REFRESH_INTERVAL", 0.0)
+    monkeypatch.setattr(jwks_module, "_jwks", None)
+    monkeypatch.setattr(security, "token_cache", TokenCache(max_size=0))
+    return path
+
+
+def test_decode_rs256_and_es256_tokens_from_jwks_file(jwks_file):
+    rsa_pem, ec_pem = rsa_key(), ec_key()
+    jwks_file.write_text(
+        json.dumps(
+            {"keys": [public_jwk(rsa_pem, "RS256", "rsa-1"), public_jwk(ec_pem, "ES256", "ec-1")]}
+        )
+    )
+
+    assert decode_jwt(sign(rsa_pem, "RS256", "rsa-1"))["role"] == "internal"
+    assert decode_jwt(sign(ec_pem, "ES256", "ec-1"))["role"] == "internal"
+
+    # Shared-secret tokens keep working alongside the key set
+    hs_token = jwt.encode({"sub": str(uuid.uuid4())}, settings.SECRET_KEY, algorithm="HS256")
+    assert decode_jwt(hs_token)["sub"]
+
+
+def test_rotated_key_is_loaded_on_unknown_kid(jwks_file):
+    old_pem, new_pem = rsa_key(), rsa_key()
+    jwks_file.write_text(json.dumps({"keys": [public_jwk(old_pem, "RS256", "old")]}))
+    assert decode_jwt(sign(old_pem, "RS256", "old"))
+
+    jwks_file.write_text(json.dumps({"keys": [public_jwk(new_pem, "RS256", "new")]}))
+    assert decode_jwt(sign(new_pem, "RS256", "new"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_jwt(sign(old_pem, "RS256", "old"))
+    assert exc_info.value.status_code == 401
+
+
+def test_unknown_kid_reloads_are_rate_limited(tmp_path):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": []}))
+    cache = JWKSCache(str(path), min_refresh_interval=60)
+    fetches = []
+    original_fetch = cache._fetch
+
+    def counting_fetch():
+        fetches.append(1)
+        return original_fetch()
+
+    cache._fetch = counting_fetch
+
+    for _ in range(5):
+        assert cache.get_key("missing") is None
+    assert len(fetches) == 1
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+
+from app.core.log_sampling import SamplingFilter, parse_rules, trace_sampled
+
+
+def make_record(name: str, msg: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_parse_rules():
+    rules = parse_rules("app.services=10, app.services.customer_service:Customer updated=5,")
+    assert rules == {
+        ("app.services", None): 10,
+        ("app.services.customer_service", "Customer updated"): 5,
+    }
+    with pytest.raises(ValueError):
+        parse_rules("app.services=often")
+
+
+def test_sampling_filter_keeps_one_in_n_and_all_warnings():
+    sampler = SamplingFilter({("app.services", None): 4})
+
+    kept = [
+        sampler.filter(make_record("app.services.tag_service", "Customer tagged"))
+        for _ in range(8)
+    ]
+    assert kept.count(True) == 2
+    assert sampler.filter(make_record("app.services.tag_service", "Tag failed", logging.WARNING))
+    assert sampler.filter(make_record("app.api.routes", "Request"))
+
+
+def test_message_rule_overrides_logger_rule():
+    sampler = SamplingFilter(
+        {("app.services", None): 1, ("app.services.customer_service", "Customer updated"): 3}
+    )
+
+    updated = [
+        sampler.filter(make_record("app.services.customer_service", "Customer updated"))
+        for _ in range(6)
+    ]
+    assert updated.count(True) == 2
+    assert sampler.filter(make_record("app.services.customer_service", "Customer created"))
+
+
+def test_sampling_is_consistent_per_trace():
+    sampler = SamplingFilter({("app", None): 5})
+    trace_ids = [f"trace-{i}" for i in range(50)]
+
+    for trace_id in trace_ids:
+        decisions = {
+            sampler.filter(make_record("app.services.note_service", msg, trace_id=trace_id))
+            for msg in ("Note added", "Customer tagged", "Customer updated")
+        }
+        assert decisions == {trace_sampled(trace_id, 5)}
+
+
+def test_resolved_rules_are_cached_per_logger_not_per_message():
+    sampler = SamplingFilter(
+        {("app.services", None): 2, ("app.services.customer_service", "Customer updated"): 3}
+    )
+
+    for i in range(100):
+        sampler.filter(make_record("app.services.customer_service", f"Customer {i} created"))
+        sampler.filter(make_record("app.services.tag_service", f"Tag {i} added"))
+
+    assert len(sampler._resolved) == 2
@@ -0,0 +1,95 @@
+import json
+import logging
+import queue
+from uuid import uuid4
+
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.logging import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    _stdlib_dumps,
+    setup_logging,
+    stop_logging,
+)
+
+
+def make_record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_serializes_extras_and_skips_record_attributes():
+    customer_id = uuid4()
+    record = make_record(trace_id="t-1", customer_id=customer_id)
+
+    for formatter in (JsonFormatter(), JsonFormatter(dumps=_stdlib_dumps)):
+        data = json.loads(formatter.format(record))
+
+        assert data["message"] == "hello world"
+        assert data["level"] == "info"
+        assert data["trace_id"] == "t-1"
+        assert data["customer_id"] == str(customer_id)
+        assert "msg" not in data and "lineno" not in data
+
+
+def test_json_formatter_handles_values_orjson_rejects():
+    record = make_record(counts={1: "one", None: "none"}, big=2**70)
+
+    for formatter in (JsonFormatter(), JsonFormatter(dumps=_stdlib_dumps)):
+        data = json.loads(formatter.format(record))
+
+        assert data["counts"] == {"1": "one", "null": "none"}
+        assert data["big"] == 2**70
+
+
+def test_json_formatter_reuses_timestamp_within_a_second():
+    formatter = JsonFormatter()
+    first = make_record()
+    second = make_record()
+    second.created = first.created + 2
+
+    stamp = json.loads(formatter.format(first))["timestamp"]
+    assert json.loads(formatter.format(first))["timestamp"] == stamp
+    assert json.loads(formatter.format(second))["timestamp"] == formatter.formatTime(
+        second, formatter.datefmt
+    )
+
+
+def test_bounded_queue_handler_overflow_policies():
+    dropped = REGISTRY.get_sample_value("bee_customers_log_records_dropped_total")
+
+    newest = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(newest, overflow="drop_newest")
+    handler.emit(make_record(order=1))
+    handler.emit(make_record(order=2))
+    assert newest.get_nowait().order == 1
+
+    oldest = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(oldest, overflow="drop_oldest")
+    handler.emit(make_record(order=1))
+    handler.emit(make_record(order=2))
+    record = oldest.get_nowait()
+    assert record.order == 2
+    assert record.getMessage() == "hello world"
+
+    assert REGISTRY.get_sample_value("bee_customers_log_records_dropped_total") == dropped + 2
+
+
+def test_async_logging_writes_through_listener(monkeypatch, capsys):
+    monkeypatch.setattr(settings, "LOG_ASYNC", True)
+    root = logging.getLogger()
+    previous = root.handlers[:]
+    try:
+        setup_logging()
+        assert isinstance(root.handlers[0], BoundedQueueHandler)
+        logging.getLogger("test").info("queued %s", "record", extra={"customer": "c-1"})
+        stop_logging()
+    finally:
+        root.handlers = previous
+
+    data = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert data["message"] == "queued record"
+    assert data["customer"] == "c-1"
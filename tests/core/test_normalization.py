@@ -0,0 +1,25 @@
+import pytest
+
+from app.core.normalization import normalize_email, normalize_phone
+
+
+@pytest.mark.parametrize(
+    "phone",
+    ["+40712345678", "0712345678", "712345678", "+4712345678", "0040 712 345 678", "0712-345-678"],
+)
+def test_normalize_phone_romanian_forms(phone):
+    assert normalize_phone(phone) == "+40712345678"
+
+
+def test_normalize_phone_keeps_foreign_numbers():
+    assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+
+
+@pytest.mark.parametrize("phone", [None, "", "not a phone", "+40 12"])
+def test_normalize_phone_rejects_invalid(phone):
+    assert normalize_phone(phone) is None
+
+
+def test_normalize_email():
+    assert normalize_email("  Ana.Pop@Example.COM ") == "ana.pop@example.com"
+    assert normalize_email(None) is None
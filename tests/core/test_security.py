@@ -0,0 +1,62 @@
+import time
+import uuid
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import TokenCache, decode_jwt
+
+
+def make_token(**claims) -> str:
+    return jwt.encode(
+        {"sub": str(uuid.uuid4()), "role": "internal", **claims},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+def test_decode_jwt_serves_repeated_tokens_from_cache(monkeypatch):
+    monkeypatch.setattr(security, "token_cache", TokenCache(max_size=10, ttl=60))
+    token = make_token()
+    hits = sample("bee_customers_token_cache_hits_total")
+    misses = sample("bee_customers_token_cache_misses_total")
+
+    first = decode_jwt(token)
+    second = decode_jwt(token)
+
+    assert first == second
+    assert sample("bee_customers_token_cache_misses_total") == misses + 1
+    assert sample("bee_customers_token_cache_hits_total") == hits + 1
+
+
+def test_cached_token_is_rejected_after_exp(monkeypatch):
+    cache = TokenCache(max_size=10, ttl=60)
+    monkeypatch.setattr(security, "token_cache", cache)
+    exp = int(time.time()) - 1
+    token = make_token(exp=exp)
+    # Claims cached while the token was still valid
+    cache.set(token, {"sub": "cached", "exp": exp})
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_jwt(token)
+    assert exc_info.value.detail == "Token has expired"
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.set("a", {"sub": "a"})
+    cache.set("b", {"sub": "b"})
+    cache.get("a")
+    cache.set("c", {"sub": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"sub": "a"}
+    assert cache.get("c") == {"sub": "c"}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.singleflight import SingleFlight
+
+
+def coalesced(name):
+    return REGISTRY.get_sample_value(
+        "bee_customers_singleflight_coalesced_total", {"name": name}
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test_share")
+    calls = 0
+    release = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "profile"
+
+    callers = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["profile"] * 5
+    assert calls == 1
+    assert coalesced("test_share") == 4
+
+    # Finished calls are not reused
+    assert await flight.do("key", load) == "profile"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_with_waiting_callers():
+    flight = SingleFlight("test_error")
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        raise RuntimeError("database down")
+
+    callers = [asyncio.create_task(flight.do("key", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiting_callers_retry_when_the_leader_is_cancelled():
+    flight = SingleFlight("test_cancel")
+    calls = 0
+    started = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        started.set()
+        if calls == 1:
+            await asyncio.sleep(60)
+        return "profile"
+
+    leader = asyncio.create_task(flight.do("key", load))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "profile"
+    assert calls == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
@@ -0,0 +1,82 @@
+import logging
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.http_client import _InstrumentedTransport
+from app.core.tracing import TraceIdLogFilter, trace_id_var
+
+
+def customer_payload() -> dict:
+    return {
+        "user_id": str(uuid.uuid4()),
+        "business_id": str(uuid.uuid4()),
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "0712345678",
+    }
+
+
+@pytest.mark.asyncio
+async def test_trace_id_is_echoed_and_stored_with_events(
+    async_client, db_session, internal_headers
+):
+    from app.models.event_outbox import EventOutbox
+
+    trace_id = f"trace-{uuid.uuid4().hex}"
+    resp = await async_client.post(
+        "/api/customers/",
+        json=customer_payload(),
+        headers={**internal_headers, "X-Trace-Id": trace_id},
+    )
+    assert resp.status_code == 201
+    assert resp.headers["X-Trace-Id"] == trace_id
+
+    result = await db_session.execute(
+        select(EventOutbox).where(EventOutbox.event_name == "v1.customer.created")
+    )
+    event = next(e for e in result.scalars() if e.payload["id"] == resp.json()["id"])
+    assert event.trace_id == trace_id
+    assert event.payload["trace_id"] == trace_id
+
+
+@pytest.mark.asyncio
+async def test_missing_or_invalid_trace_id_is_replaced(async_client):
+    resp = await async_client.get("/health")
+    generated = resp.headers["X-Trace-Id"]
+    assert uuid.UUID(generated)
+
+    resp = await async_client.get("/health", headers={"X-Trace-Id": "bad id\twith spaces"})
+    assert resp.headers["X-Trace-Id"] not in ("bad id\twith spaces", generated)
+
+
+def test_log_filter_adds_current_trace_id():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+    token = trace_id_var.set("trace-log")
+    try:
+        TraceIdLogFilter().filter(record)
+    finally:
+        trace_id_var.reset(token)
+    assert record.trace_id == "trace-log"
+
+
+@pytest.mark.asyncio
+async def test_outbound_requests_carry_trace_id():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("X-Trace-Id"))
+        return httpx.Response(200)
+
+    transport = _InstrumentedTransport("http://auth.local", httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        token = trace_id_var.set("trace-out")
+        try:
+            await client.get("http://auth.local/api/users/1")
+        finally:
+            trace_id_var.reset(token)
+        await client.get("http://auth.local/api/users/1")
+
+    assert seen == ["trace-out", None]
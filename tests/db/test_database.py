@@ -0,0 +1,119 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.dependencies import get_read_db, get_write_db
+from app.db import database
+from app.db.database import (
+    InstrumentedAsyncPool,
+    ReadReplicas,
+    RecentWrites,
+    engine_options,
+)
+from app.schemas.user import User
+
+
+def test_pool_settings_are_applied_to_server_databases(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    options = engine_options("postgresql+asyncpg://user:pass@db/customers")
+    assert options["pool_size"] == 7
+    assert options["pool_pre_ping"] is True
+    assert "pool_size" not in engine_options("sqlite+aiosqlite:///./test.db")
+
+
+@pytest.mark.asyncio
+async def test_checkout_wait_is_recorded(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    waits = REGISTRY.get_sample_value("bee_customers_db_pool_checkout_wait_seconds_count")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert engine.pool.checkedout() == 1
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+    assert REGISTRY.get_sample_value("bee_customers_db_pool_checkout_wait_seconds_count") > waits
+
+
+def test_pool_gauges_are_exported():
+    assert REGISTRY.get_sample_value("bee_customers_db_pool_checked_out") is not None
+    assert REGISTRY.get_sample_value("bee_customers_db_pool_size") is not None
+
+
+def test_recent_writes_expire_after_window():
+    writes = RecentWrites(window=60)
+    user_id = uuid.uuid4()
+    assert not writes.active(user_id)
+    writes.record(user_id)
+    assert writes.active(user_id)
+
+    expired = RecentWrites(window=0)
+    expired.record(user_id)
+    assert not expired.active(user_id)
+
+
+@pytest.mark.asyncio
+async def test_read_replicas_fail_over_to_healthy_replica(tmp_path):
+    replicas = ReadReplicas(
+        [
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}",
+            f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        ],
+        retry_interval=60,
+    )
+    try:
+        for _ in range(3):
+            session = await replicas.open_session()
+            assert session.bind is replicas.engines[1]
+            await session.close()
+        assert replicas._down_until[0] > 0
+    finally:
+        await replicas.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_uses_primary_after_a_write(db_session, tmp_path, monkeypatch):
+    from app.models.customer import Customer
+
+    replicas = ReadReplicas([f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"])
+    monkeypatch.setattr(database, "read_replicas", replicas)
+    user = User(id=uuid.uuid4(), is_admin=True, role="admin")
+
+    async def read_session():
+        reads = get_read_db(db=db_session, user=user)
+        session = await reads.__anext__()
+        await reads.aclose()
+        return session
+
+    try:
+        assert (await read_session()) is not db_session
+
+        request = SimpleNamespace(state=SimpleNamespace(user=user))
+        await get_write_db(request, db_session)
+        db_session.add(
+            Customer(
+                id=uuid.uuid4(),
+                user_id=uuid.uuid4(),
+                business_id=uuid.uuid4(),
+                full_name="Replica Lag",
+                email="lag@example.com",
+                phone="0700000000",
+            )
+        )
+        await db_session.commit()
+
+        assert (await read_session()) is db_session
+    finally:
+        await replicas.dispose()
@@ -0,0 +1,45 @@
+import logging
+import uuid
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.db.instrumentation import fingerprint
+
+
+def test_fingerprint_replaces_literals_and_parameters():
+    statement = (
+        "SELECT customers.id FROM customers\n"
+        "WHERE customers.id IN (__[POSTCOMPILE_id_1]) AND customers.email = $1\n"
+        "  AND customers.full_name = 'Jane' LIMIT 10"
+    )
+    assert fingerprint(statement) == (
+        "SELECT customers.id FROM customers WHERE customers.id IN (?) "
+        "AND customers.email = ? AND customers.full_name = ? LIMIT ?"
+    )
+
+
+@pytest.mark.asyncio
+async def test_queries_are_timed_per_service_method(db_session, monkeypatch, caplog):
+    from app.services.customer_service import CustomerService
+
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+    caplog.set_level(logging.WARNING, logger="app.db.instrumentation")
+
+    await CustomerService(db_session).get_customer(uuid.uuid4())
+
+    samples = [
+        sample
+        for metric in REGISTRY.collect()
+        if metric.name == "bee_customers_db_query_duration_seconds"
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+        and sample.labels["source"] == "CustomerService.get_customer"
+    ]
+    assert samples and samples[0].value >= 1
+    assert samples[0].labels["fingerprint"].startswith("SELECT customers.id")
+
+    slow = [record for record in caplog.records if record.getMessage() == "Slow query"]
+    assert slow[-1].source == "CustomerService.get_customer"
+    assert slow[-1].parameter_count == 1
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services import auth_sync
+from app.services.auth_sync import AuthSyncQueue
+
+
+@pytest.mark.asyncio
+async def test_pending_updates_are_coalesced(monkeypatch):
+    calls = []
+
+    async def dummy_send(user_id, data):
+        calls.append((user_id, data))
+
+    monkeypatch.setattr(auth_sync, "send_profile_update", dummy_send)
+
+    user_id = uuid.uuid4()
+    queue = AuthSyncQueue()
+    queue.enqueue(user_id, {"email": "first@example.com"})
+    queue.enqueue(user_id, {"phone": "0799999999"})
+    queue.enqueue(user_id, {"email": "last@example.com"})
+    await queue.flush()
+
+    assert calls == [(user_id, {"email": "last@example.com", "phone": "0799999999"})]
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_retried(monkeypatch):
+    calls = []
+
+    async def flaky_send(user_id, data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise ConnectionError("auth service down")
+
+    monkeypatch.setattr(auth_sync, "send_profile_update", flaky_send)
+
+    queue = AuthSyncQueue(max_retries=3, retry_backoff=0)
+    queue.enqueue(uuid.uuid4(), {"email": "a@example.com"})
+    await queue.flush()
+    await queue.flush()
+
+    assert calls == [{"email": "a@example.com"}, {"email": "a@example.com"}]
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_undelivered_sync_is_persisted(monkeypatch):
+    persisted = []
+
+    async def failing_send(user_id, data):
+        raise ConnectionError("auth service down")
+
+    async def dummy_persist(self, changes):
+        persisted.append(changes)
+
+    monkeypatch.setattr(auth_sync, "send_profile_update", failing_send)
+    monkeypatch.setattr(AuthSyncQueue, "_persist", dummy_persist)
+
+    user_id = uuid.uuid4()
+    queue = AuthSyncQueue(max_retries=1, retry_backoff=60)
+    queue.enqueue(user_id, {"phone": "0799999999"})
+    await queue.flush()
+    queue.enqueue(user_id, {"email": "b@example.com"})
+    await queue.stop()
+
+    assert persisted == [{user_id: {"phone": "0799999999", "email": "b@example.com"}}]
+
+
+@pytest.mark.asyncio
+async def test_sync_in_flight_at_stop_is_persisted(monkeypatch):
+    persisted = []
+    started = asyncio.Event()
+
+    async def hanging_send(user_id, data):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def dummy_persist(self, changes):
+        persisted.append(changes)
+
+    monkeypatch.setattr(auth_sync, "send_profile_update", hanging_send)
+    monkeypatch.setattr(AuthSyncQueue, "_persist", dummy_persist)
+
+    user_id = uuid.uuid4()
+    queue = AuthSyncQueue()
+    queue.enqueue(user_id, {"phone": "0799999999", "email": "a@example.com"})
+    await started.wait()
+    queue.enqueue(user_id, {"email": "b@example.com"})
+    await queue.stop()
+
+    assert persisted == [{user_id: {"phone": "0799999999", "email": "b@example.com"}}]
+
+
+class ScriptRedis:
+    def __init__(self):
+        self.calls = []
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self.calls.append((numkeys, keys_and_args))
+
+    async def close(self, close_connection_pool=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_persist_merges_all_changes_in_one_call(monkeypatch):
+    client = ScriptRedis()
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://test")
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+
+    first, second = uuid.uuid4(), uuid.uuid4()
+    queue = AuthSyncQueue(persist_key="pending")
+    await queue._persist({first: {"email": "a@example.com"}})
+    await queue._persist({second: {"phone": "0799999999"}})
+    await queue.stop()
+
+    assert client.calls == [
+        (1, ("pending", str(first), json.dumps({"email": "a@example.com"}))),
+        (1, ("pending", str(second), json.dumps({"phone": "0799999999"}))),
+    ]
@@ -0,0 +1,154 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate, Gender
+from app.services.customer_cache import CustomerCache, get_customer_cache
+from app.services.customer_service import CustomerService
+from app.services.gdpr_service import GDPRService
+
+
+def make_profile():
+    now = datetime.utcnow()
+    return CustomerResponse(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        business_id=uuid.uuid4(),
+        full_name="Cached User",
+        email="cached@example.com",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def close(self, close_connection_pool=None):
+        pass
+
+
+def requests(result):
+    return REGISTRY.get_sample_value(
+        "bee_customers_customer_cache_requests_total", {"result": result}
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_local_cache_evicts_least_recently_used():
+    cache = CustomerCache(max_size=2)
+    first, second, third = make_profile(), make_profile(), make_profile()
+    for profile in (first, second):
+        await cache.set(profile, cache.version(profile.id))
+    assert await cache.get(first.id) == first
+    await cache.set(third, cache.version(third.id))
+
+    assert await cache.get(second.id) is None
+    assert await cache.get(first.id) == first
+    assert await cache.get(third.id) == third
+
+
+@pytest.mark.asyncio
+async def test_fill_racing_an_invalidation_is_discarded():
+    cache = CustomerCache()
+    profile = make_profile()
+    version = cache.version(profile.id)
+    await cache.invalidate(profile.id)
+    await cache.set(profile, version)
+    assert await cache.get(profile.id) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_fills_other_workers_and_publishes_invalidations(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+    writer = CustomerCache("redis://test", channel="invalidations")
+    reader = CustomerCache("redis://test", channel="invalidations")
+    profile = make_profile()
+
+    await writer.set(profile, writer.version(profile.id))
+    redis_hits = requests("redis_hit")
+    assert await reader.get(profile.id) == profile
+    assert requests("redis_hit") == redis_hits + 1
+
+    await writer.invalidate(profile.id)
+    assert client.published == [("invalidations", str(profile.id))]
+    # The listener of the other worker drops its local copy on the message
+    reader.discard(profile.id)
+    assert await reader.get(profile.id) is None
+
+
+@pytest.mark.asyncio
+async def test_profile_reads_are_cached_and_invalidated_on_write(db_session):
+    service = CustomerService(db_session)
+    data = CustomerCreate(
+        user_id=uuid.uuid4(),
+        business_id=uuid.uuid4(),
+        full_name="Profile User",
+        email="profile@example.com",
+        phone="0712345678",
+        gender=Gender.FEMALE,
+        avatar_url=None,
+    )
+    customer = await service.create_customer(data, "trace")
+
+    misses, hits = requests("miss"), requests("local_hit")
+    assert (await service.get_customer_profile(customer.id)).full_name == "Profile User"
+    assert (await service.get_customer_profile(customer.id)).full_name == "Profile User"
+    assert requests("miss") == misses + 1
+    assert requests("local_hit") == hits + 1
+
+    await service.update_customer(customer.id, CustomerUpdate(full_name="Renamed User"), "trace")
+    assert (await service.get_customer_profile(customer.id)).full_name == "Renamed User"
+
+    await GDPRService(db_session).delete_customer_data(customer.user_id, customer.business_id)
+    assert await service.get_customer_profile(customer.id) is None
+    assert customer.id not in get_customer_cache()._entries
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profile_reads_share_one_query(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    data = CustomerCreate(
+        user_id=uuid.uuid4(),
+        business_id=uuid.uuid4(),
+        full_name="Busy Profile",
+        email="busy@example.com",
+        phone="0712345678",
+        gender=Gender.MALE,
+        avatar_url=None,
+    )
+    customer = await service.create_customer(data, "trace")
+
+    queries = 0
+    get_customer = service.get_customer
+
+    async def counting_get_customer(customer_id):
+        nonlocal queries
+        queries += 1
+        return await get_customer(customer_id)
+
+    monkeypatch.setattr(service, "get_customer", counting_get_customer)
+    profiles = await asyncio.gather(
+        *(service.get_customer_profile(customer.id) for _ in range(5))
+    )
+
+    assert queries == 1
+    assert {profile.full_name for profile in profiles} == {"Busy Profile"}
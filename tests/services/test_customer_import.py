@@ -0,0 +1,121 @@
+import asyncio
+import csv
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.schemas.customer import CustomerImportJob, ImportStatus
+from app.services.customer_import import (
+    CustomerImporter,
+    detect_format,
+    read_records,
+    validate_chunk,
+)
+
+
+def test_detect_format():
+    assert detect_format("customers.CSV", None) == "csv"
+    assert detect_format("upload", "application/x-ndjson") == "ndjson"
+    assert detect_format("customers.xlsx", "application/octet-stream") is None
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_writes_chunks_and_reports_rejected_rows(db_session, tmp_path):
+    business_id = str(uuid.uuid4())
+    duplicate_user = str(uuid.uuid4())
+    lines = [
+        json.dumps({"user_id": str(uuid.uuid4()), "full_name": "Ana Pop", "email": "ana@example.com"}),
+        json.dumps({"user_id": duplicate_user, "full_name": "Ion Pop", "email": "ion@example.com"}),
+        "{not json",
+        "",
+        json.dumps({"user_id": duplicate_user, "full_name": "Ion Again", "email": "ion@example.com"}),
+        json.dumps({"user_id": str(uuid.uuid4()), "full_name": "Bad Phone", "email": "b@example.com", "phone": "123"}),
+    ]
+    path = tmp_path / "customers.ndjson"
+    path.write_text("\n".join(lines) + "\n")
+    report_path = tmp_path / "errors.csv"
+    job = CustomerImportJob(id="test", format="ndjson", started_at=datetime.utcnow())
+
+    await CustomerImporter(job, str(path), str(report_path), business_id, chunk_size=2).run()
+
+    assert job.status == ImportStatus.COMPLETED
+    assert (job.rows_processed, job.created, job.conflicts, job.invalid) == (5, 2, 1, 2)
+    assert job.bytes_processed == job.bytes_total == path.stat().st_size
+    with report_path.open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["line"] for row in rows] == ["3", "5", "6"]
+    assert rows[1]["error"] == "Customer already exists"
+    assert rows[2]["error"].startswith("phone:")
+
+
+def test_csv_rows_are_split_by_the_reader_and_parsed_by_validate_chunk(tmp_path):
+    path = tmp_path / "customers.csv"
+    user_id = str(uuid.uuid4())
+    path.write_text(
+        "\ufeffuser_id,full_name,email\n"
+        "\n"
+        f'{user_id},"Pop, ""Ana""\nMaria",ana@example.com\n'
+        "not-a-uuid,Ion,ion@example.com\n"
+    )
+    job = CustomerImportJob(id="test", format="csv", started_at=datetime.utcnow())
+
+    with path.open("rb") as handle:
+        header, records = read_records(handle, "csv", job)
+        records = list(records)
+
+    assert header == ["user_id", "full_name", "email"]
+    # The quoted newline keeps the first row on lines 3-4
+    assert [line for line, _ in records] == [4, 5]
+    assert records[0][1] == [user_id, 'Pop, "Ana"\nMaria', "ana@example.com"]
+
+    valid, errors = validate_chunk(records, str(uuid.uuid4()), header)
+    assert [(line, customer.full_name) for line, customer in valid] == [(4, 'Pop, "Ana"\nMaria')]
+    assert [line for line, _ in errors] == [5]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_with_stray_quote_keeps_following_rows(db_session, tmp_path):
+    path = tmp_path / "customers.csv"
+    rows = ["user_id,full_name,email"]
+    rows.append(f'{uuid.uuid4()},John "Johnny,john@example.com')
+    rows.extend(f"{uuid.uuid4()},User {index},user{index}@example.com" for index in range(5))
+    rows.append("not-a-uuid,Bad,bad@example.com")
+    path.write_text("\n".join(rows) + "\n")
+    report_path = tmp_path / "errors.csv"
+    job = CustomerImportJob(id="test", format="csv", started_at=datetime.utcnow())
+
+    await CustomerImporter(
+        job, str(path), str(report_path), str(uuid.uuid4()), chunk_size=2
+    ).run()
+
+    assert job.status == ImportStatus.COMPLETED
+    assert (job.rows_processed, job.created, job.conflicts, job.invalid) == (7, 6, 0, 1)
+    with report_path.open() as handle:
+        assert [row["line"] for row in csv.DictReader(handle)] == ["8"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_import_is_marked_failed(tmp_path, monkeypatch):
+    path = tmp_path / "customers.ndjson"
+    path.write_text("\n".join(json.dumps({"n": i}) for i in range(10)) + "\n")
+    job = CustomerImportJob(id="test", format="ndjson", started_at=datetime.utcnow())
+    importer = CustomerImporter(job, str(path), str(tmp_path / "errors.csv"), chunk_size=2)
+    writing = asyncio.Event()
+
+    async def hanging_write(self, validated, report):
+        writing.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(CustomerImporter, "_write", hanging_write)
+
+    task = asyncio.create_task(importer.run())
+    await writing.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert job.status == ImportStatus.FAILED
+    assert job.error == "Import cancelled"
+    assert job.finished_at is not None
@@ -2,7 +2,9 @@ import uuid
 import pytest
 import httpx
 from pydantic import ValidationError
+from app.services.auth_sync import get_auth_sync_queue
 from app.services.customer_service import CustomerService
+from app.services.outbox import OutboxRelay
 from app.schemas.customer import CustomerCreate, CustomerUpdate, Gender
 
 
@@ -68,6 +70,9 @@ async def test_create_customer_emits_event(db_session, monkeypatch):
     )
 
     created = await service.create_customer(data, "trace123")
+    assert captured == []
+
+    await OutboxRelay().relay_once()
 
     assert len(captured) == 1
     name, payload, trace_id = captured[0]
@@ -93,6 +98,7 @@ async def test_update_customer_emits_event(db_session, monkeypatch):
         avatar_url=None,
     )
     customer = await service.create_customer(data, "init")
+    await OutboxRelay().relay_once()
 
     captured = []
 
@@ -103,6 +109,7 @@ async def test_update_customer_emits_event(db_session, monkeypatch):
 
     update_data = CustomerUpdate(full_name="New Name")
     await service.update_customer(customer.id, update_data, "trace_update")
+    await OutboxRelay().relay_once()
 
     assert len(captured) == 1
     name, payload, trace_id = captured[0]
@@ -178,6 +185,9 @@ async def test_auth_service_called_on_email_change(db_session, monkeypatch):
     monkeypatch.setattr(httpx, "patch", dummy_patch)
 
     await service.update_customer(customer_id, CustomerUpdate(email="new@example.com"), "trace")
+    assert called == []
+
+    await get_auth_sync_queue().flush()
 
     assert len(called) == 1
     url, data = called[0]
@@ -203,6 +213,9 @@ async def test_auth_service_called_on_phone_change(db_session, monkeypatch):
     monkeypatch.setattr(httpx, "patch", dummy_patch)
 
     await service.update_customer(customer_id, CustomerUpdate(phone="0799999999"), "trace")
+    assert called == []
+
+    await get_auth_sync_queue().flush()
 
     assert len(called) == 1
     url, data = called[0]
@@ -230,3 +243,148 @@ async def test_create_duplicate_customer_returns_value_error(db_session):
 
     with pytest.raises(ValueError):
         await service.create_customer(data, "trace")
+
+
+@pytest.mark.asyncio
+async def test_get_customers_page_walks_all_pages(db_session):
+    service = CustomerService(db_session)
+    business_id = uuid.uuid4()
+    created = []
+    for index in range(5):
+        data = CustomerCreate(
+            user_id=uuid.uuid4(),
+            business_id=business_id,
+            full_name=f"Page User {index}",
+            email=f"page{index}@example.com",
+            phone="0712345678",
+            gender=Gender.FEMALE,
+            avatar_url=None,
+        )
+        created.append((await service.create_customer(data, "trace")).id)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await service.get_customers_page(2, business_id, cursor=cursor)
+        seen.extend(customer.id for customer in page)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+    offset_ids = [c.id for c in await service.get_customers(0, 10, business_id)]
+    assert offset_ids == seen
+
+
+@pytest.mark.asyncio
+async def test_get_customers_page_rejects_invalid_cursor(db_session):
+    service = CustomerService(db_session)
+    with pytest.raises(ValueError):
+        await service.get_customers_page(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_customers_search_treats_wildcards_literally(db_session):
+    service = CustomerService(db_session)
+    business_id = uuid.uuid4()
+    for name in ("Ana 100% Pop", "Ana 1000 Pop"):
+        data = CustomerCreate(
+            user_id=uuid.uuid4(),
+            business_id=business_id,
+            full_name=name,
+            email="ana@example.com",
+            phone="0712345678",
+            gender=Gender.FEMALE,
+            avatar_url=None,
+        )
+        await service.create_customer(data, "trace")
+
+    found = await service.get_customers(0, 10, business_id, "100%")
+    assert [c.full_name for c in found] == ["Ana 100% Pop"]
+    assert len(await service.get_customers(0, 10, business_id, "ana")) == 2
+
+
+@pytest.mark.asyncio
+async def test_lookup_customer_by_normalized_contact(db_session):
+    service = CustomerService(db_session)
+    business_id = uuid.uuid4()
+    data = CustomerCreate(
+        user_id=uuid.uuid4(),
+        business_id=business_id,
+        full_name="Lookup User",
+        email="Lookup.User@Example.com",
+        phone="0712345678",
+        gender=Gender.MALE,
+        avatar_url=None,
+    )
+    customer = await service.create_customer(data, "trace")
+    assert customer.phone_e164 == "+40712345678"
+    assert customer.email_normalized == "lookup.user@example.com"
+
+    assert (await service.lookup_customer(business_id, phone="+40 712 345 678")).id == customer.id
+    assert (await service.lookup_customer(business_id, email="LOOKUP.user@example.com")).id == customer.id
+    assert await service.lookup_customer(uuid.uuid4(), phone="0712345678") is None
+    assert await service.lookup_customer(business_id, phone="not a phone") is None
+
+    await service.update_customer(customer.id, CustomerUpdate(phone="0722000000"), "trace")
+    assert await service.lookup_customer(business_id, phone="0712345678") is None
+    assert (await service.lookup_customer(business_id, phone="+40722000000")).id == customer.id
+
+
+@pytest.mark.asyncio
+async def test_create_customers_reports_conflicts_and_stages_events(db_session):
+    from sqlalchemy import select
+    from app.models.event_outbox import EventOutbox
+
+    service = CustomerService(db_session)
+    business_id = uuid.uuid4()
+    existing = await service.create_customer(
+        CustomerCreate(
+            user_id=uuid.uuid4(),
+            business_id=business_id,
+            full_name="Existing User",
+            email="existing@example.com",
+            gender=Gender.MALE,
+        ),
+        "trace",
+    )
+    batch = [
+        CustomerCreate(
+            user_id=uuid.uuid4(),
+            business_id=business_id,
+            full_name=f"Bulk User {index}",
+            email=f"Bulk{index}@Example.com",
+            phone="0712345678",
+        )
+        for index in range(3)
+    ]
+    batch.append(batch[0])
+    batch.append(
+        CustomerCreate(
+            user_id=existing.user_id,
+            business_id=business_id,
+            full_name="Existing Again",
+            email="existing@example.com",
+        )
+    )
+
+    result = await service.create_customers(batch, "bulk-trace")
+
+    assert [row.index for row in result.created] == [0, 1, 2]
+    assert [(row.index, row.reason) for row in result.conflicts] == [
+        (3, "Duplicate in batch"),
+        (4, "Customer already exists"),
+    ]
+    created = await service.get_customer(result.created[1].id)
+    assert created.full_name == "Bulk User 1"
+    assert created.email_normalized == "bulk1@example.com"
+    assert created.phone_e164 == "+40712345678"
+
+    events = (
+        await db_session.execute(
+            select(EventOutbox).where(EventOutbox.trace_id == "bulk-trace")
+        )
+    ).scalars().all()
+    assert sorted(event.payload["id"] for event in events) == sorted(
+        str(row.id) for row in result.created
+    )
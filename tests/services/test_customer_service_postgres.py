@@ -0,0 +1,100 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.database import Base
+from app.models.event_outbox import EventOutbox
+from app.schemas.customer import CustomerCreate
+from app.services.customer_service import CustomerService
+
+POSTGRESQL_URL = os.getenv("TEST_POSTGRESQL_URL")
+
+pytestmark = [
+    pytest.mark.postgresql,
+    pytest.mark.skipif(not POSTGRESQL_URL, reason="TEST_POSTGRESQL_URL is not set"),
+]
+
+
+def make_batch(business_id: uuid.UUID, size: int, prefix: str = "copy"):
+    return [
+        CustomerCreate(
+            user_id=uuid.uuid4(),
+            business_id=business_id,
+            full_name=f"Copy User {index}",
+            email=f"{prefix}{index}@Example.com",
+            phone="0712345678",
+        )
+        for index in range(size)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_customers_copies_through_staging_table(monkeypatch):
+    import app.models.customer  # noqa: F401
+    import app.models.customer_tag  # noqa: F401
+
+    # Tables are created in a throwaway database next to the configured one
+    url = make_url(POSTGRESQL_URL)
+    database = f"test_copy_{uuid.uuid4().hex[:12]}"
+    admin = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    async with admin.connect() as conn:
+        await conn.execute(text(f"CREATE DATABASE {database}"))
+    engine = create_async_engine(url.set(database=database))
+    monkeypatch.setattr(settings, "BULK_COPY_THRESHOLD", 3)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.run_sync(Base.metadata.create_all)
+
+        business_id = uuid.uuid4()
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            service = CustomerService(session)
+            existing = make_batch(business_id, 1, "existing")[0]
+            assert len((await service.create_customers([existing])).created) == 1
+
+            batch = make_batch(business_id, 4)
+            batch.append(
+                CustomerCreate(
+                    user_id=existing.user_id,
+                    business_id=business_id,
+                    full_name="Existing Again",
+                    email="existing@example.com",
+                )
+            )
+            result = await service.create_customers(batch, "copy-trace")
+            # The staging table is dropped on commit, so a second COPY can recreate it
+            again = await service.create_customers(make_batch(business_id, 3, "again"))
+
+        assert [row.index for row in result.created] == [0, 1, 2, 3]
+        assert [(row.index, row.reason) for row in result.conflicts] == [
+            (4, "Customer already exists")
+        ]
+        assert len(again.created) == 3
+
+        async with AsyncSession(engine) as session:
+            service = CustomerService(session)
+            created = await service.get_customer(result.created[2].id)
+            assert created.full_name == "Copy User 2"
+            assert created.email_normalized == "copy2@example.com"
+            assert created.phone_e164 == "+40712345678"
+            events = (
+                await session.execute(
+                    select(EventOutbox).where(EventOutbox.trace_id == "copy-trace")
+                )
+            ).scalars().all()
+            assert sorted(event.payload["id"] for event in events) == sorted(
+                str(row.id) for row in result.created
+            )
+            assert all(event.attempts == 0 for event in events)
+            total = await session.scalar(select(func.count()).select_from(EventOutbox))
+            assert total == 1 + 4 + 3
+    finally:
+        await engine.dispose()
+        async with admin.connect() as conn:
+            await conn.execute(text(f"DROP DATABASE {database}"))
+        await admin.dispose()
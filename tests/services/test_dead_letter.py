@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from app.services.dead_letter import DeadLetterStore
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.available = True
+        self.calls = 0
+        self.lists = {}
+
+    async def rpush(self, key, *values):
+        self.calls += 1
+        if not self.available:
+            raise ConnectionError("redis down")
+        self.lists.setdefault(key, []).extend(values)
+
+    async def close(self, close_connection_pool=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_store_writes_event(monkeypatch):
+    client = FlakyRedis()
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+
+    store = DeadLetterStore("redis://test")
+    await store.store("fail.event", {"foo": "bar"}, "trace")
+
+    data = json.loads(client.lists["failed_events"][0])
+    assert data == {"event": "fail.event", "payload": {"foo": "bar"}, "trace_id": "trace"}
+
+
+@pytest.mark.asyncio
+async def test_events_spill_while_redis_is_down(monkeypatch):
+    client = FlakyRedis()
+    client.available = False
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+
+    store = DeadLetterStore("redis://test", retry_interval=60)
+    for i in range(3):
+        await store.store("fail.event", {"n": i}, "trace")
+
+    # Only the first event hits Redis; the rest wait for the retry interval
+    assert client.calls == 1
+    assert "failed_events" not in client.lists
+
+    client.available = True
+    assert await store.flush(force=True) == 3
+    stored = [json.loads(v)["payload"]["n"] for v in client.lists["failed_events"]]
+    assert stored == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_spill_buffer_drops_oldest_events(monkeypatch):
+    client = FlakyRedis()
+    client.available = False
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+
+    store = DeadLetterStore("redis://test", spill_size=2, retry_interval=60)
+    for i in range(4):
+        await store.store("fail.event", {"n": i}, "trace")
+
+    client.available = True
+    await store.close()
+    stored = [json.loads(v)["payload"]["n"] for v in client.lists["failed_events"]]
+    assert stored == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_store_now_reports_whether_redis_accepted(monkeypatch):
+    client = FlakyRedis()
+    client.available = False
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+
+    store = DeadLetterStore("redis://test", retry_interval=0)
+    assert await store.store_now("fail.event", {"n": 1}, "trace") is False
+    # Nothing is kept in the spill buffer; the caller still owns the event
+    client.available = True
+    assert await store.flush(force=True) == 0
+
+    assert await store.store_now("fail.event", {"n": 2}, "trace") is True
+    assert [json.loads(v)["payload"]["n"] for v in client.lists["failed_events"]] == [2]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_the_store_of_every_loop(monkeypatch):
+    import asyncio
+
+    from app.services import dead_letter
+    from app.services.event_publisher import _background
+
+    client = FlakyRedis()
+    client.available = False
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+    monkeypatch.setattr(dead_letter.settings, "REDIS_URL", "redis://test")
+
+    async def store_in_background():
+        await dead_letter.get_dead_letter_store().store("sync.event", {}, "trace")
+
+    await asyncio.to_thread(_background.run, store_in_background())
+    await dead_letter.get_dead_letter_store().store("api.event", {}, "trace")
+    assert len(dead_letter._stores) == 2
+
+    client.available = True
+    await dead_letter.close_dead_letter_store()
+
+    assert dead_letter._stores == {}
+    events = sorted(json.loads(value)["event"] for value in client.lists["failed_events"])
+    assert events == ["api.event", "sync.event"]
@@ -1,9 +1,10 @@
+import asyncio
 import json
 
 import pytest
 import aio_pika
 
-from app.services.event_publisher import publish_event
+from app.services.event_publisher import close_publisher, publish_event, publish_events
 from app.core.config import settings
 
 
@@ -22,7 +23,7 @@ async def test_publish_event(monkeypatch):
             return DummyExchange()
 
     class DummyConnection:
-        async def channel(self):
+        async def channel(self, **kwargs):
             return DummyChannel()
 
         async def close(self):
@@ -38,17 +39,102 @@ async def test_publish_event(monkeypatch):
 
     assert published["routing_key"] == "test.event"
     assert published["body"] == json.dumps({"foo": "bar"})
+    assert "closed" not in published
+
+    await close_publisher()
     assert published["closed"] is True
 
 
+@pytest.mark.asyncio
+async def test_publish_event_reuses_connection_and_channel(monkeypatch):
+    counts = {"connections": 0, "channels": 0, "declares": 0, "published": 0}
+
+    class DummyExchange:
+        async def publish(self, message: aio_pika.Message, routing_key: str):
+            counts["published"] += 1
+
+    class DummyChannel:
+        is_closed = False
+
+        async def declare_exchange(self, name: str, type: aio_pika.ExchangeType, durable: bool = True):
+            counts["declares"] += 1
+            return DummyExchange()
+
+    class DummyConnection:
+        is_closed = False
+
+        async def channel(self, **kwargs):
+            counts["channels"] += 1
+            return DummyChannel()
+
+        async def close(self):
+            self.is_closed = True
+
+    async def dummy_connect(url: str):
+        counts["connections"] += 1
+        return DummyConnection()
+
+    monkeypatch.setattr(aio_pika, "connect_robust", dummy_connect)
+
+    for i in range(5):
+        await publish_event("test.event", {"n": i}, "trace")
+    await close_publisher()
+
+    assert counts == {"connections": 1, "channels": 1, "declares": 1, "published": 5}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_events_share_one_confirmed_batch(monkeypatch):
+    state = {"in_flight": 0, "max_in_flight": 0, "routing_keys": [], "confirms": None}
+
+    class DummyExchange:
+        async def publish(self, message: aio_pika.Message, routing_key: str):
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            state["routing_keys"].append(routing_key)
+
+    class DummyChannel:
+        is_closed = False
+
+        async def declare_exchange(self, name: str, type: aio_pika.ExchangeType, durable: bool = True):
+            return DummyExchange()
+
+    class DummyConnection:
+        is_closed = False
+
+        async def channel(self, publisher_confirms: bool = True):
+            state["confirms"] = publisher_confirms
+            return DummyChannel()
+
+        async def close(self):
+            self.is_closed = True
+
+    async def dummy_connect(url: str):
+        return DummyConnection()
+
+    monkeypatch.setattr(aio_pika, "connect_robust", dummy_connect)
+
+    outcomes = await publish_events(
+        (f"test.event.{i}", {"n": i}, "trace") for i in range(10)
+    )
+    await close_publisher()
+
+    assert outcomes == [None] * 10
+    assert state["confirms"] is True
+    assert state["max_in_flight"] == 10
+    assert sorted(state["routing_keys"]) == sorted(f"test.event.{i}" for i in range(10))
+
+
 def test_publish_event_failure_stored(monkeypatch):
     stored = []
 
     class DummyRedis:
-        def rpush(self, key, value):
-            stored.append((key, value))
+        async def rpush(self, key, *values):
+            stored.extend((key, value) for value in values)
 
-    monkeypatch.setattr("redis.from_url", lambda url: DummyRedis())
+    monkeypatch.setattr("redis.asyncio.from_url", lambda url: DummyRedis())
 
     async def dummy_connect(url: str):
         raise Exception("connection failed")
@@ -66,3 +152,41 @@ def test_publish_event_failure_stored(monkeypatch):
     assert data["event"] == "fail.event"
     assert data["payload"] == {"foo": "bar"}
     assert data["trace_id"] == "trace123"
+
+
+@pytest.mark.asyncio
+async def test_close_publisher_closes_the_background_loop_publisher(monkeypatch):
+    from app.services import event_publisher
+
+    closed = []
+
+    class DummyExchange:
+        async def publish(self, message: aio_pika.Message, routing_key: str):
+            pass
+
+    class DummyChannel:
+        async def declare_exchange(self, name, type, durable=True):
+            return DummyExchange()
+
+    class DummyConnection:
+        async def channel(self, **kwargs):
+            return DummyChannel()
+
+        async def close(self):
+            closed.append(asyncio.get_running_loop())
+
+    async def dummy_connect(url: str):
+        return DummyConnection()
+
+    monkeypatch.setattr(aio_pika, "connect_robust", dummy_connect)
+
+    await publish_event("api.event", {}, "trace")
+    await asyncio.to_thread(event_publisher.publish_event_sync, "sync.event", {}, "trace")
+    assert len(event_publisher._publishers) == 2
+
+    await close_publisher()
+
+    assert event_publisher._publishers == {}
+    assert len(closed) == 2
+    assert asyncio.get_running_loop() in closed
+    assert event_publisher._background._loop in closed
@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services import log_service
+from app.services.log_service import LogShipper
+
+
+@pytest.mark.asyncio
+async def test_entries_are_shipped_in_one_batch(monkeypatch):
+    posts = []
+
+    async def dummy_post(url, body):
+        posts.append((url, body))
+
+    monkeypatch.setattr(log_service, "_post", dummy_post)
+
+    shipper = LogShipper("http://logs/entry", batch_url="http://logs/batch", batch_size=3)
+    for i in range(3):
+        shipper.enqueue({"event": "e", "data": {"n": i}, "trace_id": "t"})
+    await asyncio.sleep(0.01)
+
+    assert len(posts) == 1
+    url, body = posts[0]
+    assert url == "http://logs/batch"
+    assert [entry["data"]["n"] for entry in body] == [0, 1, 2]
+    await shipper.stop()
+
+
+@pytest.mark.asyncio
+async def test_overflow_drops_oldest_and_stop_flushes(monkeypatch):
+    posts = []
+
+    async def dummy_post(url, body):
+        posts.append(body)
+
+    monkeypatch.setattr(log_service, "_post", dummy_post)
+
+    shipper = LogShipper("http://logs/entry", max_queue=2, batch_size=10, flush_interval=60)
+    for i in range(3):
+        shipper.enqueue({"n": i})
+    assert posts == []
+
+    await shipper.stop()
+    assert posts == [{"n": 1}, {"n": 2}]
+
+
+@pytest.mark.asyncio
+async def test_failed_entries_are_retried(monkeypatch):
+    attempts = []
+
+    async def flaky_post(url, body):
+        attempts.append(body)
+        if len(attempts) == 1:
+            raise ConnectionError("log service down")
+
+    monkeypatch.setattr(log_service, "_post", flaky_post)
+
+    shipper = LogShipper("http://logs/entry", retry_backoff=0)
+    shipper.enqueue({"n": 1})
+    await shipper.stop()
+
+    assert attempts == [{"n": 1}, {"n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_batch_in_flight(monkeypatch):
+    posts = []
+    started = asyncio.Event()
+
+    async def slow_post(url, body):
+        started.set()
+        await asyncio.sleep(0.05)
+        posts.append(body)
+
+    monkeypatch.setattr(log_service, "_post", slow_post)
+
+    shipper = LogShipper("http://logs/entry", batch_url="http://logs/batch", batch_size=2)
+    for i in range(3):
+        shipper.enqueue({"n": i})
+    await started.wait()
+    await shipper.stop()
+
+    assert [entry["n"] for body in posts for entry in body] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_is_put_back(monkeypatch):
+    started = asyncio.Event()
+
+    async def hanging_post(url, body):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(log_service, "_post", hanging_post)
+
+    shipper = LogShipper("http://logs/entry", batch_url="http://logs/batch", batch_size=2)
+    for i in range(3):
+        shipper.enqueue({"n": i})
+    await started.wait()
+    shipper._task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await shipper._task
+
+    assert [entry["n"] for entry in shipper._queue] == [0, 1, 2]
+
+
+def dropped_entries():
+    return REGISTRY.get_sample_value("bee_customers_log_shipper_dropped_total")
+
+
+@pytest.mark.asyncio
+async def test_stop_retries_without_backoff_and_counts_drops(monkeypatch):
+    attempts = []
+
+    async def failing_post(url, body):
+        attempts.append(body)
+        raise ConnectionError("log service down")
+
+    monkeypatch.setattr(log_service, "_post", failing_post)
+
+    shipper = LogShipper(
+        "http://logs/entry", batch_size=1, flush_interval=60, max_retries=3, retry_backoff=10
+    )
+    for i in range(5):
+        shipper.enqueue({"n": i})
+    dropped = dropped_entries()
+    await asyncio.wait_for(shipper.stop(), 1)
+
+    assert len(attempts) == 5 * 4
+    assert dropped_entries() - dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_stop_gives_up_at_the_deadline(monkeypatch):
+    async def hanging_post(url, body):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(log_service, "_post", hanging_post)
+
+    shipper = LogShipper(
+        "http://logs/entry", batch_url="http://logs/batch", batch_size=2, shutdown_timeout=0.05
+    )
+    for i in range(5):
+        shipper.enqueue({"n": i})
+    await asyncio.sleep(0)
+    dropped = dropped_entries()
+    await asyncio.wait_for(shipper.stop(), 1)
+
+    assert len(shipper._queue) == 0
+    assert shipper._task is None
+    assert dropped_entries() - dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_retries(monkeypatch):
+    from app.core import circuit_breaker
+
+    breaker = circuit_breaker.CircuitBreaker("log_service", 1, 60)
+    breaker.record_failure()
+    monkeypatch.setitem(circuit_breaker._breakers, "log_service", breaker)
+    attempts = []
+
+    async def rejected_post(url, body):
+        attempts.append(body)
+        raise circuit_breaker.CircuitOpenError("log_service")
+
+    monkeypatch.setattr(log_service, "_post", rejected_post)
+
+    shipper = LogShipper("http://logs/entry", max_retries=3, retry_backoff=10)
+    dropped = dropped_entries()
+    await asyncio.wait_for(shipper._ship([{"n": 1}]), 1)
+
+    assert attempts == [{"n": 1}]
+    assert dropped_entries() - dropped == 1
@@ -2,6 +2,7 @@ import uuid
 import pytest
 from app.services.note_service import NoteService
 from app.services.customer_service import CustomerService
+from app.services.outbox import OutboxRelay
 from app.schemas.note import NoteCreatePayload
 from app.schemas.customer import CustomerCreate, Gender
 
@@ -26,6 +27,7 @@ async def test_note_creation_emits_event(db_session, monkeypatch):
     customer_id = await create_customer(customer_service)
 
     note_service = NoteService(db_session)
+    await OutboxRelay().relay_once()
 
     captured = []
 
@@ -36,6 +38,7 @@ async def test_note_creation_emits_event(db_session, monkeypatch):
 
     payload = NoteCreatePayload(content="hello", created_by=uuid.uuid4())
     note = await note_service.create_customer_note(customer_id, payload, "trace123")
+    await OutboxRelay().relay_once()
 
     assert len(captured) == 1
     name, event_payload, trace_id = captured[0]
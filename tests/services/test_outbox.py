@@ -0,0 +1,174 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.models.event_outbox import EventOutbox
+from app.schemas.customer import CustomerCreate, Gender
+from app.services.customer_service import CustomerService
+from app.services.outbox import OutboxRelay
+
+
+def customer_data() -> CustomerCreate:
+    return CustomerCreate(
+        user_id=uuid.uuid4(),
+        business_id=uuid.uuid4(),
+        full_name="Outbox User",
+        email="outbox@example.com",
+        phone="0712345678",
+        gender=Gender.FEMALE,
+        avatar_url=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_event_written_in_same_transaction(db_session):
+    service = CustomerService(db_session)
+    customer = await service.create_customer(customer_data(), "trace_outbox")
+
+    result = await db_session.execute(select(EventOutbox))
+    entries = result.scalars().all()
+    assert len(entries) == 1
+    assert entries[0].event_name == "v1.customer.created"
+    assert entries[0].payload["id"] == str(customer.id)
+    assert entries[0].trace_id == "trace_outbox"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_customer_does_not_leave_event(db_session):
+    service = CustomerService(db_session)
+    data = customer_data()
+    await service.create_customer(data, "trace")
+
+    with pytest.raises(ValueError):
+        await service.create_customer(data, "trace")
+
+    result = await db_session.execute(select(EventOutbox))
+    assert len(result.scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_and_removes_events(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    await service.create_customer(customer_data(), "trace1")
+    await service.create_customer(customer_data(), "trace2")
+
+    captured = []
+
+    async def dummy_publish(event_name: str, payload: dict, trace_id: str):
+        captured.append((event_name, trace_id))
+
+    monkeypatch.setattr("app.services.event_publisher.publish_event", dummy_publish)
+
+    assert await OutboxRelay().relay_once() == 2
+    assert captured == [("v1.customer.created", "trace1"), ("v1.customer.created", "trace2")]
+    assert await OutboxRelay().relay_once() == 0
+
+    db_session.expire_all()
+    result = await db_session.execute(select(EventOutbox))
+    assert result.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_event_when_broker_fails(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    await service.create_customer(customer_data(), "trace")
+
+    async def failing_publish(event_name: str, payload: dict, trace_id: str):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr("app.services.event_publisher.publish_event", failing_publish)
+
+    assert await OutboxRelay().relay_once() == 0
+
+    db_session.expire_all()
+    result = await db_session.execute(select(EventOutbox))
+    entry = result.scalars().one()
+    assert entry.attempts == 1
+    assert entry.last_error == "broker down"
+
+
+@pytest.mark.asyncio
+async def test_failed_event_waits_for_backoff(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    await service.create_customer(customer_data(), "trace")
+
+    calls = []
+
+    async def failing_publish(event_name: str, payload: dict, trace_id: str):
+        calls.append(event_name)
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr("app.services.event_publisher.publish_event", failing_publish)
+
+    relay = OutboxRelay()
+    assert await relay.relay_once() == 0
+    # The retry is scheduled in the future, so the next poll skips it
+    assert await relay.relay_once() == 0
+    assert len(calls) == 1
+
+    db_session.expire_all()
+    entry = (await db_session.execute(select(EventOutbox))).scalars().one()
+    assert entry.attempts == 1
+    assert entry.next_attempt_at > entry.created_at
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_is_not_an_attempt(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    await service.create_customer(customer_data(), "trace")
+
+    async def rejected_publish(event_name: str, payload: dict, trace_id: str):
+        raise CircuitOpenError("rabbitmq")
+
+    monkeypatch.setattr("app.services.event_publisher.publish_event", rejected_publish)
+
+    relay = OutboxRelay(max_attempts=1)
+    for _ in range(3):
+        assert await relay.relay_once() == 0
+
+    db_session.expire_all()
+    entry = (await db_session.execute(select(EventOutbox))).scalars().one()
+    assert entry.attempts == 0
+
+
+class FakeDeadLetterStore:
+    def __init__(self, available: bool):
+        self.available = available
+        self.stored = []
+
+    async def store_now(self, event_name, payload, trace_id):
+        if self.available:
+            self.stored.append(event_name)
+        return self.available
+
+
+@pytest.mark.asyncio
+async def test_exhausted_event_kept_until_dead_letter_confirms(db_session, monkeypatch):
+    service = CustomerService(db_session)
+    await service.create_customer(customer_data(), "trace")
+
+    async def failing_publish(event_name: str, payload: dict, trace_id: str):
+        raise ConnectionError("broker down")
+
+    store = FakeDeadLetterStore(available=False)
+    monkeypatch.setattr("app.services.event_publisher.publish_event", failing_publish)
+    monkeypatch.setattr("app.services.outbox.get_dead_letter_store", lambda: store)
+
+    relay = OutboxRelay(max_attempts=1)
+    assert await relay.relay_once() == 0
+
+    db_session.expire_all()
+    entry = (await db_session.execute(select(EventOutbox))).scalars().one()
+    assert entry.attempts == 1
+
+    # Once Redis accepts the entry the row is removed without another publish
+    store.available = True
+    entry.next_attempt_at = entry.created_at
+    await db_session.commit()
+    assert await relay.relay_once() == 0
+    assert store.stored == ["v1.customer.created"]
+
+    db_session.expire_all()
+    assert (await db_session.execute(select(EventOutbox))).scalars().all() == []
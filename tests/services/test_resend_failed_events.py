@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from scripts.resend_failed_events import RateLimiter, resend_failed_events
+
+
+class FakeRedis:
+    def __init__(self, lists):
+        self.lists = {key: list(values) for key, values in lists.items()}
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def lpop(self, key, count):
+        values = self.lists.get(key, [])
+        popped, self.lists[key] = values[:count], values[count:]
+        return popped
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    async def close(self, close_connection_pool=None):
+        pass
+
+
+def entry(name, n):
+    return json.dumps({"event": name, "payload": {"n": n}, "trace_id": f"t{n}"}).encode()
+
+
+@pytest.fixture
+def replay_env(monkeypatch):
+    published = []
+    failing = set()
+
+    async def publish_event(event_name, payload, trace_id):
+        if event_name in failing:
+            raise ConnectionError("broker down")
+        published.append((event_name, payload["n"], trace_id))
+
+    async def close_publisher():
+        pass
+
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://test")
+    monkeypatch.setattr("app.services.event_publisher.publish_event", publish_event)
+    monkeypatch.setattr("app.services.event_publisher.close_publisher", close_publisher)
+
+    def install(lists):
+        client = FakeRedis(lists)
+        monkeypatch.setattr("redis.asyncio.from_url", lambda url: client)
+        return client
+
+    return install, published, failing
+
+
+@pytest.mark.asyncio
+async def test_replay_decodes_and_publishes_events(replay_env):
+    install, published, _ = replay_env
+    client = install({"failed_events": [entry("a.event", i) for i in range(5)]})
+
+    stats = await resend_failed_events(batch_size=2, key="failed_events")
+
+    assert stats.published == 5
+    assert sorted(published) == [("a.event", i, f"t{i}") for i in range(5)]
+    assert client.lists["failed_events"] == []
+
+
+@pytest.mark.asyncio
+async def test_undecodable_entries_go_to_poison_list(replay_env):
+    install, published, _ = replay_env
+    bad = [b"not json", json.dumps({"event": "a.event"}).encode(), b"[1, 2]"]
+    client = install({"failed_events": bad + [entry("a.event", 1)]})
+
+    stats = await resend_failed_events(key="failed_events")
+
+    assert stats.poisoned == 3
+    assert stats.published == 1
+    assert client.lists["failed_events:poison"] == bad
+    assert client.lists["failed_events"] == []
+
+
+@pytest.mark.asyncio
+async def test_failed_publishes_are_requeued(replay_env):
+    install, published, failing = replay_env
+    failing.add("b.event")
+    items = [entry("a.event", 1), entry("b.event", 2), entry("a.event", 3)]
+    client = install({"failed_events": items})
+
+    stats = await resend_failed_events(key="failed_events")
+
+    assert stats.published == 2
+    assert stats.requeued == 1
+    # One pass only: the requeued event is left for the next run
+    assert client.lists["failed_events"] == [items[1]]
+
+
+@pytest.mark.asyncio
+async def test_replay_stops_when_whole_batch_fails(replay_env):
+    install, published, failing = replay_env
+    failing.add("a.event")
+    items = [entry("a.event", i) for i in range(4)]
+    client = install({"failed_events": items})
+
+    stats = await resend_failed_events(batch_size=2, key="failed_events")
+
+    assert stats.requeued == 2
+    assert published == []
+    assert sorted(client.lists["failed_events"]) == sorted(items)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(20)
+    limiter.tokens = 0
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+    assert time.monotonic() - started >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_rates_below_one():
+    limiter = RateLimiter(0.5)
+    await asyncio.wait_for(limiter.acquire(), 1)
+    limiter.updated -= 2
+    await asyncio.wait_for(limiter.acquire(), 1)
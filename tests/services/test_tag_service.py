@@ -2,6 +2,7 @@ import uuid
 import pytest
 from app.services.tag_service import TagService
 from app.services.customer_service import CustomerService
+from app.services.outbox import OutboxRelay
 from app.schemas.tag import TagCreate
 from app.schemas.customer import CustomerCreate, Gender
 
@@ -67,6 +68,7 @@ async def test_tagging_emits_event(db_session, monkeypatch):
     customer_id = await create_sample_customer(customer_service)
 
     tag_service = TagService(db_session)
+    await OutboxRelay().relay_once()
 
     captured = []
 
@@ -79,6 +81,7 @@ async def test_tagging_emits_event(db_session, monkeypatch):
         TagCreate(customer_id=customer_id, label="VIP", created_by=uuid.uuid4()),
         "trace123",
     )
+    await OutboxRelay().relay_once()
 
     assert len(captured) == 1
     name, payload, trace_id = captured[0]